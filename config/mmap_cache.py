@@ -0,0 +1,310 @@
+# config/mmap_cache.py
+"""
+Cache backend shared by the worker processes of one machine, kept in a
+memory-mapped file.
+
+Every process maps the same file, so an entry one worker stores is a hit
+for all of them, without running a cache server:
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.mmap_cache.MmapCache',
+            'LOCATION': '/var/tmp/jobportal/default.cache',
+            'OPTIONS': {'MAX_ENTRIES': 20000, 'MAX_ENTRY_SIZE': 8192},
+        },
+    }
+
+The file is a hash table of MAX_ENTRIES fixed-size slots, each holding
+one pickled value of up to MAX_ENTRY_SIZE bytes (larger values are not
+cached), so its size is fixed when it is created. A key may live in any
+of the WAYS slots of its bucket. Storing into a full bucket replaces an
+expired entry if there is one, otherwise the least recently used one.
+Expired entries are dropped when they are read.
+
+Each access locks only its bucket's bytes with fcntl.lockf(), so
+processes working on different keys don't wait for each other. Those
+locks belong to the process, not the thread, and closing any descriptor
+of the file drops all of them, so each process opens the file once: the
+cache objects Django makes for each thread share its descriptor and
+mapping, and take turns through one thread lock. Nothing is closed until
+the process exits.
+
+The file is created sparse and only the slots in use take memory. When
+MAX_ENTRIES or MAX_ENTRY_SIZE change, a new file replaces the old one,
+and processes still running keep the old file until they restart. Within
+one process, every alias on a file must use the same sizes.
+
+POSIX only (fcntl). Entries outlive restarts, like any shared cache.
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+
+MAGIC = b'JPMMAPC1'
+
+# File header: magic, slot count, slot size; slots start at HEADER_SIZE
+HEADER = struct.Struct('<8sII')
+HEADER_SIZE = 64
+
+# Slot header: key digest, expiry time (0 = never), last use (ns), value length (0 = empty)
+SLOT = struct.Struct('<16sdqI')
+
+# Slots a key can be stored in
+WAYS = 8
+
+DEFAULT_ENTRY_SIZE = 8192
+
+# Files this process has open, by (path, process id). A forked child
+# opens the file again rather than use the parent's descriptor and lock.
+_files = {}
+_files_lock = threading.Lock()
+
+
+class _SharedFile:
+    """
+    One process's descriptor, mapping and thread lock for a cache file.
+    """
+    def __init__(self, path, header, size):
+        self.header = header
+        self.fd = _open_file(path, header, size)
+        self.map = mmap.mmap(self.fd, size)
+        self.lock = threading.Lock()
+
+
+def _open_file(path, header, size):
+    """
+    Read-write descriptor of the cache file at path, which is created (or
+    replaced) first unless it starts with header.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # Creating or replacing the file is serialized through a lock file
+    with open(path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            try:
+                descriptor = os.open(path, os.O_RDWR)
+            except FileNotFoundError:
+                descriptor = None
+            if descriptor is not None and os.pread(descriptor, HEADER.size, 0) != header:
+                # Made for other sizes. This process holds no locks on it yet,
+                # so closing it drops none.
+                os.close(descriptor)
+                descriptor = None
+            if descriptor is None:
+                descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.cache-')
+                try:
+                    os.ftruncate(descriptor, size)
+                    os.pwrite(descriptor, header, 0)
+                    os.replace(temporary_path, path)
+                except BaseException:
+                    os.close(descriptor)
+                    os.unlink(temporary_path)
+                    raise
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return descriptor
+
+
+class MmapCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = os.path.abspath(location)
+        self._slot_size = SLOT.size + int(options.get('MAX_ENTRY_SIZE', DEFAULT_ENTRY_SIZE))
+        self._slot_count = max(self._max_entries, WAYS)
+        self._buckets = self._slot_count - WAYS + 1
+        self._pid = None
+
+    # File handling
+
+    def _file(self):
+        # Looked up lazily and again after a fork, so every process has its own locks
+        if self._pid != os.getpid():
+            header = HEADER.pack(MAGIC, self._slot_count, self._slot_size)
+            with _files_lock:
+                shared = _files.get((self._path, os.getpid()))
+                if shared is None:
+                    size = HEADER_SIZE + self._slot_count * self._slot_size
+                    shared = _files[self._path, os.getpid()] = _SharedFile(self._path, header, size)
+            if shared.header != header:
+                raise ImproperlyConfigured(
+                    f'{self._path} is already open with other MAX_ENTRIES or MAX_ENTRY_SIZE options.'
+                )
+            self._shared = shared
+            self._pid = os.getpid()
+        return self._shared
+
+    @contextmanager
+    def _locked(self, first=0, count=None):
+        """
+        The mapping, with slots first to first + count (default: the
+        whole file) locked against other threads and processes.
+        """
+        shared = self._file()
+        if count is None:
+            start, length = 0, 0
+        else:
+            start, length = HEADER_SIZE + first * self._slot_size, count * self._slot_size
+        with shared.lock:
+            fcntl.lockf(shared.fd, fcntl.LOCK_EX, length, start)
+            try:
+                yield shared.map
+            finally:
+                fcntl.lockf(shared.fd, fcntl.LOCK_UN, length, start)
+
+    # Slots
+
+    def _address(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        return digest, int.from_bytes(digest[:8], 'little') % self._buckets
+
+    def _offset(self, index):
+        return HEADER_SIZE + index * self._slot_size
+
+    def _find(self, mapping, digest, first, now):
+        """
+        Offset of the live slot holding digest, or None. An expired match
+        is emptied on the way.
+        """
+        for index in range(first, first + WAYS):
+            offset = self._offset(index)
+            slot_digest, expires, _, length = SLOT.unpack_from(mapping, offset)
+            if length and slot_digest == digest:
+                if expires and expires <= now:
+                    SLOT.pack_into(mapping, offset, bytes(16), 0, 0, 0)
+                    return None
+                return offset
+        return None
+
+    def _victim(self, mapping, first, now):
+        """
+        Offset of the slot to store a new entry in: an empty one, else an
+        expired one, else the least recently used.
+        """
+        expired = None
+        oldest = None
+        for index in range(first, first + WAYS):
+            offset = self._offset(index)
+            _, expires, used, length = SLOT.unpack_from(mapping, offset)
+            if not length:
+                return offset
+            if expired is None and expires and expires <= now:
+                expired = offset
+            if oldest is None or used < oldest[0]:
+                oldest = (used, offset)
+        return expired if expired is not None else oldest[1]
+
+    def _read(self, mapping, offset):
+        digest, expires, _, length = SLOT.unpack_from(mapping, offset)
+        SLOT.pack_into(mapping, offset, digest, expires, time.time_ns(), length)
+        start = offset + SLOT.size
+        return mapping[start:start + length]
+
+    def _write(self, mapping, offset, digest, data, expires):
+        start = offset + SLOT.size
+        mapping[start:start + len(data)] = data
+        SLOT.pack_into(mapping, offset, digest, expires or 0, time.time_ns(), len(data))
+
+    def _store(self, key, value, timeout, only_new=False):
+        data = pickle.dumps(value, self.pickle_protocol)
+        digest, first = self._address(key)
+        now = time.time()
+        with self._locked(first, WAYS) as mapping:
+            offset = self._find(mapping, digest, first, now)
+            if offset is not None and only_new:
+                return False
+            if len(data) > self._slot_size - SLOT.size:
+                # Too large to cache; don't leave an older value behind
+                if offset is not None:
+                    SLOT.pack_into(mapping, offset, bytes(16), 0, 0, 0)
+                return False
+            if offset is None:
+                offset = self._victim(mapping, first, now)
+            self._write(mapping, offset, digest, data, self.get_backend_timeout(timeout))
+        return True
+
+    # Cache API
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._store(key, value, timeout, only_new=True)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        digest, first = self._address(key)
+        with self._locked(first, WAYS) as mapping:
+            offset = self._find(mapping, digest, first, time.time())
+            if offset is None:
+                return default
+            data = self._read(mapping, offset)
+        return pickle.loads(data)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._store(key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        digest, first = self._address(key)
+        with self._locked(first, WAYS) as mapping:
+            offset = self._find(mapping, digest, first, time.time())
+            if offset is None:
+                return False
+            _, _, used, length = SLOT.unpack_from(mapping, offset)
+            SLOT.pack_into(mapping, offset, digest, self.get_backend_timeout(timeout) or 0, used, length)
+        return True
+
+    def incr(self, key, delta=1, version=None):
+        # Read and written under one lock, so concurrent workers don't lose updates
+        key = self.make_and_validate_key(key, version=version)
+        digest, first = self._address(key)
+        with self._locked(first, WAYS) as mapping:
+            offset = self._find(mapping, digest, first, time.time())
+            if offset is None:
+                raise ValueError(f"Key '{key}' not found")
+            _, expires, _, _ = SLOT.unpack_from(mapping, offset)
+            value = pickle.loads(self._read(mapping, offset)) + delta
+            data = pickle.dumps(value, self.pickle_protocol)
+            if len(data) > self._slot_size - SLOT.size:
+                SLOT.pack_into(mapping, offset, bytes(16), 0, 0, 0)
+            else:
+                self._write(mapping, offset, digest, data, expires)
+        return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        digest, first = self._address(key)
+        with self._locked(first, WAYS) as mapping:
+            offset = self._find(mapping, digest, first, time.time())
+            if offset is None:
+                return False
+            SLOT.pack_into(mapping, offset, bytes(16), 0, 0, 0)
+        return True
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        digest, first = self._address(key)
+        with self._locked(first, WAYS) as mapping:
+            return self._find(mapping, digest, first, time.time()) is not None
+
+    def clear(self):
+        with self._locked() as mapping:
+            for index in range(self._slot_count):
+                offset = self._offset(index)
+                # Empty slots are left untouched, so the file stays sparse
+                if SLOT.unpack_from(mapping, offset)[3]:
+                    SLOT.pack_into(mapping, offset, bytes(16), 0, 0, 0)
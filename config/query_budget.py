@@ -0,0 +1,63 @@
+# config/query_budget.py
+"""
+Per-view database query budgets.
+
+Decorate a view with @query_budget(n) to declare the most queries one
+request may run, template rendering included. Going over the budget
+raises QueryBudgetExceeded when settings.QUERY_BUDGET_STRICT is on (as in
+config/test_settings.py) and logs a warning otherwise, so an N+1 regression fails the
+test suite instead of quietly slowing production down.
+
+The count covers everything the view executes, including the session and
+user lookups the first time it touches request.user. Put the decorator
+below @login_required so that lookup stays outside the budget.
+"""
+import functools
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries run through it.
+    """
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def query_budget(max_queries):
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            counter = QueryCounter()
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(counter))
+                response = view(request, *args, **kwargs)
+
+            if counter.count > max_queries:
+                message = (
+                    f'{view.__module__}.{view.__name__} ran {counter.count} queries '
+                    f'for {request.method} {request.path}, over its budget of {max_queries}'
+                )
+                if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
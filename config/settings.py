@@ -88,6 +88,37 @@ else:
         }
     }
 
+# Caches. Rendered job cards (jobs/cards.py) have their own alias so they
+# don't push facet counts and match vectors out of the default cache.
+if os.getenv('USE_SHARED_CACHE') == '1':
+    # One memory-mapped file per alias, shared by all worker processes on the
+    # server (config/mmap_cache.py)
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.mmap_cache.MmapCache',
+            'LOCATION': os.getenv('SHARED_CACHE_DIR', '/var/tmp/jobportal') + '/default.cache',
+            'OPTIONS': {'MAX_ENTRIES': 20000, 'MAX_ENTRY_SIZE': 8192},
+        },
+        'job_cards': {
+            'BACKEND': 'config.mmap_cache.MmapCache',
+            'LOCATION': os.getenv('SHARED_CACHE_DIR', '/var/tmp/jobportal') + '/job_cards.cache',
+            'OPTIONS': {'MAX_ENTRIES': 20000, 'MAX_ENTRY_SIZE': 4096},
+        },
+    }
+else:
+    # Per process; LocMemCache evicts the least recently used entries past MAX_ENTRIES
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+        'job_cards': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'job-cards',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        },
+    }
+JOB_CARD_CACHE = 'job_cards'
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -110,6 +141,13 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resume downloads (users/downloads.py) can be handed to the web server once
+# access is checked: 'nginx' sends X-Accel-Redirect to RESUME_SENDFILE_URL
+# followed by the file name, 'apache' sends X-Sendfile with the file's path.
+# None sends them from Django.
+RESUME_SENDFILE = None
+RESUME_SENDFILE_URL = '/protected-media/'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -117,3 +155,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 LOGIN_URL = '/login/'
+
+# Views over their declared query budget (config/query_budget.py) only log a
+# warning; config/test_settings.py makes them raise
+QUERY_BUDGET_STRICT = False
@@ -0,0 +1,18 @@
+# config/test_settings.py
+"""
+Settings for the test suite:
+
+    python manage.py test --settings=config.test_settings
+"""
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+# Views over their query budget fail the test that requested them
+QUERY_BUDGET_STRICT = True
+
+# Uploaded resumes go to a throwaway directory
+MEDIA_ROOT = tempfile.mkdtemp(prefix='jobportal-test-media-')
+
+# Hashing passwords properly only slows the tests down
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
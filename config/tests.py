@@ -0,0 +1,110 @@
+# config/tests.py
+import importlib
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from django.urls import Resolver404, URLResolver
+from django.urls.resolvers import RegexPattern
+
+from . import urls
+from .mmap_cache import MmapCache
+
+PARAMS = {'TIMEOUT': 300, 'OPTIONS': {'MAX_ENTRIES': 256, 'MAX_ENTRY_SIZE': 512}}
+
+THREADS = 4
+INCREMENTS = 2000
+
+
+def _increment(path, count):
+    # Django builds one cache object per thread; so does each caller here
+    cache = MmapCache(path, PARAMS)
+    for _ in range(count):
+        cache.incr('counter')
+
+
+def _increment_in_threads(path):
+    # Switch threads as often as possible, so unguarded updates would interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads = [
+        threading.Thread(target=_increment, args=(path, INCREMENTS))
+        for _ in range(THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sys.setswitchinterval(interval)
+
+
+class MmapCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mmap-cache-test-')
+        self.path = os.path.join(self.directory, 'test.cache')
+        self.cache = MmapCache(self.path, PARAMS)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_set_get_delete(self):
+        self.cache.set('job', {'title': 'Python Developer'})
+        self.assertEqual(self.cache.get('job'), {'title': 'Python Developer'})
+        self.assertFalse(self.cache.add('job', 'other'))
+        self.assertTrue(self.cache.delete('job'))
+        self.assertIsNone(self.cache.get('job'))
+
+    def test_other_instances_share_entries(self):
+        self.cache.set('job', 1)
+        self.assertEqual(MmapCache(self.path, PARAMS).get('job'), 1)
+
+    def test_incr_from_threads(self):
+        self.cache.set('counter', 0)
+        _increment_in_threads(self.path)
+        self.assertEqual(self.cache.get('counter'), THREADS * INCREMENTS)
+
+    def test_threads_wait_for_each_other(self):
+        # lockf() doesn't keep threads of one process apart; the shared thread lock must
+        other = MmapCache(self.path, PARAMS)
+        writer = threading.Thread(target=other.set, args=('job', 1))
+        with self.cache._locked():
+            writer.start()
+            writer.join(timeout=0.2)
+            self.assertTrue(writer.is_alive())
+        writer.join()
+        self.assertEqual(self.cache.get('job'), 1)
+
+    def test_incr_from_processes(self):
+        self.cache.set('counter', 0)
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_increment_in_threads, args=(self.path,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        _increment_in_threads(self.path)
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.cache.get('counter'), 3 * THREADS * INCREMENTS)
+
+    def test_other_sizes_in_one_process(self):
+        self.cache.set('job', 1)
+        resized = MmapCache(self.path, {'OPTIONS': {'MAX_ENTRIES': 512, 'MAX_ENTRY_SIZE': 512}})
+        with self.assertRaises(ImproperlyConfigured):
+            resized.get('job')
+
+
+class DebugUrlTests(SimpleTestCase):
+    def tearDown(self):
+        importlib.reload(urls)
+
+    @override_settings(DEBUG=True)
+    def test_resumes_not_served(self):
+        # Resumes are only handed out by users:resume_download
+        importlib.reload(urls)
+        resolver = URLResolver(RegexPattern(r'^/'), urls)
+        with self.assertRaises(Resolver404):
+            resolver.resolve('/media/resumes/ab/abcdef.pdf')
@@ -13,7 +13,8 @@ urlpatterns = [
     path('jobs/', include('jobs.urls')),      # Job URLs under /jobs/
 ]
 
-# Serve media files in development
+# Serve static files in development. MEDIA_ROOT only holds resumes, which
+# users:resume_download serves to the people allowed to read them; serving
+# the directory here as well would hand them to anyone.
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Load the per-process job search autocomplete index before traffic arrives
+from jobs.autocomplete import autocomplete_index  # noqa: E402
+
+autocomplete_index.warm()
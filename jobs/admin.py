@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Job, Application
+from . import review
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
@@ -14,3 +15,33 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_filter = ['status', 'applied_at']
     search_fields = ['job__title', 'applicant__username']
     date_hierarchy = 'applied_at'
+    actions = ['mark_pending', 'mark_reviewed', 'mark_interview', 'mark_rejected', 'mark_accepted']
+    
+    def _mark(self, request, queryset, status):
+        # One UPDATE per job instead of a save() per application
+        updated = 0
+        for job in Job.objects.filter(pk__in=queryset.values('job_id')).only('id', 'employer_id'):
+            updated += review.bulk_update_status(
+                job, status, application_ids=list(queryset.filter(job_id=job.pk).values_list('pk', flat=True))
+            )
+        self.message_user(request, f'{updated} application(s) updated.')
+    
+    def mark_pending(self, request, queryset):
+        self._mark(request, queryset, 'pending')
+    mark_pending.short_description = 'Mark selected applications as Pending'
+    
+    def mark_reviewed(self, request, queryset):
+        self._mark(request, queryset, 'reviewed')
+    mark_reviewed.short_description = 'Mark selected applications as Reviewed'
+    
+    def mark_interview(self, request, queryset):
+        self._mark(request, queryset, 'interview')
+    mark_interview.short_description = 'Mark selected applications as Interview'
+    
+    def mark_rejected(self, request, queryset):
+        self._mark(request, queryset, 'rejected')
+    mark_rejected.short_description = 'Mark selected applications as Rejected'
+    
+    def mark_accepted(self, request, queryset):
+        self._mark(request, queryset, 'accepted')
+    mark_accepted.short_description = 'Mark selected applications as Accepted'
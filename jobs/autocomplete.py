@@ -0,0 +1,296 @@
+# jobs/autocomplete.py
+"""
+In-memory typeahead suggestions for the job search form.
+
+Each process keeps sorted arrays of job titles, company names and
+locations and answers prefix lookups with bisect, so a keystroke never
+touches the database. The index is loaded at startup (config/wsgi.py),
+updated incrementally from Job/EmployerProfile signals in this process
+once their transaction commits, and reloaded in the background every
+REFRESH_SECONDS to pick up changes saved by other worker processes.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.db import transaction
+
+# How often a process reloads the whole index from the database
+REFRESH_SECONDS = 300
+
+# Matching keys examined per lookup before picking the most common values
+SCAN_LIMIT = 200
+
+# Company names shown among the suggestions for the keyword field
+MAX_COMPANY_SUGGESTIONS = 3
+
+
+def normalize(value):
+    return ' '.join((value or '').lower().split())
+
+
+class PrefixIndex:
+    """
+    Sorted array of lookup keys for one kind of value.
+
+    Every value is reachable from the start of each of its words, so
+    "dev" suggests "Python Developer". Duplicate values are counted and
+    the most common ones are suggested first.
+    """
+    def __init__(self):
+        self._keys = []      # sorted (key, normalized value) pairs
+        self._display = {}   # normalized value -> text as first seen
+        self._counts = {}    # normalized value -> number of sources
+
+    def __len__(self):
+        return len(self._counts)
+
+    @staticmethod
+    def _keys_for(normalized):
+        words = normalized.split(' ')
+        return {' '.join(words[i:]) for i in range(len(words))}
+
+    def _count(self, value):
+        """
+        Count one more source of value; returns the keys to insert if the
+        value is new.
+        """
+        normalized = normalize(value)
+        if not normalized:
+            return []
+        if normalized in self._counts:
+            self._counts[normalized] += 1
+            return []
+        self._counts[normalized] = 1
+        self._display[normalized] = ' '.join(value.split())
+        return [(key, normalized) for key in self._keys_for(normalized)]
+
+    def add(self, value):
+        for key in self._count(value):
+            insort(self._keys, key)
+
+    def add_many(self, values):
+        """
+        Add values in bulk, sorting the keys once rather than inserting
+        each in place.
+        """
+        for value in values:
+            self._keys.extend(self._count(value))
+        self._keys.sort()
+
+    def discard(self, value):
+        normalized = normalize(value)
+        if normalized not in self._counts:
+            return
+        self._counts[normalized] -= 1
+        if self._counts[normalized]:
+            return
+        del self._counts[normalized]
+        del self._display[normalized]
+        for key in self._keys_for(normalized):
+            index = bisect_left(self._keys, (key, normalized))
+            if index < len(self._keys) and self._keys[index] == (key, normalized):
+                del self._keys[index]
+
+    def suggest(self, prefix, limit):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        matches = set()
+        index = bisect_left(self._keys, (prefix, ''))
+        scanned = 0
+        while index < len(self._keys) and scanned < SCAN_LIMIT:
+            key, normalized = self._keys[index]
+            if not key.startswith(prefix):
+                break
+            matches.add(normalized)
+            index += 1
+            scanned += 1
+
+        best = sorted(matches, key=lambda value: (-self._counts[value], value))[:limit]
+        return [self._display[value] for value in best]
+
+
+class AutocompleteIndex:
+    """
+    Titles, company names and locations for one process.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.RLock()
+        self._loaded_at = None
+        self._refreshing = False
+        # Changes made while a load runs, replayed on the fresh index
+        self._pending = None
+        self._reset()
+
+    def _reset(self):
+        self.titles = PrefixIndex()
+        self.companies = PrefixIndex()
+        self.locations = PrefixIndex()
+        self._jobs = {}        # job id -> (title, location) currently indexed
+        self._companies = {}   # employer profile id -> company name
+
+    @property
+    def is_loaded(self):
+        return self._loaded_at is not None
+
+    def load(self):
+        """
+        Read every active job and company name and swap in a fresh index.
+        """
+        with self._load_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                fresh = self._read_index()
+            finally:
+                with self._lock:
+                    pending, self._pending = self._pending, None
+            self._swap(fresh, pending)
+
+    @staticmethod
+    def _read_index():
+        from users.models import EmployerProfile
+        from .models import JobSearchDocument
+
+        fresh = AutocompleteIndex()
+        titles = []
+        locations = []
+        jobs = JobSearchDocument.objects.values_list('job_id', 'title', 'location')
+        for job_id, title, location in jobs.iterator(chunk_size=2000):
+            fresh._jobs[job_id] = (title, location)
+            titles.append(title)
+            locations.append(location)
+        fresh.titles.add_many(titles)
+        fresh.locations.add_many(locations)
+
+        companies = EmployerProfile.objects.exclude(company_name='').values_list('id', 'company_name')
+        fresh._companies = dict(companies.iterator(chunk_size=2000))
+        fresh.companies.add_many(fresh._companies.values())
+        return fresh
+
+    def _swap(self, fresh, pending):
+        with self._lock:
+            # Saves committed while the database was being read may be missing from it
+            for change in pending:
+                change(fresh)
+            self.titles = fresh.titles
+            self.companies = fresh.companies
+            self.locations = fresh.locations
+            self._jobs = fresh._jobs
+            self._companies = fresh._companies
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+
+    def warm(self):
+        """
+        Load the index in a background thread (used at process startup).
+        """
+        self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            from django.db import close_old_connections
+            try:
+                self.load()
+            finally:
+                self._refreshing = False
+                close_old_connections()
+
+        threading.Thread(target=run, name='autocomplete-refresh', daemon=True).start()
+
+    def _ensure_fresh(self):
+        if not self.is_loaded:
+            # First lookup before warm() finished: load synchronously once
+            with self._load_lock:
+                if not self.is_loaded:
+                    self.load()
+        elif time.monotonic() - self._loaded_at > REFRESH_SECONDS:
+            self._refresh_in_background()
+
+    # Incremental updates (called from jobs/signals.py)
+
+    def _add_job(self, job_id, title, location):
+        self._jobs[job_id] = (title, location)
+        self.titles.add(title)
+        self.locations.add(location)
+
+    def _remove_job(self, job_id):
+        previous = self._jobs.pop(job_id, None)
+        if previous:
+            self.titles.discard(previous[0])
+            self.locations.discard(previous[1])
+
+    def _set_company(self, profile_id, company_name):
+        previous = self._companies.pop(profile_id, None)
+        if previous is not None:
+            self.companies.discard(previous)
+        if company_name:
+            self._companies[profile_id] = company_name
+            self.companies.add(company_name)
+
+    def _change(self, change):
+        """
+        Apply change(index) once the current transaction commits, to this
+        index and to one being loaded.
+        """
+        def apply():
+            with self._lock:
+                if self.is_loaded:
+                    change(self)
+                if self._pending is not None:
+                    self._pending.append(change)
+
+        transaction.on_commit(apply)
+
+    @staticmethod
+    def _job_changed(job_id, title, location, is_active):
+        def change(index):
+            index._remove_job(job_id)
+            if is_active:
+                index._add_job(job_id, title, location)
+        return change
+
+    def update_job(self, job):
+        self._change(self._job_changed(job.pk, job.title, job.location, job.is_active))
+
+    def remove_job(self, job_id):
+        self._change(lambda index: index._remove_job(job_id))
+
+    def update_company(self, profile):
+        company_name = profile.company_name
+        self._change(lambda index: index._set_company(profile.pk, company_name))
+
+    def remove_company(self, profile_id):
+        self._change(lambda index: index._set_company(profile_id, None))
+
+    # Lookups
+
+    def suggest(self, field, prefix, limit=8):
+        """
+        Suggestions for a JobSearchForm field: titles and company names
+        for "search", locations for "location".
+        """
+        self._ensure_fresh()
+        with self._lock:
+            if field == 'location':
+                return [
+                    {'value': value, 'type': 'location'}
+                    for value in self.locations.suggest(prefix, limit)
+                ]
+            companies = self.companies.suggest(prefix, MAX_COMPANY_SUGGESTIONS)
+            titles = self.titles.suggest(prefix, limit - len(companies))
+
+        suggestions = [{'value': value, 'type': 'title'} for value in titles]
+        suggestions += [{'value': value, 'type': 'company'} for value in companies]
+        return suggestions
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,71 @@
+# jobs/cards.py
+"""
+Rendered job cards for the public job list, cached per job version.
+
+A card's HTML depends only on its search document, so it is cached under
+(job id, document updated_at) and never needs invalidating: a changed
+job (or company name) gets a new key, and the old entry ages out of the
+cache. The "posted ... ago" text is the one part that changes on its
+own; cards are cached with a placeholder for it, filled in per request.
+
+All cards of a page are looked up with one get_many() and the misses
+stored with one set_many(), so a page costs one cache round trip however
+many cards it shows. Cards go to the cache alias named by
+settings.JOB_CARD_CACHE; with the default LocMemCache the least recently
+used cards are evicted once MAX_ENTRIES is reached, and any shared
+backend (Redis, Memcached) can be configured instead.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.timesince import timesince
+
+CARD_TEMPLATE = 'jobs/_job_card.html'
+
+# Part of every card key; bump it when jobs/_job_card.html changes
+CARD_VERSION = 1
+
+# Cards unused for this long are dropped even if the cache has room
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Stands in for the "posted ... ago" text in cached cards
+POSTED_PLACEHOLDER = '__posted_ago__'
+
+
+def card_cache():
+    return caches[getattr(settings, 'JOB_CARD_CACHE', 'default')]
+
+
+def card_key(job):
+    return f'jobs:card:{CARD_VERSION}:{job.pk}:{job.updated_at.timestamp():.6f}'
+
+
+def render_card(job):
+    """
+    Card HTML of one search document, with the posting age left out.
+    """
+    return get_template(CARD_TEMPLATE).render({'job': job, 'posted_ago': POSTED_PLACEHOLDER})
+
+
+def render_cards(jobs, cache=None):
+    """
+    Card HTML of each search document in jobs, in order, reusing cached
+    cards. cache is the backend to use (card_cache() by default); False
+    renders every card.
+    """
+    if cache is None:
+        cache = card_cache()
+    keys = {card_key(job): job for job in jobs}
+
+    cards = cache.get_many(keys) if cache is not False else {}
+    missing = {key: render_card(job) for key, job in keys.items() if key not in cards}
+    if missing and cache is not False:
+        cache.set_many(missing, CARD_CACHE_TIMEOUT)
+    cards.update(missing)
+
+    return [
+        mark_safe(cards[key].replace(POSTED_PLACEHOLDER, escape(timesince(job.created_at))))
+        for key, job in keys.items()
+    ]
@@ -0,0 +1,122 @@
+# jobs/counters.py
+"""
+Denormalized application counters on Job.
+
+Job.application_count and one <status>_count per application status are
+changed with single-statement F() updates whenever an application is
+created, changes status or is deleted (see jobs/signals.py), so pages
+listing jobs read the counts from the job rows themselves. reconcile()
+recounts them from the applications table and repairs any drift.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F
+
+from .models import Job, Application
+
+
+def status_field(status):
+    return f'{status}_count'
+
+
+STATUS_FIELDS = [status_field(status) for status, _ in Application.STATUS_CHOICES]
+
+
+def _update(job_id, changes):
+    Job.objects.filter(pk=job_id).update(**{
+        field: F(field) + delta for field, delta in changes.items() if delta
+    })
+
+
+def application_created(application):
+    _update(application.job_id, {
+        'application_count': 1,
+        status_field(application.status): 1,
+    })
+
+
+def status_changed(job_id, old_status, new_status, count=1):
+    """
+    Move count applications of a job from one status counter to another.
+    """
+    statuses_changed(job_id, {old_status: count}, new_status)
+
+
+def statuses_changed(job_id, moved, new_status):
+    """
+    Move applications of a job to new_status from the statuses counted in
+    moved ({old status: number of applications}), in one UPDATE.
+    """
+    changes = {}
+    for old_status, count in moved.items():
+        if old_status != new_status:
+            changes[status_field(old_status)] = changes.get(status_field(old_status), 0) - count
+            changes[status_field(new_status)] = changes.get(status_field(new_status), 0) + count
+    if any(changes.values()):
+        _update(job_id, changes)
+
+
+def application_deleted(job_id, status):
+    _update(job_id, {
+        'application_count': -1,
+        status_field(status): -1,
+    })
+
+
+def count_applications(job_ids=None):
+    """
+    Recount applications per job and status with one grouped query.
+    Returns {job_id: {counter field: value}} for jobs with applications.
+    """
+    rows = Application.objects.all()
+    if job_ids is not None:
+        rows = rows.filter(job_id__in=job_ids)
+    rows = rows.order_by().values('job_id', 'status').annotate(total=Count('pk'))
+
+    counts = defaultdict(lambda: dict.fromkeys(Job.COUNTER_FIELDS, 0))
+    for row in rows:
+        job_counts = counts[row['job_id']]
+        job_counts['application_count'] += row['total']
+        job_counts[status_field(row['status'])] += row['total']
+    return counts
+
+
+def recount_job(job_id):
+    """
+    Overwrite one job's counters with a recount of its applications.
+    """
+    counts = count_applications([job_id]).get(job_id, dict.fromkeys(Job.COUNTER_FIELDS, 0))
+    Job.objects.filter(pk=job_id).update(**counts)
+
+
+def reconcile(batch_size=2000):
+    """
+    Compare every job's counters with a recount of its applications and
+    rewrite the drifted ones in bulk. Returns the number of jobs fixed.
+    """
+    fixed = 0
+    zero = dict.fromkeys(Job.COUNTER_FIELDS, 0)
+    jobs = Job.objects.only('id', *Job.COUNTER_FIELDS).order_by('id')
+
+    batch = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        batch.append(job)
+        if len(batch) >= batch_size:
+            fixed += _reconcile_batch(batch, zero)
+            batch = []
+    if batch:
+        fixed += _reconcile_batch(batch, zero)
+    return fixed
+
+
+def _reconcile_batch(jobs, zero):
+    counts = count_applications([job.pk for job in jobs])
+    drifted = []
+    for job in jobs:
+        expected = counts.get(job.pk, zero)
+        if any(getattr(job, field) != value for field, value in expected.items()):
+            for field, value in expected.items():
+                setattr(job, field, value)
+            drifted.append(job)
+    Job.objects.bulk_update(drifted, Job.COUNTER_FIELDS)
+    return len(drifted)
@@ -0,0 +1,191 @@
+# jobs/documents.py
+"""
+Maintenance of JobSearchDocument, the denormalized table behind the
+public job listing.
+
+A document copies the columns the listing shows and filters on (title,
+company name, location, type, salary, coordinates, posting date and a
+short summary) so a listing page reads one narrow table with no joins.
+Documents are written when a job or its employer's profile is saved (see
+jobs/signals.py) and can be rebuilt in bulk with the
+rebuild_search_documents command.
+
+Every change to the documents bumps a generation number, stored in the
+JobSearchGeneration row by the same transaction. Cached search results
+and facet counts include it in their keys, so they are never read again
+once the jobs they were computed from change, in any worker process and
+whatever cache backend it uses. Saves that change nothing a search reads
+(a job that stays inactive, or an edit of only updated_at or the
+application counters) leave the documents and the generation alone.
+"""
+import time
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from users.models import EmployerProfile
+from .models import Job, JobSearchDocument, JobSearchGeneration
+
+# Length of the description excerpt shown on listing cards
+SUMMARY_WORDS = 30
+SUMMARY_LENGTH = 300
+
+# Job fields the documents copy or cached searches filter and rank on
+SEARCH_FIELDS = (
+    'employer_id', 'title', 'description', 'requirements', 'location', 'job_type',
+    'salary_min', 'salary_max', 'is_active', 'created_at', 'latitude', 'longitude', 'geo_cell',
+)
+
+
+def summarize(description):
+    text = Truncator(' '.join((description or '').split())).words(SUMMARY_WORDS)
+    return Truncator(text).chars(SUMMARY_LENGTH)
+
+
+def generation():
+    """
+    Number that changes whenever a document is written or removed (one
+    query). Read it before searching, so a search that runs while a change
+    commits is cached under the old number.
+    """
+    number = JobSearchGeneration.objects.filter(pk=1).values_list('number', flat=True).first()
+    if number is None:
+        number = _create_generation()
+    return number
+
+
+def changed():
+    """
+    Move to a new generation in the current transaction, so the new number
+    is visible exactly when the changed documents are.
+    """
+    if not JobSearchGeneration.objects.filter(pk=1).update(number=F('number') + 1):
+        _create_generation()
+
+
+def _create_generation():
+    # Starting from the clock, a recreated database never returns to a number
+    # that a persistent cache holds entries under
+    row, _ = JobSearchGeneration.objects.get_or_create(pk=1, defaults={'number': time.time_ns()})
+    return row.number
+
+
+def _document(job, company_name):
+    return JobSearchDocument(
+        job_id=job.pk,
+        title=job.title,
+        company_name=company_name or '',
+        location=job.location,
+        job_type=job.job_type,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        summary=summarize(job.description),
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        latitude=job.latitude,
+        longitude=job.longitude,
+        geo_cell=job.geo_cell,
+    )
+
+
+def search_fields_changed(job):
+    """
+    Whether saving job may have changed its document or what a search
+    returns: always for a new job, otherwise only if the job is or was
+    active and one of SEARCH_FIELDS differs from the loaded value.
+    """
+    loaded = getattr(job, '_loaded_values', None)
+    if loaded is None:
+        return True
+    if not job.is_active and not loaded.get('is_active', False):
+        return False
+    for name in SEARCH_FIELDS:
+        # Deferred fields nobody assigned can't have changed
+        if name in job.__dict__ and (name not in loaded or loaded[name] != job.__dict__[name]):
+            return True
+    return False
+
+
+def index_job(job):
+    """
+    Write the document of a saved job, or drop it if the job is inactive.
+    """
+    if not search_fields_changed(job):
+        return
+    if not job.is_active:
+        remove_job(job.pk)
+        return
+
+    company_name = EmployerProfile.objects.filter(user_id=job.employer_id).values_list(
+        'company_name', flat=True
+    ).first()
+    _document(job, company_name).save()
+    changed()
+
+
+def index_jobs(jobs, company_name):
+    """
+    Write the documents of many saved jobs of one employer at once
+    (bulk imports, which skip model signals).
+    """
+    jobs = [job for job in jobs if search_fields_changed(job)]
+    if not jobs:
+        return
+    JobSearchDocument.objects.filter(job_id__in=[job.pk for job in jobs]).delete()
+    JobSearchDocument.objects.bulk_create([
+        _document(job, company_name) for job in jobs if job.is_active
+    ])
+    changed()
+
+
+def remove_job(job_id):
+    deleted, _ = JobSearchDocument.objects.filter(job_id=job_id).delete()
+    if deleted:
+        changed()
+
+
+def update_company(user_id, company_name):
+    """
+    Copy an employer's new company name into their jobs' documents.
+    """
+    if JobSearchDocument.objects.filter(
+        job__employer_id=user_id
+    ).exclude(company_name=company_name).update(company_name=company_name, updated_at=timezone.now()):
+        changed()
+
+
+def rebuild_index(batch_size=2000, progress=None):
+    """
+    Recreate every document from the jobs table in batches, e.g. after
+    bulk writes that skip model signals. progress, if given, is called
+    with the running count after each batch. Returns the number of
+    documents written.
+    """
+    JobSearchDocument.objects.all().delete()
+
+    jobs = Job.objects.filter(is_active=True).select_related(
+        'employer__employerprofile'
+    ).only(
+        'id', 'title', 'description', 'location', 'job_type', 'salary_min', 'salary_max',
+        'created_at', 'updated_at', 'latitude', 'longitude', 'geo_cell',
+        'employer__id', 'employer__employerprofile__company_name',
+    ).order_by('id')
+
+    written = 0
+    batch = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        profile = getattr(job.employer, 'employerprofile', None)
+        batch.append(_document(job, profile.company_name if profile else ''))
+        if len(batch) >= batch_size:
+            JobSearchDocument.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+            if progress:
+                progress(written)
+    JobSearchDocument.objects.bulk_create(batch)
+    written += len(batch)
+    if progress:
+        progress(written)
+    changed()
+    return written
@@ -0,0 +1,150 @@
+# jobs/employer_stats.py
+"""
+Maintenance of EmployerStats, the per-employer rollup behind the employer
+dashboard.
+
+Each job or application event adjusts the employer's row with one F()
+UPDATE (see jobs/signals.py), so the dashboard reads a single row however
+many jobs and applications the employer has accumulated. An employer
+without a row yet gets one recounted from their jobs on first use.
+"""
+from django.db.models import Count, F, Max, Q, Sum
+from django.utils import timezone
+
+from .counters import status_field as job_status_field
+from .models import Job, Application, EmployerStats
+
+
+def status_field(status):
+    return f'{status}_applications'
+
+
+STATUS_FIELDS = [status_field(status) for status, _ in Application.STATUS_CHOICES]
+
+
+def _changes(changes, timestamps):
+    updates = {field: F(field) + delta for field, delta in changes.items() if delta}
+    updates.update(timestamps)
+    return updates
+
+
+def _update_employer(employer_id, changes, **timestamps):
+    if not EmployerStats.objects.filter(employer_id=employer_id).update(**_changes(changes, timestamps)):
+        # First event for this employer: the recount already includes it
+        recount(employer_id)
+
+
+def _update_for_job(job_id, changes, **timestamps):
+    rows = EmployerStats.objects.filter(employer__job=job_id)
+    if not rows.update(**_changes(changes, timestamps)):
+        employer_id = Job.objects.filter(pk=job_id).values_list('employer_id', flat=True).first()
+        if employer_id is not None:
+            recount(employer_id)
+
+
+def job_saved(job, created):
+    loaded = getattr(job, '_loaded_values', {})
+    if created:
+        state = 'active_jobs' if job.is_active else 'inactive_jobs'
+        _update_employer(job.employer_id, {state: 1}, last_job_posted_at=job.created_at)
+    elif 'is_active' in loaded and loaded['is_active'] != job.is_active:
+        delta = 1 if job.is_active else -1
+        _update_employer(job.employer_id, {'active_jobs': delta, 'inactive_jobs': -delta})
+
+
+def job_deleted(job):
+    """
+    Remove a job and its applications from the rollup. Called before the
+    delete so the job's stored application counters can still be read.
+    """
+    stored = Job.objects.filter(pk=job.pk).values('is_active', *Job.COUNTER_FIELDS).first()
+    if stored is None:
+        return
+    changes = {
+        'active_jobs' if stored['is_active'] else 'inactive_jobs': -1,
+        'applications_received': -stored['application_count'],
+    }
+    for status, _ in Application.STATUS_CHOICES:
+        changes[status_field(status)] = -stored[job_status_field(status)]
+    EmployerStats.objects.filter(employer_id=job.employer_id).update(**_changes(changes, {}))
+
+
+def application_created(application):
+    _update_for_job(
+        application.job_id,
+        {'applications_received': 1, status_field(application.status): 1},
+        last_application_at=application.applied_at,
+    )
+
+
+def status_changed(job_id, old_status, new_status, count=1):
+    statuses_changed(job_id, {old_status: count}, new_status)
+
+
+def statuses_changed(job_id, moved, new_status):
+    """
+    Move applications of a job to new_status from the statuses counted in
+    moved ({old status: number of applications}).
+    """
+    changes = {}
+    for old_status, count in moved.items():
+        if old_status != new_status:
+            changes[status_field(old_status)] = changes.get(status_field(old_status), 0) - count
+            changes[status_field(new_status)] = changes.get(status_field(new_status), 0) + count
+    if any(changes.values()):
+        _update_for_job(job_id, changes, last_status_change_at=timezone.now())
+
+
+def application_deleted(job_id, status):
+    # A plain UPDATE: deletes never create a row (the employer may be going too)
+    EmployerStats.objects.filter(employer__job=job_id).update(
+        **_changes({'applications_received': -1, status_field(status): -1}, {})
+    )
+
+
+def recount(employer_id):
+    """
+    Rebuild one employer's row from their jobs' stored counters.
+    """
+    totals = Job.objects.filter(employer_id=employer_id).aggregate(
+        active_jobs=Count('pk', filter=Q(is_active=True)),
+        inactive_jobs=Count('pk', filter=Q(is_active=False)),
+        applications_received=Sum('application_count'),
+        last_job_posted_at=Max('created_at'),
+        **{
+            status_field(status): Sum(job_status_field(status))
+            for status, _ in Application.STATUS_CHOICES
+        },
+    )
+    totals.update(Application.objects.filter(job__employer_id=employer_id).aggregate(
+        last_application_at=Max('applied_at'),
+    ))
+    for field in ['applications_received'] + STATUS_FIELDS:
+        totals[field] = totals[field] or 0
+
+    stats, _ = EmployerStats.objects.update_or_create(employer_id=employer_id, defaults=totals)
+    return stats
+
+
+def for_employer(employer):
+    """
+    The employer's stats row, created on first use.
+    """
+    stats = EmployerStats.objects.filter(employer=employer).first()
+    if stats is None:
+        stats = recount(employer.pk)
+    return stats
+
+
+def rebuild_index():
+    """
+    Recount every employer's row, e.g. after reconciling job counters.
+    Returns the number of employers recounted.
+    """
+    employer_ids = Job.objects.order_by().values_list('employer_id', flat=True).distinct()
+    EmployerStats.objects.exclude(employer_id__in=employer_ids).delete()
+    recounted = 0
+    for employer_id in employer_ids.iterator():
+        recount(employer_id)
+        recounted += 1
+    return recounted
@@ -0,0 +1,93 @@
+# jobs/facets.py
+"""
+Facet counts (job type and top locations) for the job list sidebar.
+
+All facets come from one GROUP BY (job_type, location) query over the
+current search, and the result is cached per normalized search until the
+search documents change (see jobs/documents.py).
+"""
+import hashlib
+import json
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Job
+
+# How long a computed set of facet counts is reused
+FACET_CACHE_TIMEOUT = 60
+
+# Number of locations listed in the sidebar
+TOP_LOCATIONS = 10
+
+# Search parameters that change which jobs are counted
+FACET_PARAMETERS = ('search', 'location', 'radius', 'salary_min', 'salary_max', 'job_type')
+
+
+def normalize_search(cleaned_data, parameters=FACET_PARAMETERS):
+    """
+    Reduce search form data to a canonical dict, so that "Python " and
+    "python" share a cache entry.
+    """
+    normalized = {}
+    for name in parameters:
+        value = cleaned_data.get(name)
+        if value in (None, ''):
+            continue
+        if isinstance(value, str):
+            value = ' '.join(value.lower().split())
+        normalized[name] = str(value)
+    return normalized
+
+
+def cache_key(prefix, normalized):
+    digest = hashlib.md5(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+def compute_facets(queryset, job_type=None):
+    """
+    Count jobs per job type and per location in a single grouped query.
+
+    queryset should have every filter applied except job type: job type
+    counts then show what each choice would return, while location counts
+    are restricted to the selected job_type in Python.
+    """
+    rows = queryset.order_by().values('job_type', 'location').annotate(total=Count('pk'))
+
+    job_types = Counter()
+    locations = Counter()
+    for row in rows:
+        job_types[row['job_type']] += row['total']
+        if not job_type or row['job_type'] == job_type:
+            locations[row['location'].strip()] += row['total']
+
+    return {
+        'job_types': [
+            {'value': value, 'label': label, 'count': job_types[value]}
+            for value, label in Job.JOB_TYPES
+        ],
+        'locations': [
+            {'value': location, 'count': count}
+            for location, count in locations.most_common(TOP_LOCATIONS)
+        ],
+    }
+
+
+def get_facets(form, queryset, generation):
+    """
+    Return facet counts for a JobSearchForm, from the cache when possible.
+    queryset is the unfiltered listing (active jobs) and generation the
+    search documents' (see documents.generation()).
+    """
+    cleaned_data = form.cleaned_data if form.is_bound and form.is_valid() else {}
+    key = cache_key(f'jobs:facets:{generation}', normalize_search(cleaned_data))
+
+    facets = cache.get(key)
+    if facets is None:
+        if cleaned_data:
+            queryset = form.filter_queryset(queryset, skip=('job_type',))
+        facets = compute_facets(queryset, cleaned_data.get('job_type'))
+        cache.set(key, facets, FACET_CACHE_TIMEOUT)
+    return facets
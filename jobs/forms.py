@@ -1,6 +1,8 @@
 # jobs/forms.py
 from django import forms
 from .models import Job, Application
+from . import geo, search, salaries
+from .ranking import analyze
 
 class JobSearchForm(forms.Form):
     """
@@ -11,7 +13,10 @@ class JobSearchForm(forms.Form):
         max_length=100,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
-            'placeholder': 'Search by job title or keywords...'
+            'placeholder': 'Search by job title or keywords...',
+            'autocomplete': 'off',
+            'list': 'search-suggestions',
+            'data-autocomplete': 'search',
         })
     )
     
@@ -20,7 +25,20 @@ class JobSearchForm(forms.Form):
         max_length=100,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
-            'placeholder': 'Location (optional)'
+            'placeholder': 'Location (optional)',
+            'autocomplete': 'off',
+            'list': 'location-suggestions',
+            'data-autocomplete': 'location',
+        })
+    )
+    
+    radius = forms.TypedChoiceField(
+        required=False,
+        coerce=int,
+        empty_value=None,
+        choices=[('', 'Any distance')] + [(km, f'Within {km} km') for km in geo.RADIUS_CHOICES],
+        widget=forms.Select(attrs={
+            'class': 'form-select flex-grow-0 w-auto'
         })
     )
     
@@ -31,6 +49,94 @@ class JobSearchForm(forms.Form):
             'class': 'form-control'
         })
     )
+    
+    salary_min = forms.IntegerField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control form-control-sm',
+            'placeholder': 'Min',
+            'form': 'job-search-form',
+        })
+    )
+    
+    salary_max = forms.IntegerField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control form-control-sm',
+            'placeholder': 'Max',
+            'form': 'job-search-form',
+        })
+    )
+    
+    sort = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Most Recent'), ('relevance', 'Most Relevant')],
+        widget=forms.Select(attrs={
+            'class': 'form-control'
+        })
+    )
+    
+    def filter_queryset(self, queryset, skip=()):
+        """
+        Apply the cleaned search filters to a Job queryset.
+        Keyword and location searches go through the full-text index;
+        with a radius, a location the gazetteer knows is searched by distance.
+        Filters named in skip are left out (used for facet counts).
+        """
+        search_query = self.cleaned_data.get('search')
+        location = self.cleaned_data.get('location')
+        radius = self.cleaned_data.get('radius')
+        job_type = self.cleaned_data.get('job_type')
+        salary_min = self.cleaned_data.get('salary_min')
+        salary_max = self.cleaned_data.get('salary_max')
+        
+        # Search by title or description
+        if search_query and 'search' not in skip:
+            queryset = search.search_jobs(queryset, search_query)
+        
+        # Filter by location, or by distance from it
+        if location and 'location' not in skip:
+            place = geo.geocode(location) if radius else None
+            if place:
+                queryset = geo.within_radius(queryset, place, radius)
+            else:
+                queryset = search.filter_location(queryset, location)
+        
+        # Filter by job type
+        if job_type and 'job_type' not in skip:
+            queryset = queryset.filter(job_type=job_type)
+        
+        # Filter by salary range
+        if (salary_min is not None or salary_max is not None) and 'salary' not in skip:
+            queryset = salaries.filter_salary(queryset, salary_min, salary_max)
+        
+        return queryset
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        salary_min = cleaned_data.get('salary_min')
+        salary_max = cleaned_data.get('salary_max')
+        
+        # Accept a reversed range rather than showing no results
+        if salary_min is not None and salary_max is not None and salary_min > salary_max:
+            cleaned_data['salary_min'], cleaned_data['salary_max'] = salary_max, salary_min
+        
+        return cleaned_data
+    
+    def has_text_filters(self):
+        return bool(self.cleaned_data.get('search') or self.cleaned_data.get('location'))
+    
+    def sorts_by_relevance(self):
+        """
+        Relevance ordering only applies when there are keywords to rank by:
+        a search made only of stop words ("it") is listed most recent first.
+        """
+        return bool(
+            self.cleaned_data.get('sort') == 'relevance'
+            and analyze(self.cleaned_data.get('search'))
+        )
 
 
 class JobApplicationForm(forms.ModelForm):
@@ -143,4 +249,48 @@ class JobPostForm(forms.ModelForm):
         if commit:
             job.save()
         
-        return job
\ No newline at end of file
+        return job
+
+class ApplicationStatusForm(forms.Form):
+    """
+    Form for employers to change the status of many applications at once:
+    the ticked ones, or every application in the current status filter.
+    """
+    status = forms.ChoiceField(
+        choices=Application.STATUS_CHOICES,
+        widget=forms.Select(attrs={
+            'class': 'form-select form-select-sm w-auto'
+        })
+    )
+    
+    # Ticked applications (checkboxes on the cards, attached with form="...")
+    applications = forms.Field(required=False, widget=forms.MultipleHiddenInput)
+    
+    select_all = forms.BooleanField(required=False)
+    
+    current_status = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All')] + list(Application.STATUS_CHOICES),
+        widget=forms.HiddenInput
+    )
+    
+    def clean_applications(self):
+        try:
+            return [int(pk) for pk in self.cleaned_data.get('applications') or []]
+        except (TypeError, ValueError):
+            raise forms.ValidationError('Invalid application selection.')
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('select_all') and not cleaned_data.get('applications'):
+            raise forms.ValidationError('Select at least one application.')
+        return cleaned_data
+    
+    def selected_ids(self):
+        """
+        Ids of the ticked applications, or None when every application in
+        the current filter is selected.
+        """
+        if self.cleaned_data['select_all']:
+            return None
+        return self.cleaned_data['applications']
@@ -0,0 +1,217 @@
+# jobs/geo.py
+"""
+Location geocoding and radius search for jobs.
+
+Job.location is free text. When a job is saved its location is matched
+against a bundled offline gazetteer (jobs/data/gazetteer.csv) and the
+coordinates are stored in Job.latitude/longitude, together with the
+geo_cell grid bucket they fall in.
+
+A radius query first narrows the jobs to the grid cells overlapping the
+circle's bounding box (contiguous geo_cell ranges, one per grid row, read
+from the jobs_geo_cell_idx index) and only then computes exact
+great-circle distances for those candidates.
+"""
+import csv
+import math
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+from .models import Job
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+
+EARTH_RADIUS_KM = 6371.0
+
+# Grid bucket size; 0.25 degrees is about 28 km north-south
+GRID_DEGREES = 0.25
+GRID_ROWS = int(180 / GRID_DEGREES)
+GRID_COLUMNS = int(360 / GRID_DEGREES)
+
+# Radius choices offered in the job search form, in km
+RADIUS_CHOICES = (10, 25, 50, 100, 250)
+
+# Common ways of writing a country in a location string
+COUNTRY_NAMES = {
+    'india': 'in',
+    'usa': 'us',
+    'united states': 'us',
+    'united states of america': 'us',
+    'america': 'us',
+    'uk': 'gb',
+    'united kingdom': 'gb',
+    'england': 'gb',
+    'scotland': 'gb',
+    'canada': 'ca',
+    'germany': 'de',
+    'france': 'fr',
+    'netherlands': 'nl',
+    'spain': 'es',
+    'italy': 'it',
+    'ireland': 'ie',
+    'australia': 'au',
+    'uae': 'ae',
+}
+
+# Separators between the parts of a location, e.g. "Pune, Maharashtra (Hybrid)"
+PART_SPLIT_RE = re.compile(r'[,/;|()]|\s-\s')
+
+Place = namedtuple('Place', ['name', 'region', 'country', 'latitude', 'longitude'])
+
+
+def normalize(text):
+    """
+    Lowercase, strip accents and punctuation: "São Paulo" -> "sao paulo".
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = text.lower().replace('.', '')
+    return ' '.join(text.split())
+
+
+@lru_cache(maxsize=None)
+def gazetteer():
+    """
+    {normalized name or alias: [Place, ...]} in file order, so the first
+    place listed for an ambiguous name is the default.
+    """
+    places = {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            place = Place(
+                name=row['name'],
+                region=row['region'].lower(),
+                country=row['country'].lower(),
+                latitude=float(row['latitude']),
+                longitude=float(row['longitude']),
+            )
+            names = [row['name']] + [alias for alias in row['aliases'].split('|') if alias]
+            for name in names:
+                places.setdefault(normalize(name), []).append(place)
+    return places
+
+
+def geocode(location):
+    """
+    Resolve a free-text location to a gazetteer Place, or None.
+
+    The first comma-separated part naming a known place wins; the other
+    parts pick between places sharing a name ("Portland, ME").
+    """
+    parts = [normalize(part) for part in PART_SPLIT_RE.split(location or '')]
+    parts = [part for part in parts if part]
+    qualifiers = {COUNTRY_NAMES.get(part, part) for part in parts}
+
+    places = gazetteer()
+    for part in parts:
+        candidates = places.get(part)
+        if not candidates:
+            continue
+        for place in candidates:
+            if place.region in qualifiers or place.country in qualifiers:
+                return place
+        return candidates[0]
+    return None
+
+
+def grid_cell(latitude, longitude):
+    row = min(int((latitude + 90) / GRID_DEGREES), GRID_ROWS - 1)
+    column = int((longitude + 180) / GRID_DEGREES) % GRID_COLUMNS
+    return row * GRID_COLUMNS + column
+
+
+def locate_job(job):
+    """
+    Set a job's coordinates and grid cell from its location text.
+    Called before every save (see jobs/signals.py).
+    """
+    place = geocode(job.location)
+    if place is None:
+        job.latitude = job.longitude = job.geo_cell = None
+    else:
+        job.latitude = place.latitude
+        job.longitude = place.longitude
+        job.geo_cell = grid_cell(place.latitude, place.longitude)
+
+
+def rebuild_index(batch_size=2000):
+    """
+    Geocode every job again, e.g. after the gazetteer file changes or
+    after bulk writes that skip model signals.
+    """
+    changed = []
+    for job in Job.objects.only('id', 'location', 'latitude', 'longitude', 'geo_cell').iterator(
+        chunk_size=batch_size
+    ):
+        previous = (job.latitude, job.longitude, job.geo_cell)
+        locate_job(job)
+        if (job.latitude, job.longitude, job.geo_cell) != previous:
+            changed.append(job)
+        if len(changed) >= batch_size:
+            Job.objects.bulk_update(changed, ['latitude', 'longitude', 'geo_cell'])
+            changed = []
+    Job.objects.bulk_update(changed, ['latitude', 'longitude', 'geo_cell'])
+
+
+def _column_ranges(longitude, longitude_delta):
+    """
+    Grid column ranges covering longitude +/- longitude_delta, split in two
+    when the span crosses the antimeridian.
+    """
+    if longitude_delta >= 180:
+        return [(0, GRID_COLUMNS - 1)]
+    first = int((longitude - longitude_delta + 180) / GRID_DEGREES) % GRID_COLUMNS
+    last = int((longitude + longitude_delta + 180) / GRID_DEGREES) % GRID_COLUMNS
+    if first <= last:
+        return [(first, last)]
+    return [(first, GRID_COLUMNS - 1), (0, last)]
+
+
+def _cells_condition(place, radius_km):
+    latitude_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south = max(place.latitude - latitude_delta, -90)
+    north = min(place.latitude + latitude_delta, 90)
+
+    # Longitude degrees shrink towards the poles; size the box for the
+    # latitude furthest from the equator
+    widest = math.cos(math.radians(max(abs(south), abs(north))))
+    if widest < 1e-6:
+        longitude_delta = 180
+    else:
+        longitude_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * widest))
+
+    columns = _column_ranges(place.longitude, longitude_delta)
+    condition = Q()
+    for row in range(grid_cell(south, 0) // GRID_COLUMNS, grid_cell(north, 0) // GRID_COLUMNS + 1):
+        for first, last in columns:
+            condition |= Q(geo_cell__range=(row * GRID_COLUMNS + first, row * GRID_COLUMNS + last))
+    return condition
+
+
+def distance_km(place):
+    """
+    Haversine distance from place to a job's coordinates, as a database expression.
+    """
+    latitude = math.radians(place.latitude)
+    longitude = math.radians(place.longitude)
+    half_chord = (
+        Power(Sin((Radians(F('latitude')) - Value(latitude)) / 2), 2)
+        + Value(math.cos(latitude)) * Cos(Radians(F('latitude')))
+        * Power(Sin((Radians(F('longitude')) - Value(longitude)) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(half_chord), Value(1.0)), output_field=FloatField())
+
+
+def within_radius(queryset, place, radius_km):
+    """
+    Filter a Job queryset to jobs located within radius_km of place.
+    """
+    return queryset.filter(_cells_condition(place, radius_km)).alias(
+        distance_km=distance_km(place)
+    ).filter(distance_km__lte=radius_km)
@@ -0,0 +1,119 @@
+# jobs/management/commands/benchmark_caches.py
+import multiprocessing
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from config.mmap_cache import MmapCache
+
+# About the size of a pickled job card
+VALUE_SIZE = 1500
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the shared memory-mapped cache with LocMemCache and '
+        'FileBasedCache: per-operation latency in one process, and the hit '
+        'rate of several worker processes reading the same keys.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=5000)
+        parser.add_argument('--operations', type=int, default=20000)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix='benchmark-caches-')
+        try:
+            for name, factory in self._backends(directory, options['keys']):
+                self.stdout.write(f'{name}:')
+                self._latency(factory(), options)
+                self._workers(factory, options)
+        finally:
+            shutil.rmtree(directory)
+
+    def _backends(self, directory, keys):
+        # Room for every key, so only sharing (not eviction) changes hit rates
+        params = {'TIMEOUT': 300, 'OPTIONS': {'MAX_ENTRIES': keys * 2}}
+        return [
+            ('LocMemCache', lambda: LocMemCache('benchmark', params)),
+            ('FileBasedCache', lambda: FileBasedCache(f'{directory}/files', params)),
+            ('MmapCache', lambda: MmapCache(f'{directory}/benchmark.cache', params)),
+        ]
+
+    def _latency(self, cache, options):
+        cache.clear()
+        rng = random.Random(options['seed'])
+        keys = [f'key:{index}' for index in range(options['keys'])]
+        value = 'x' * VALUE_SIZE
+
+        timings = {'set': [], 'get (hit)': [], 'get (miss)': []}
+        for key in keys:
+            started = time.perf_counter()
+            cache.set(key, value)
+            timings['set'].append(time.perf_counter() - started)
+        for _ in range(options['operations']):
+            key = rng.choice(keys)
+            started = time.perf_counter()
+            cache.get(key)
+            timings['get (hit)'].append(time.perf_counter() - started)
+        for index in range(options['operations']):
+            started = time.perf_counter()
+            cache.get(f'missing:{index}')
+            timings['get (miss)'].append(time.perf_counter() - started)
+
+        for label, values in timings.items():
+            self.stdout.write(f'  {label}: mean {statistics.mean(values) * 1e6:.1f} us')
+
+    def _workers(self, factory, options):
+        factory().clear()
+        # Forked, so each worker builds its own cache object from the factory
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        workers = [
+            context.Process(target=_simulate_worker, args=(
+                factory, options['keys'], options['operations'] // options['workers'],
+                options['seed'] + worker, queue,
+            ))
+            for worker in range(options['workers'])
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        results = [queue.get() for _ in workers]
+        elapsed = time.perf_counter() - started
+        for worker in workers:
+            worker.join()
+        hits = sum(hit for hit, _ in results)
+        total = sum(count for _, count in results)
+        self.stdout.write(
+            f'  {options["workers"]} workers: hit rate {hits / total:.1%}, '
+            f'{total / elapsed:,.0f} requests/s'
+        )
+
+
+def _simulate_worker(factory, key_count, requests, seed, queue):
+    """
+    One worker process serving requests for Zipf-distributed keys: a miss
+    stores the value, as a view would after computing it. Puts (hits,
+    requests) on queue.
+    """
+    rng = random.Random(seed)
+    cache = factory()
+    weights = [1 / rank for rank in range(1, key_count + 1)]
+    value = 'x' * VALUE_SIZE
+    hits = 0
+    for index in rng.choices(range(key_count), weights, k=requests):
+        key = f'key:{index}'
+        if cache.get(key) is None:
+            cache.set(key, value)
+        else:
+            hits += 1
+    queue.put((hits, requests))
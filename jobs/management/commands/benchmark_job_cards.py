@@ -0,0 +1,86 @@
+# jobs/management/commands/benchmark_job_cards.py
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from jobs import cards
+from jobs.models import Job, JobSearchDocument
+
+from .benchmark_ranking import ROLES, TITLE_WORDS, VOCABULARY
+
+LOCATIONS = ['Remote', 'New York', 'London', 'Berlin', 'Bangalore', 'Toronto', 'Sydney']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare job list card rendering with and without the card cache. '
+        'Cards are built from unsaved synthetic documents; their cache '
+        'entries are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=200)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--cache', default=getattr(settings, 'JOB_CARD_CACHE', 'default'),
+                            help='Cache alias to benchmark (default: settings.JOB_CARD_CACHE).')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        cache = caches[options['cache']]
+        pages = [
+            [self._document(rng, page * options['page_size'] + index)
+             for index in range(options['page_size'])]
+            for page in range(options['pages'])
+        ]
+
+        uncached = self._time(pages, lambda page: cards.render_cards(page, cache=False))
+        cold = self._time(pages, lambda page: cards.render_cards(page, cache=cache))
+        warm = self._time(pages, lambda page: cards.render_cards(page, cache=cache))
+        cache.delete_many([cards.card_key(job) for page in pages for job in page])
+
+        self.stdout.write(f'{len(pages)} pages of {options["page_size"]} cards, cache "{options["cache"]}":')
+        self._report('no cache', uncached)
+        self._report('cold cache', cold)
+        self._report('warm cache', warm)
+        self.stdout.write(f'Warm pages render {statistics.mean(uncached) / statistics.mean(warm):.1f}x faster.')
+
+    def _document(self, rng, index):
+        now = timezone.now()
+        salary = rng.randrange(30, 200) * 1000
+        return JobSearchDocument(
+            # Far above real ids, so the benchmark never reads a real job's card
+            job_id=10 ** 12 + index,
+            title=f'{rng.choice(TITLE_WORDS)} {rng.choice(VOCABULARY).title()} {rng.choice(ROLES)}'.strip(),
+            company_name=f'{rng.choice(VOCABULARY).title()} Inc.',
+            location=rng.choice(LOCATIONS),
+            job_type=rng.choice(Job.JOB_TYPES)[0],
+            salary_min=Decimal(salary),
+            salary_max=Decimal(salary + rng.randrange(5, 50) * 1000),
+            summary=' '.join(rng.choices(VOCABULARY, k=30)),
+            created_at=now - timedelta(minutes=rng.randrange(60 * 24 * 30)),
+            updated_at=now,
+        )
+
+    def _time(self, pages, render):
+        timings = []
+        for page in pages:
+            started = time.perf_counter()
+            render(page)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f'{label}: mean {statistics.mean(timings):.2f} ms, '
+            f'p50 {statistics.median(timings):.2f} ms, '
+            f'p95 {p95:.2f} ms, max {timings[-1]:.2f} ms per page'
+        )
@@ -0,0 +1,105 @@
+# jobs/management/commands/benchmark_ranking.py
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs import documents, ranking
+from jobs.models import Job, JobSearchDocument
+from jobs.pagination import paginate_ranked
+from users.models import User
+
+VOCABULARY = """
+python django flask backend frontend react javascript typescript java spring
+kotlin android ios swift golang rust devops kubernetes docker aws azure gcp
+terraform linux sql postgres mysql redis kafka spark hadoop data engineer
+scientist analyst machine learning deep nlp vision product manager designer
+ux ui marketing sales support customer success finance accounting legal hr
+recruiter senior junior lead principal staff intern remote hybrid onsite
+startup enterprise healthcare fintech ecommerce logistics gaming security
+testing qa automation mobile web cloud platform infrastructure network
+embedded firmware hardware blockchain analytics reporting excel tableau
+""".split()
+
+# Zipf-like term frequencies: a few very common terms and a long tail
+VOCABULARY_WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+TITLE_WORDS = ['Senior', 'Junior', 'Lead', 'Staff', 'Principal', '']
+ROLES = ['Engineer', 'Developer', 'Analyst', 'Manager', 'Designer', 'Scientist']
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure BM25 ranking latency on synthetic jobs. '
+        'Everything runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self._run(rng, options['jobs'], options['queries'])
+            transaction.set_rollback(True)
+
+    def _run(self, rng, job_count, query_count):
+        employer = User.objects.create(username='__benchmark_employer__', user_type='employer')
+
+        self.stdout.write(f'Creating {job_count} synthetic jobs...')
+        started = time.perf_counter()
+        batch = []
+        for _ in range(job_count):
+            keywords = rng.sample(VOCABULARY, 3)
+            batch.append(Job(
+                employer=employer,
+                title=f'{rng.choice(TITLE_WORDS)} {keywords[0].title()} {rng.choice(ROLES)}'.strip(),
+                description=' '.join(rng.choices(VOCABULARY, VOCABULARY_WEIGHTS, k=rng.randint(30, 80))),
+                requirements=' '.join(keywords + rng.choices(VOCABULARY, VOCABULARY_WEIGHTS, k=rng.randint(5, 20))),
+                location='Remote',
+                job_type='full_time',
+            ))
+            if len(batch) == 5000:
+                Job.objects.bulk_create(batch)
+                batch = []
+        Job.objects.bulk_create(batch)
+        self.stdout.write(f'  done in {time.perf_counter() - started:.1f}s')
+
+        self.stdout.write('Building search documents and term statistics...')
+        started = time.perf_counter()
+        documents.rebuild_index()
+        ranking.rebuild_index()
+        self.stdout.write(f'  done in {time.perf_counter() - started:.1f}s')
+
+        queries = [
+            ' '.join(rng.sample(VOCABULARY, rng.randint(1, 3)))
+            for _ in range(query_count)
+        ]
+        active_jobs = JobSearchDocument.objects.all()
+
+        rank_times = []
+        page_times = []
+        for query in queries:
+            started = time.perf_counter()
+            ranked = ranking.rank(query)
+            ranked_at = time.perf_counter()
+            paginate_ranked(active_jobs, [job_id for job_id, _ in ranked], None, 20)
+            finished = time.perf_counter()
+            rank_times.append((ranked_at - started) * 1000)
+            page_times.append((finished - started) * 1000)
+
+        self._report('rank()', rank_times)
+        self._report('rank() + first page', page_times)
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f'{label}: mean {statistics.mean(timings):.1f} ms, '
+            f'p50 {statistics.median(timings):.1f} ms, '
+            f'p95 {p95:.1f} ms, max {timings[-1]:.1f} ms '
+            f'over {len(timings)} queries'
+        )
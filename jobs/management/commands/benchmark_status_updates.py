@@ -0,0 +1,81 @@
+# jobs/management/commands/benchmark_status_updates.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from config.query_budget import QueryCounter
+from jobs import counters, employer_stats, review
+from jobs.models import Job, Application, EmployerStats
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare moving applications to a new status one save() at a time '
+        'with the single-UPDATE bulk path, on synthetic applications. '
+        'Everything runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._run(options['applications'])
+            transaction.set_rollback(True)
+
+    def _run(self, application_count):
+        employer = User.objects.create(username='__benchmark_employer__', user_type='employer')
+        job = Job.objects.create(
+            employer=employer,
+            title='Benchmark Engineer',
+            description='Synthetic job for the status update benchmark.',
+            requirements='None',
+            location='Remote',
+            job_type='full_time',
+        )
+
+        self.stdout.write(f'Creating {application_count} synthetic applications...')
+        applicants = User.objects.bulk_create([
+            User(username=f'__benchmark_applicant_{index}__', user_type='job_seeker')
+            for index in range(application_count)
+        ], batch_size=5000)
+        Application.objects.bulk_create([
+            Application(job=job, applicant=applicant, cover_letter='Hello')
+            for applicant in applicants
+        ], batch_size=5000)
+        counters.recount_job(job.pk)
+        employer_stats.recount(employer.pk)
+
+        # Current path: load each application and save it, firing the signals
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            started = time.perf_counter()
+            for application in Application.objects.filter(job=job).iterator(chunk_size=2000):
+                application.status = 'reviewed'
+                application.save()
+            elapsed = time.perf_counter() - started
+        self._report('save() per application', elapsed, queries.count)
+        self._check(job, employer, 'reviewed', application_count)
+
+        # Bulk path: one UPDATE plus the counter adjustments
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            started = time.perf_counter()
+            review.bulk_update_status(job, 'interview')
+            elapsed = time.perf_counter() - started
+        self._report('bulk_update_status()', elapsed, queries.count)
+        self._check(job, employer, 'interview', application_count)
+
+    def _report(self, label, elapsed, query_count):
+        self.stdout.write(f'{label}: {elapsed * 1000:.1f} ms, {query_count} queries')
+
+    def _check(self, job, employer, status, expected):
+        job = Job.objects.get(pk=job.pk)
+        stats = EmployerStats.objects.get(pk=employer.pk)
+        found = (
+            getattr(job, counters.status_field(status)),
+            getattr(stats, employer_stats.status_field(status)),
+        )
+        if found != (expected, expected):
+            raise CommandError(f'Counters out of sync after moving to {status}: {found}')
@@ -0,0 +1,216 @@
+# jobs/management/commands/import_jobs.py
+import csv
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from jobs import documents, employer_stats, geo, ranking, salaries, search, trigrams
+from jobs.forms import JobPostForm
+from jobs.models import Job
+from users.models import EmployerProfile, User
+
+# Columns copied from a feed row onto the job (validated by JobPostForm)
+FORM_FIELDS = JobPostForm._meta.fields
+
+# Jobs updated in place when their external id was imported before
+UPDATE_FIELDS = FORM_FIELDS + ['is_active', 'updated_at', 'latitude', 'longitude', 'geo_cell']
+
+# Above this many imported jobs the BM25 statistics are rebuilt in one pass
+# instead of indexing each job on its own
+RANKING_REBUILD_THRESHOLD = 1000
+
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'off', 'inactive'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import an employer's job feed from CSV or JSON Lines. Rows are "
+        'validated like the job posting form and upserted by their '
+        'external_id in batches.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Feed file, or - to read standard input.')
+        parser.add_argument('--employer', required=True, help='Username of the employer the jobs belong to.')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-errors', type=int, default=20, help='Invalid rows to report in detail.')
+
+    def handle(self, *args, **options):
+        try:
+            employer = User.objects.get(username=options['employer'], user_type='employer')
+        except User.DoesNotExist:
+            raise CommandError(f'No employer named "{options["employer"]}".')
+
+        self.verbosity = options['verbosity']
+        feed_format = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.ndjson')) else 'csv')
+        if options['path'] == '-':
+            if not options['format']:
+                raise CommandError('Pass --format when reading standard input.')
+            self._import(sys.stdin, feed_format, employer, options)
+        else:
+            try:
+                with open(options['path'], newline='', encoding='utf-8') as feed:
+                    self._import(feed, feed_format, employer, options)
+            except OSError as exc:
+                raise CommandError(exc)
+
+    def _import(self, feed, feed_format, employer, options):
+        self.employer = employer
+        self.company_name = EmployerProfile.objects.filter(user=employer).values_list(
+            'company_name', flat=True
+        ).first() or ''
+        self.max_errors = options['max_errors']
+        self.counts = {'created': 0, 'updated': 0, 'invalid': 0}
+        self.imported_ids = []
+
+        started = time.perf_counter()
+        rows = read_csv(feed) if feed_format == 'csv' else read_jsonl(feed)
+        batch = {}
+        for line, row in rows:
+            job = self._validate(line, row)
+            if job is not None:
+                # A repeated external id within one batch: the last row wins
+                batch[job.external_id] = job
+            if len(batch) >= options['batch_size']:
+                self._write_batch(list(batch.values()))
+                batch = {}
+                self._progress(started)
+        if batch:
+            self._write_batch(list(batch.values()))
+
+        self._finish()
+        elapsed = time.perf_counter() - started
+        written = self.counts['created'] + self.counts['updated']
+        rate = written / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {written} jobs ({self.counts["created"]} created, {self.counts["updated"]} updated, '
+            f'{self.counts["invalid"]} invalid rows skipped) in {elapsed:.1f}s, {rate:.0f} rows/s.'
+        ))
+
+    def _validate(self, line, row):
+        """
+        An unsaved Job for a valid feed row, or None after reporting why
+        the row was rejected.
+        """
+        if row is None:
+            self._reject(line, 'not a JSON object.')
+            return None
+
+        external_id = str(row.get('external_id') or '').strip()
+        form = JobPostForm({
+            name: '' if row.get(name) is None else str(row[name]) for name in FORM_FIELDS
+        })
+        if not external_id:
+            form.add_error(None, 'external_id is required.')
+        elif len(external_id) > Job._meta.get_field('external_id').max_length:
+            form.add_error(None, 'external_id is too long.')
+
+        if not form.is_valid():
+            self._reject(line, '; '.join(
+                f'{field}: {" ".join(messages)}' if field != '__all__' else ' '.join(messages)
+                for field, messages in form.errors.items()
+            ))
+            return None
+
+        job = Job(employer=self.employer, external_id=external_id, **form.cleaned_data)
+        job.is_active = str(row.get('is_active', '')).strip().lower() not in FALSE_VALUES
+        geo.locate_job(job)
+        return job
+
+    def _reject(self, line, reason):
+        self.counts['invalid'] += 1
+        if self.counts['invalid'] <= self.max_errors:
+            self.stderr.write(f'Line {line}: {reason}')
+
+    @transaction.atomic
+    def _write_batch(self, jobs):
+        existing = {
+            job.external_id: job
+            for job in Job.objects.filter(
+                employer=self.employer, external_id__in=[job.external_id for job in jobs]
+            ).only('id', 'external_id', 'created_at', *UPDATE_FIELDS)
+        }
+
+        created = []
+        updated = []
+        now = timezone.now()
+        for job in jobs:
+            current = existing.get(job.external_id)
+            if current is None:
+                created.append(job)
+                continue
+            for field in UPDATE_FIELDS:
+                setattr(current, field, getattr(job, field))
+            current.updated_at = now
+            updated.append(current)
+
+        # Updated jobs still remember their stored values, so their histogram buckets can move
+        salaries.index_jobs(updated)
+        Job.objects.bulk_update(updated, UPDATE_FIELDS)
+        Job.objects.bulk_create(created)
+        if created and created[0].pk is None:
+            # Backends that don't return ids from bulk inserts (MySQL)
+            ids = dict(Job.objects.filter(
+                employer=self.employer, external_id__in=[job.external_id for job in created]
+            ).values_list('external_id', 'id'))
+            for job in created:
+                job.pk = ids[job.external_id]
+        salaries.index_jobs(created, created=True)
+
+        # bulk_create/bulk_update skip the model signals that keep these in sync
+        written = created + updated
+        documents.index_jobs(written, self.company_name)
+        search.index_jobs(written)
+        trigrams.index_jobs(written)
+        if len(self.imported_ids) <= RANKING_REBUILD_THRESHOLD:
+            self.imported_ids.extend(job.pk for job in written)
+
+        self.counts['created'] += len(created)
+        self.counts['updated'] += len(updated)
+
+    @transaction.atomic
+    def _finish(self):
+        """
+        Bring the statistics that span batches up to date.
+        """
+        if len(self.imported_ids) > RANKING_REBUILD_THRESHOLD:
+            ranking.rebuild_index()
+        else:
+            for job in Job.objects.filter(pk__in=self.imported_ids):
+                ranking.index_job(job)
+        employer_stats.recount(self.employer.pk)
+
+    def _progress(self, started):
+        if self.verbosity < 2:
+            return
+        written = self.counts['created'] + self.counts['updated']
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'  {written} jobs written, {written / elapsed:.0f} rows/s')
+
+
+def read_csv(feed):
+    """
+    Yield (line number, row dict) for each CSV record.
+    """
+    reader = csv.DictReader(feed)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(feed):
+    """
+    Yield (line number, row dict) for each JSON Lines record, skipping
+    blank lines. A line that isn't a JSON object yields None.
+    """
+    for line, text in enumerate(feed, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError:
+            row = None
+        yield line, row if isinstance(row, dict) else None
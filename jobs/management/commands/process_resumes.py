@@ -0,0 +1,46 @@
+# jobs/management/commands/process_resumes.py
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from jobs import resumes
+
+
+class Command(BaseCommand):
+    help = (
+        'Extract and index the text of uploaded resumes queued by profile '
+        'edits. Drains the queue and exits, or keeps watching it with --watch.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Resumes claimed at a time (default: two per worker).',
+        )
+        parser.add_argument(
+            '--watch', type=float, metavar='SECONDS',
+            help='Keep running, checking for new uploads this often.',
+        )
+        parser.add_argument('--retry-failed', action='store_true', help='Queue resumes that failed before again.')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            self.stdout.write(f'{resumes.requeue_failed()} failed resumes queued again.')
+
+        started = time.perf_counter()
+        try:
+            counts = resumes.process(
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                poll_interval=options['watch'],
+                stdout=self.stdout if options['verbosity'] >= 2 else None,
+            )
+        except KeyboardInterrupt:
+            # Resumes claimed by this run are claimed again once resumes.CLAIM_TIMEOUT passes
+            self.stdout.write('Stopped.')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Resumes extracted: {counts["done"]}, failed: {counts["failed"]}, '
+            f'to retry: {counts["pending"]} in {time.perf_counter() - started:.1f}s.'
+        ))
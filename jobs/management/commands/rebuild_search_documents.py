@@ -0,0 +1,25 @@
+# jobs/management/commands/rebuild_search_documents.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs import documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized job search documents from the jobs table in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(written):
+            self.stdout.write(f'  {written} documents written')
+
+        with transaction.atomic():
+            written = documents.rebuild_index(options['batch_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} job search documents in {time.perf_counter() - started:.1f}s.'
+        ))
@@ -0,0 +1,18 @@
+# jobs/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs import documents, geo, search, ranking, trigrams, salaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the job search documents and the full-text, BM25, trigram, location and salary indexes from the jobs table.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            search.rebuild_index()
+            indexed = ranking.rebuild_index()
+            trigrams.rebuild_index()
+            geo.rebuild_index()
+            documents.rebuild_index()
+            salaries.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Job search index rebuilt ({indexed} active jobs).'))
@@ -0,0 +1,19 @@
+# jobs/management/commands/reconcile_application_counters.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from jobs import counters, employer_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount per-job application counters from the applications table, fix any that drifted and rebuild the employer statistics from them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = counters.reconcile(options['batch_size'])
+            employers = employer_stats.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Application counters reconciled ({fixed} jobs fixed, {employers} employers recounted).'
+        ))
@@ -0,0 +1,34 @@
+# jobs/management/commands/refresh_recommendations.py
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from jobs import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the top job recommendations of job seekers whose profile, '
+        'applications or recommended jobs changed since the last run, and merge '
+        'newly posted jobs into everyone else\'s. Run it from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every job seeker.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--top-k', type=int, default=recommendations.TOP_K)
+        parser.add_argument('--chunk-size', type=int, default=recommendations.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        run = recommendations.refresh(
+            full=options['full'],
+            top_k=options['top_k'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Full" if run.full else "Incremental"} recommendation run: '
+            f'{run.seekers_recomputed} job seekers recomputed, {run.seekers_merged} merged with new jobs '
+            f'in {time.perf_counter() - started:.1f}s.'
+        ))
@@ -0,0 +1,175 @@
+# jobs/matching.py
+"""
+Applicant-to-job match scores for employers reviewing applications.
+
+A job is described by the terms of its requirements and an applicant by
+the terms of their profile skills, both analyzed like search text (see
+jobs/ranking.py). Each side becomes a sparse TF-IDF vector, with
+sublinear term frequencies and the idf taken from the document
+frequencies the BM25 index already keeps. The match score is the cosine
+similarity of the two vectors, from 0 (no shared terms) to 1.
+
+The applicants of a job are scored together: their vectors form the
+rows of a sparse matrix, which is multiplied by the job's vector one
+shared term at a time, so the cost depends on the number of non-zero
+entries rather than on applicants x vocabulary.
+
+Term-frequency vectors are cached. A job's entry is keyed by its
+updated_at, so an edited job is never scored with its old requirements,
+in this process or any other. Profiles have no such timestamp: their
+entries are dropped when the profile is saved (see jobs/signals.py),
+which only reaches the other worker processes when the default cache is
+shared, so they also expire after PROFILE_VECTOR_CACHE_TIMEOUT. Idf
+weights are looked up per scoring pass, so they follow the corpus as it
+changes.
+"""
+import math
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+
+from users.models import JobSeekerProfile
+from .models import SearchTerm, SearchCorpusStats
+from .ranking import analyze
+
+# Job vectors are never stale (see _job_key); unused ones are dropped after this long
+VECTOR_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Longest a profile edit can go unnoticed by a process with its own cache
+PROFILE_VECTOR_CACHE_TIMEOUT = 60 * 5
+
+# Terms or users looked up per query (SQLite allows at most 999 parameters before 3.32)
+IDF_CHUNK_SIZE = 500
+
+
+def term_frequencies(text):
+    """
+    Sparse sublinear term-frequency vector {term: 1 + log(count)}.
+    """
+    return {
+        term: 1 + math.log(count)
+        for term, count in Counter(analyze(text)).items()
+    }
+
+
+def _profile_key(user_id):
+    return f'jobs:matching:profile:{user_id}'
+
+
+def _job_key(job):
+    return f'jobs:matching:job:{job.pk}:{job.updated_at.timestamp():.6f}'
+
+
+def profile_vectors(user_ids):
+    """
+    {user id: term frequencies of their skills} for job seekers, from the
+    cache when possible. Users without a profile get an empty vector.
+    """
+    keys = {_profile_key(user_id): user_id for user_id in set(user_ids)}
+    cached = cache.get_many(keys)
+    vectors = {keys[key]: vector for key, vector in cached.items()}
+
+    missing = [user_id for key, user_id in keys.items() if key not in cached]
+    if missing:
+        fresh = dict.fromkeys(missing, {})
+        for start in range(0, len(missing), IDF_CHUNK_SIZE):
+            skills = JobSeekerProfile.objects.filter(
+                user_id__in=missing[start:start + IDF_CHUNK_SIZE]
+            ).values_list('user_id', 'skills')
+            for user_id, text in skills:
+                fresh[user_id] = term_frequencies(text)
+        cache.set_many(
+            {_profile_key(user_id): vector for user_id, vector in fresh.items()},
+            PROFILE_VECTOR_CACHE_TIMEOUT,
+        )
+        vectors.update(fresh)
+    return vectors
+
+
+def job_vector(job):
+    """
+    Term frequencies of a job's requirements, from the cache when possible.
+    """
+    key = _job_key(job)
+    vector = cache.get(key)
+    if vector is None:
+        vector = term_frequencies(job.requirements)
+        cache.set(key, vector, VECTOR_CACHE_TIMEOUT)
+    return vector
+
+
+def invalidate_profile(user_id):
+    cache.delete(_profile_key(user_id))
+
+
+def idf(terms):
+    """
+    Smoothed inverse document frequency of terms over the indexed jobs.
+    Terms no job uses get the highest weight.
+    """
+    terms = list(set(terms))
+    total = SearchCorpusStats.load().document_count
+    frequencies = {}
+    for start in range(0, len(terms), IDF_CHUNK_SIZE):
+        frequencies.update(SearchTerm.objects.filter(
+            term__in=terms[start:start + IDF_CHUNK_SIZE]
+        ).values_list('term', 'document_count'))
+    return {
+        term: math.log((1 + total) / (1 + frequencies.get(term, 0))) + 1
+        for term in terms
+    }
+
+
+def score_applicants(job, applicants):
+    """
+    Match scores of several applicants against job in one pass.
+    applicants is an iterable of (key, user id) pairs, e.g. application
+    ids with their applicant ids; returns {key: score between 0 and 1}.
+    """
+    applicants = list(applicants)
+    scores = dict.fromkeys((key for key, _ in applicants), 0.0)
+    query = job_vector(job)
+    if not query or not applicants:
+        return scores
+
+    vectors = profile_vectors(user_id for _, user_id in applicants)
+    rows = [(key, vectors[user_id]) for key, user_id in applicants if vectors[user_id]]
+    weights = idf(set(query).union(*(vector for _, vector in rows)))
+
+    # Weight the job vector and normalize it to unit length
+    query = {term: tf * weights[term] for term, tf in query.items()}
+    query_norm = math.sqrt(sum(value * value for value in query.values()))
+
+    # Sparse matrix (rows = applicants) times the job vector, term by term
+    columns = defaultdict(list)
+    norms = []
+    for row, (_, vector) in enumerate(rows):
+        squared = 0.0
+        for term, tf in vector.items():
+            value = tf * weights[term]
+            squared += value * value
+            if term in query:
+                columns[term].append((row, value))
+        norms.append(math.sqrt(squared))
+
+    dots = [0.0] * len(rows)
+    for term, entries in columns.items():
+        weight = query[term]
+        for row, value in entries:
+            dots[row] += value * weight
+
+    for row, (key, _) in enumerate(rows):
+        if dots[row]:
+            scores[key] = dots[row] / (norms[row] * query_norm)
+    return scores
+
+
+def rank_applications(job, applications):
+    """
+    Score every application in the applications queryset of job.
+    Returns [(application id, score), ...] best match first; ties keep
+    the most recent application first.
+    """
+    rows = list(applications.order_by('-applied_at', '-id').values_list('id', 'applicant_id'))
+    scores = score_applicants(job, rows)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-18 10:12
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE jobs_fts USING fts5("
+            "title, description, location, "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            "INSERT INTO jobs_fts (rowid, title, description, location) "
+            "SELECT id, title, description, location FROM jobs WHERE is_active"
+        )
+    elif vendor == "mysql":
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX jobs_title_description_ft ON jobs (title, description)"
+        )
+        schema_editor.execute("CREATE FULLTEXT INDEX jobs_location_ft ON jobs (location)")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS jobs_fts")
+    elif vendor == "mysql":
+        schema_editor.execute("DROP INDEX jobs_title_description_ft ON jobs")
+        schema_editor.execute("DROP INDEX jobs_location_ft ON jobs")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0003_job_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="job",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "-created_at", "-id"],
+                name="jobs_active_recent_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0004_job_listing_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobTermStats",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="term_stats",
+                        serialize=False,
+                        to="jobs.job",
+                    ),
+                ),
+                ("title_length", models.PositiveIntegerField(default=0)),
+                ("description_length", models.PositiveIntegerField(default=0)),
+                ("requirements_length", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "job_term_stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchCorpusStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("document_count", models.PositiveIntegerField(default=0)),
+                ("title_length_total", models.PositiveBigIntegerField(default=0)),
+                ("description_length_total", models.PositiveBigIntegerField(default=0)),
+                (
+                    "requirements_length_total",
+                    models.PositiveBigIntegerField(default=0),
+                ),
+            ],
+            options={
+                "db_table": "search_corpus_stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=100, unique=True)),
+                ("document_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "search_terms",
+            },
+        ),
+        migrations.CreateModel(
+            name="JobTermPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("weight", models.FloatField()),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="jobs.job"
+                    ),
+                ),
+                (
+                    "term",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="jobs.searchterm",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "job_term_postings",
+                "indexes": [
+                    models.Index(
+                        fields=["term", "job", "weight"],
+                        name="job_term_postings_score_idx",
+                    )
+                ],
+                "unique_together": {("term", "job")},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0005_job_term_statistics"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "job_type", "location"], name="jobs_facet_idx"
+            ),
+        ),
+    ]
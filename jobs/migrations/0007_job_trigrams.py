@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0006_job_facet_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobTrigram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "field",
+                    models.CharField(
+                        choices=[("title", "Title"), ("location", "Location")],
+                        max_length=10,
+                    ),
+                ),
+                ("trigram", models.CharField(max_length=3)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="jobs.job"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "job_trigrams",
+                "indexes": [
+                    models.Index(
+                        fields=["field", "trigram", "job"],
+                        name="job_trigrams_lookup_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def geocode_jobs(apps, schema_editor):
+    from jobs.geo import geocode, grid_cell
+
+    Job = apps.get_model("jobs", "Job")
+    changed = []
+    for job in Job.objects.only("id", "location").iterator(chunk_size=2000):
+        place = geocode(job.location)
+        if place is None:
+            continue
+        job.latitude = place.latitude
+        job.longitude = place.longitude
+        job.geo_cell = grid_cell(place.latitude, place.longitude)
+        changed.append(job)
+    Job.objects.bulk_update(changed, ["latitude", "longitude", "geo_cell"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0007_job_trigrams"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="geo_cell",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="latitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="longitude",
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "geo_cell"], name="jobs_geo_cell_idx"
+            ),
+        ),
+        migrations.RunPython(geocode_jobs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def count_salaries(apps, schema_editor):
+    from collections import Counter
+
+    from jobs.salaries import bucket_for, representative_salary
+
+    Job = apps.get_model("jobs", "Job")
+    SalaryHistogramBucket = apps.get_model("jobs", "SalaryHistogramBucket")
+    counts = Counter()
+    rows = Job.objects.filter(is_active=True).values_list("job_type", "salary_min", "salary_max")
+    for job_type, salary_min, salary_max in rows.iterator(chunk_size=5000):
+        salary = representative_salary(salary_min, salary_max)
+        if salary is not None:
+            counts[job_type, bucket_for(salary)] += 1
+    SalaryHistogramBucket.objects.bulk_create(
+        [
+            SalaryHistogramBucket(job_type=job_type, bucket=bucket, job_count=count)
+            for (job_type, bucket), count in counts.items()
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0008_job_geolocation"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SalaryHistogramBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "job_type",
+                    models.CharField(
+                        choices=[
+                            ("full_time", "Full Time"),
+                            ("part_time", "Part Time"),
+                            ("contract", "Contract"),
+                            ("internship", "Internship"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("bucket", models.PositiveSmallIntegerField()),
+                ("job_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "salary_histogram",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "salary_min", "-created_at", "-id"],
+                name="jobs_salary_min_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "salary_max", "-created_at", "-id"],
+                name="jobs_salary_max_idx",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="salaryhistogrambucket",
+            unique_together={("job_type", "bucket")},
+        ),
+        migrations.RunPython(count_salaries, migrations.RunPython.noop),
+    ]
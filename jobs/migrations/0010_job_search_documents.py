@@ -0,0 +1,144 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_documents(apps, schema_editor):
+    from jobs.documents import summarize
+
+    Job = apps.get_model("jobs", "Job")
+    JobSearchDocument = apps.get_model("jobs", "JobSearchDocument")
+    EmployerProfile = apps.get_model("users", "EmployerProfile")
+    company_names = dict(EmployerProfile.objects.values_list("user_id", "company_name"))
+    documents = [
+        JobSearchDocument(
+            job_id=job.pk,
+            title=job.title,
+            company_name=company_names.get(job.employer_id, ""),
+            location=job.location,
+            job_type=job.job_type,
+            salary_min=job.salary_min,
+            salary_max=job.salary_max,
+            summary=summarize(job.description),
+            created_at=job.created_at,
+            latitude=job.latitude,
+            longitude=job.longitude,
+            geo_cell=job.geo_cell,
+        )
+        for job in Job.objects.filter(is_active=True).iterator(chunk_size=2000)
+    ]
+    JobSearchDocument.objects.bulk_create(documents, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0009_salary_histogram"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobSearchDocument",
+            fields=[
+                (
+                    "job",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="jobs.job",
+                    ),
+                ),
+                ("title", models.CharField(max_length=200)),
+                ("company_name", models.CharField(blank=True, max_length=200)),
+                ("location", models.CharField(max_length=200)),
+                (
+                    "job_type",
+                    models.CharField(
+                        choices=[
+                            ("full_time", "Full Time"),
+                            ("part_time", "Part Time"),
+                            ("contract", "Contract"),
+                            ("internship", "Internship"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "salary_min",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                (
+                    "salary_max",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                ("summary", models.CharField(blank=True, max_length=300)),
+                ("created_at", models.DateTimeField()),
+                ("latitude", models.FloatField(blank=True, null=True)),
+                ("longitude", models.FloatField(blank=True, null=True)),
+                ("geo_cell", models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "job_search_documents",
+                "ordering": ["-created_at", "-job"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_active_recent_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_facet_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_geo_cell_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_salary_min_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="jobs_salary_max_idx",
+        ),
+        migrations.AddIndex(
+            model_name="jobsearchdocument",
+            index=models.Index(
+                fields=["-created_at", "-job"], name="job_documents_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobsearchdocument",
+            index=models.Index(
+                fields=["job_type", "location"], name="job_documents_facet_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobsearchdocument",
+            index=models.Index(fields=["geo_cell"], name="job_documents_geo_cell_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="jobsearchdocument",
+            index=models.Index(
+                fields=["salary_min", "-created_at", "-job"],
+                name="job_documents_salary_min_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobsearchdocument",
+            index=models.Index(
+                fields=["salary_max", "-created_at", "-job"],
+                name="job_documents_salary_max_idx",
+            ),
+        ),
+        migrations.RunPython(create_documents, migrations.RunPython.noop),
+    ]
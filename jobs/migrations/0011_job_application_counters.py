@@ -0,0 +1,61 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:24
+
+from django.db import migrations, models
+
+
+def count_applications(apps, schema_editor):
+    from collections import defaultdict
+
+    from django.db.models import Count
+
+    Job = apps.get_model("jobs", "Job")
+    Application = apps.get_model("jobs", "Application")
+    counts = defaultdict(dict)
+    rows = Application.objects.values("job_id", "status").annotate(total=Count("pk"))
+    for row in rows:
+        job_counts = counts[row["job_id"]]
+        job_counts["application_count"] = job_counts.get("application_count", 0) + row["total"]
+        job_counts[f"{row['status']}_count"] = row["total"]
+    for job_id, job_counts in counts.items():
+        Job.objects.filter(pk=job_id).update(**job_counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0010_job_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="accepted_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="application_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="interview_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="pending_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="rejected_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="reviewed_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_employer_stats(apps, schema_editor):
+    from django.db.models import Count, Max, Q, Sum
+
+    Job = apps.get_model("jobs", "Job")
+    Application = apps.get_model("jobs", "Application")
+    EmployerStats = apps.get_model("jobs", "EmployerStats")
+    statuses = ["pending", "reviewed", "interview", "rejected", "accepted"]
+    rows = (
+        Job.objects.order_by()
+        .values("employer_id")
+        .annotate(
+            active_jobs=Count("pk", filter=Q(is_active=True)),
+            inactive_jobs=Count("pk", filter=Q(is_active=False)),
+            applications_received=Sum("application_count"),
+            last_job_posted_at=Max("created_at"),
+            **{f"{status}_applications": Sum(f"{status}_count") for status in statuses},
+        )
+    )
+    last_applications = dict(
+        Application.objects.order_by()
+        .values("job__employer_id")
+        .annotate(last=Max("applied_at"))
+        .values_list("job__employer_id", "last")
+    )
+    EmployerStats.objects.bulk_create(
+        [
+            EmployerStats(last_application_at=last_applications.get(row["employer_id"]), **row)
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0011_job_application_counters"),
+        ("users", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmployerStats",
+            fields=[
+                (
+                    "employer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="employer_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("active_jobs", models.PositiveIntegerField(default=0)),
+                ("inactive_jobs", models.PositiveIntegerField(default=0)),
+                ("applications_received", models.PositiveIntegerField(default=0)),
+                ("pending_applications", models.PositiveIntegerField(default=0)),
+                ("reviewed_applications", models.PositiveIntegerField(default=0)),
+                ("interview_applications", models.PositiveIntegerField(default=0)),
+                ("rejected_applications", models.PositiveIntegerField(default=0)),
+                ("accepted_applications", models.PositiveIntegerField(default=0)),
+                ("last_job_posted_at", models.DateTimeField(blank=True, null=True)),
+                ("last_application_at", models.DateTimeField(blank=True, null=True)),
+                ("last_status_change_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "employer_stats",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["employer", "-created_at"], name="jobs_employer_recent_idx"
+            ),
+        ),
+        migrations.RunPython(build_employer_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0012_employer_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "-applied_at", "-id"], name="applications_job_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["job", "status", "-applied_at", "-id"],
+                name="applications_job_status_idx",
+            ),
+        ),
+    ]
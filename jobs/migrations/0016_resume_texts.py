@@ -0,0 +1,97 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_resume_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE resumes_fts USING fts5("
+            "text, tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif vendor == "mysql":
+        schema_editor.execute("CREATE FULLTEXT INDEX resume_texts_text_ft ON resume_texts (text)")
+
+
+def drop_resume_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS resumes_fts")
+    elif vendor == "mysql":
+        schema_editor.execute("DROP INDEX resume_texts_text_ft ON resume_texts")
+
+
+def queue_uploaded_resumes(apps, schema_editor):
+    from django.utils import timezone
+
+    JobSeekerProfile = apps.get_model("users", "JobSeekerProfile")
+    ResumeText = apps.get_model("jobs", "ResumeText")
+    now = timezone.now()
+    ResumeText.objects.bulk_create(
+        [
+            ResumeText(seeker_id=user_id, resume=resume, queued_at=now)
+            for user_id, resume in JobSeekerProfile.objects.exclude(resume="").values_list(
+                "user_id", "resume"
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0015_job_recommendations"),
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumeText",
+            fields=[
+                (
+                    "seeker",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="resume_text",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("resume", models.CharField(max_length=100)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("done", "Done"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("text", models.TextField(blank=True)),
+                ("error", models.CharField(blank=True, max_length=200)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("queued_at", models.DateTimeField()),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                ("extracted_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "resume_texts",
+                "indexes": [
+                    models.Index(
+                        fields=["status", "queued_at"], name="resume_texts_queue_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_resume_search_index, drop_resume_search_index),
+        migrations.RunPython(queue_uploaded_resumes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_job_updated_at(apps, schema_editor):
+    from django.db.models import OuterRef, Subquery
+
+    Job = apps.get_model("jobs", "Job")
+    JobSearchDocument = apps.get_model("jobs", "JobSearchDocument")
+    JobSearchDocument.objects.update(
+        updated_at=Subquery(Job.objects.filter(pk=OuterRef("job_id")).values("updated_at")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0016_resume_texts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobsearchdocument",
+            name="updated_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_job_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0017_job_search_document_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "-created_at", "-id"],
+                name="jobs_active_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "job_type", "location"], name="jobs_facet_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "geo_cell"], name="jobs_geo_cell_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "salary_min", "-created_at", "-id"],
+                name="jobs_salary_min_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["is_active", "salary_max", "-created_at", "-id"],
+                name="jobs_salary_max_idx",
+            ),
+        ),
+    ]
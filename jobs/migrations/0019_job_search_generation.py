@@ -0,0 +1,31 @@
+# Generated by Django 6.0.2 on 2026-10-18 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0018_job_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobSearchGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "job_search_generation",
+            },
+        ),
+    ]
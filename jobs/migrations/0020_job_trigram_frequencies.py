@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+
+def count_trigrams(apps, schema_editor):
+    from django.db.models import Count
+
+    JobTrigram = apps.get_model("jobs", "JobTrigram")
+    JobTrigramFrequency = apps.get_model("jobs", "JobTrigramFrequency")
+    rows = JobTrigram.objects.order_by().values("field", "trigram").annotate(total=Count("pk"))
+    JobTrigramFrequency.objects.bulk_create(
+        [
+            JobTrigramFrequency(field=row["field"], trigram=row["trigram"], job_count=row["total"])
+            for row in rows.iterator(chunk_size=5000)
+        ],
+        batch_size=2000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0019_job_search_generation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobTrigramFrequency",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "field",
+                    models.CharField(
+                        choices=[("title", "Title"), ("location", "Location")],
+                        max_length=10,
+                    ),
+                ),
+                ("trigram", models.CharField(max_length=3)),
+                ("job_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "job_trigram_frequencies",
+                "unique_together": {("field", "trigram")},
+            },
+        ),
+        migrations.RunPython(count_trigrams, migrations.RunPython.noop),
+    ]
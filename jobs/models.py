@@ -22,9 +22,116 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # The posting's id in the partner feed it was imported from (see the import_jobs command)
+    external_id = models.CharField(max_length=100, null=True, blank=True, editable=False)
+    
+    # Geocoded from location against the bundled gazetteer (see jobs/geo.py)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geo_cell = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    
+    # Application counters, changed only by F() updates in jobs/counters.py
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    reviewed_count = models.PositiveIntegerField(default=0, editable=False)
+    interview_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+    accepted_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    COUNTER_FIELDS = (
+        'application_count', 'pending_count', 'reviewed_count',
+        'interview_count', 'rejected_count', 'accepted_count',
+    )
+    
     class Meta:
         db_table = 'jobs'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        unique_together = ['employer', 'external_id']  # Re-imports update instead of duplicating
+        indexes = [
+            # An employer's most recent postings (dashboard, my jobs)
+            models.Index(fields=['employer', '-created_at'], name='jobs_employer_recent_idx'),
+            # Active jobs newest first (admin list, index rebuilds)
+            models.Index(fields=['is_active', '-created_at', '-id'], name='jobs_active_recent_idx'),
+            # Active jobs by type and location
+            models.Index(fields=['is_active', 'job_type', 'location'], name='jobs_facet_idx'),
+            # Active jobs by grid bucket
+            models.Index(fields=['is_active', 'geo_cell'], name='jobs_geo_cell_idx'),
+            # Active jobs by salary (salary histogram rebuilds)
+            models.Index(fields=['is_active', 'salary_min', '-created_at', '-id'], name='jobs_salary_min_idx'),
+            models.Index(fields=['is_active', 'salary_max', '-created_at', '-id'], name='jobs_salary_max_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so signal handlers can tell what a save changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def remember_saved_values(self):
+        """
+        Make later saves of this instance compare against what was just stored.
+        """
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+    
+    def save(self, *args, **kwargs):
+        # Never write back counters loaded before a concurrent application changed them
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+class JobSearchDocument(models.Model):
+    """
+    Narrow, denormalized copy of an active job holding only what the public
+    listing and its filters read. Maintained from Job and EmployerProfile
+    signals by jobs/documents.py; inactive jobs have no document.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    title = models.CharField(max_length=200)
+    company_name = models.CharField(max_length=200, blank=True)
+    location = models.CharField(max_length=200)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES)
+    salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    summary = models.CharField(max_length=300, blank=True)
+    created_at = models.DateTimeField()
+    # Last change to what the document shows (the job or its company name); versions cached cards
+    updated_at = models.DateTimeField()
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geo_cell = models.PositiveIntegerField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'job_search_documents'
+        ordering = ['-created_at', '-job']
+        indexes = [
+            # Serves the public listing's keyset pagination
+            models.Index(fields=['-created_at', '-job'], name='job_documents_recent_idx'),
+            # Covers the grouped facet count query
+            models.Index(fields=['job_type', 'location'], name='job_documents_facet_idx'),
+            # Grid buckets for radius search
+            models.Index(fields=['geo_cell'], name='job_documents_geo_cell_idx'),
+            # Salary range filters, newest first within a salary range
+            models.Index(fields=['salary_min', '-created_at', '-job'], name='job_documents_salary_min_idx'),
+            models.Index(fields=['salary_max', '-created_at', '-job'], name='job_documents_salary_max_idx'),
+        ]
+
+class JobSearchGeneration(models.Model):
+    """
+    Single row numbering the versions of the search documents, bumped in
+    every transaction that changes them (see jobs/documents.py).
+    """
+    number = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'job_search_generation'
 
 class Application(models.Model):
     STATUS_CHOICES = (
@@ -44,3 +151,221 @@ class Application(models.Model):
     class Meta:
         db_table = 'applications'
         unique_together = ['job', 'applicant']  # Prevent duplicate applications
+        indexes = [
+            # Reviewing a job's applicants newest first, optionally by status
+            models.Index(fields=['job', '-applied_at', '-id'], name='applications_job_recent_idx'),
+            models.Index(fields=['job', 'status', '-applied_at', '-id'], name='applications_job_status_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so counters can move on a status change
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+class SearchTerm(models.Model):
+    """
+    A term seen in active job postings, with its document frequency.
+    Used by the BM25 ranking in jobs/ranking.py.
+    """
+    term = models.CharField(max_length=100, unique=True)
+    document_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'search_terms'
+
+class JobTermPosting(models.Model):
+    """
+    A term occurring in one job. weight is the term's BM25F impact in
+    that job (field-weighted, length-normalized, saturated term frequency).
+    """
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, db_index=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    weight = models.FloatField()
+    
+    class Meta:
+        db_table = 'job_term_postings'
+        unique_together = ['term', 'job']
+        indexes = [
+            # Covering index: scoring a query reads only this index
+            models.Index(fields=['term', 'job', 'weight'], name='job_term_postings_score_idx'),
+        ]
+
+class JobTermStats(models.Model):
+    """
+    Per-field token counts of an indexed job (BM25 length normalization).
+    A row exists only while the job is active and indexed.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='term_stats')
+    title_length = models.PositiveIntegerField(default=0)
+    description_length = models.PositiveIntegerField(default=0)
+    requirements_length = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'job_term_stats'
+
+class SearchCorpusStats(models.Model):
+    """
+    Single row of corpus-wide totals (indexed jobs and field lengths).
+    """
+    document_count = models.PositiveIntegerField(default=0)
+    title_length_total = models.PositiveBigIntegerField(default=0)
+    description_length_total = models.PositiveBigIntegerField(default=0)
+    requirements_length_total = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'search_corpus_stats'
+    
+    @classmethod
+    def load(cls):
+        stats, _ = cls.objects.get_or_create(pk=1)
+        return stats
+
+class JobTrigram(models.Model):
+    """
+    One character trigram of an active job's title or location.
+    Used for typo-tolerant matching in jobs/trigrams.py.
+    """
+    FIELDS = (
+        ('title', 'Title'),
+        ('location', 'Location'),
+    )
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    field = models.CharField(max_length=10, choices=FIELDS)
+    trigram = models.CharField(max_length=3)
+    
+    class Meta:
+        db_table = 'job_trigrams'
+        indexes = [
+            # Covering index: candidate generation reads only this index
+            models.Index(fields=['field', 'trigram', 'job'], name='job_trigrams_lookup_idx'),
+        ]
+
+class JobTrigramFrequency(models.Model):
+    """
+    Number of active jobs whose title or location has one trigram, so a
+    fuzzy lookup can start from the query's rarest trigrams.
+    """
+    field = models.CharField(max_length=10, choices=JobTrigram.FIELDS)
+    trigram = models.CharField(max_length=3)
+    job_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'job_trigram_frequencies'
+        unique_together = ['field', 'trigram']
+
+class SalaryHistogramBucket(models.Model):
+    """
+    Number of active jobs of one job type whose salary falls in one
+    bucket of jobs/salaries.py's SALARY_BUCKETS. Kept up to date as jobs
+    are saved, so the listing never aggregates the jobs table.
+    """
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES)
+    bucket = models.PositiveSmallIntegerField()
+    job_count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'salary_histogram'
+        unique_together = ['job_type', 'bucket']
+
+class EmployerStats(models.Model):
+    """
+    Rollup of one employer's jobs and applications for the dashboard,
+    updated incrementally by jobs/employer_stats.py.
+    """
+    employer = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='employer_stats')
+    active_jobs = models.PositiveIntegerField(default=0)
+    inactive_jobs = models.PositiveIntegerField(default=0)
+    applications_received = models.PositiveIntegerField(default=0)
+    pending_applications = models.PositiveIntegerField(default=0)
+    reviewed_applications = models.PositiveIntegerField(default=0)
+    interview_applications = models.PositiveIntegerField(default=0)
+    rejected_applications = models.PositiveIntegerField(default=0)
+    accepted_applications = models.PositiveIntegerField(default=0)
+    last_job_posted_at = models.DateTimeField(null=True, blank=True)
+    last_application_at = models.DateTimeField(null=True, blank=True)
+    last_status_change_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'employer_stats'
+    
+    @property
+    def jobs_posted(self):
+        return self.active_jobs + self.inactive_jobs
+
+class JobRecommendation(models.Model):
+    """
+    One of a job seeker's top recommended jobs, written in bulk by
+    jobs/recommendations.py (rank 1 is the best match).
+    """
+    seeker = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_recommendations')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='recommendations')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    
+    class Meta:
+        db_table = 'job_recommendations'
+        unique_together = ['seeker', 'rank']
+
+class RecommendationStatus(models.Model):
+    """
+    When a job seeker's recommendations were last computed and when their
+    profile or applications last changed; they are recomputed when
+    changed_at is newer.
+    """
+    seeker = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='recommendation_status')
+    changed_at = models.DateTimeField(null=True, blank=True)
+    computed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'recommendation_status'
+
+class RecommendationRun(models.Model):
+    """
+    One run of the recommender. Jobs edited since the last finished run's
+    started_at are merged into existing recommendations by the next one.
+    """
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    full = models.BooleanField(default=False)
+    seekers_recomputed = models.PositiveIntegerField(default=0)
+    seekers_merged = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'recommendation_runs'
+
+class ResumeText(models.Model):
+    """
+    Plain text of a job seeker's uploaded resume, extracted in the
+    background by jobs/resumes.py. The row doubles as the extraction
+    queue entry: it goes back to pending whenever a new file is uploaded.
+    """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (PROCESSING, 'Processing'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+    
+    seeker = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='resume_text')
+    resume = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    text = models.TextField(blank=True)
+    error = models.CharField(max_length=200, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    queued_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'resume_texts'
+        indexes = [
+            # Workers claim the oldest pending resumes first
+            models.Index(fields=['status', 'queued_at'], name='resume_texts_queue_idx'),
+        ]
@@ -0,0 +1,154 @@
+# jobs/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are addressed by the sort key of the last row already shown rather
+than by an OFFSET, so fetching page 500 costs the same index range scan
+as page 1.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """
+    One page of results plus the cursor needed to fetch the next one.
+    """
+    def __init__(self, object_list, next_cursor, is_first):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first = is_first
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(values):
+    raw = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _reject_constant(name):
+    raise ValueError(f'{name} is not a cursor value')
+
+
+def _load(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    # Cursors come from the query string: NaN and Infinity are refused
+    return json.loads(base64.urlsafe_b64decode(padded.encode()), parse_constant=_reject_constant)
+
+
+def decode_cursor(cursor, model, fields):
+    """
+    Turn a cursor string back into typed field values.
+    Returns None for a missing or malformed cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        raw_values = _load(cursor)
+        if not isinstance(raw_values, list) or len(raw_values) != len(fields):
+            return None
+        return [
+            model._meta.get_field(name).to_python(value)
+            for name, value in zip(fields, raw_values)
+        ]
+    except (ValueError, TypeError, OverflowError, ValidationError):
+        return None
+
+
+def decode_position(cursor):
+    """
+    The position a ranked cursor points at; 0 for a missing or malformed one.
+    """
+    if not cursor:
+        return 0
+    try:
+        return max(int(_load(cursor)[0]), 0)
+    except (ValueError, TypeError, OverflowError, IndexError, KeyError):
+        return 0
+
+
+def _after(fields, values):
+    """
+    Build the "comes after this row" condition for a descending
+    ordering on fields, e.g. (created_at < c) OR (created_at = c AND id < i).
+    """
+    condition = Q()
+    for index, name in enumerate(fields):
+        clause = Q(**{f'{name}__lt': values[index]})
+        for previous, value in zip(fields[:index], values[:index]):
+            clause &= Q(**{previous: value})
+        condition |= clause
+    return condition
+
+
+def paginate_keyset(queryset, cursor, per_page, fields=('created_at', 'id')):
+    """
+    Return a KeysetPage of queryset ordered newest first by fields.
+    The last field must be unique (normally the primary key).
+    """
+    fields = list(fields)
+    values = decode_cursor(cursor, queryset.model, fields)
+    if values is not None:
+        queryset = queryset.filter(_after(fields, values))
+
+    queryset = queryset.order_by(*[f'-{name}' for name in fields])
+
+    # Fetch one extra row to learn whether another page exists
+    rows = list(queryset[:per_page + 1])
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, name) for name in fields])
+
+    return KeysetPage(rows, next_cursor, is_first=values is None)
+
+
+def paginate_ranked(queryset, ranked_ids, cursor, per_page, chunk_size=500):
+    """
+    Return a KeysetPage following the order of ranked_ids (e.g. relevance
+    scores), keeping only ids that are also in queryset. The cursor is the
+    position in ranked_ids to continue from.
+    """
+    start = decode_position(cursor)
+    rows = []
+    position = start
+    while position < len(ranked_ids) and len(rows) <= per_page:
+        chunk = ranked_ids[position:position + chunk_size]
+        found = queryset.in_bulk(chunk)
+        for offset, pk in enumerate(chunk):
+            if pk in found:
+                rows.append((position + offset, found[pk]))
+                if len(rows) > per_page:
+                    break
+        position += chunk_size
+
+    next_cursor = None
+    if len(rows) > per_page:
+        next_cursor = encode_cursor([rows[per_page][0]])
+        rows = rows[:per_page]
+
+    return KeysetPage([obj for _, obj in rows], next_cursor, is_first=start == 0)
+
+
+def estimate_count(queryset, cap):
+    """
+    Count rows up to cap without scanning the whole result set.
+    Returns (count, capped) where capped means "at least cap rows".
+    """
+    count = queryset.order_by()[:cap + 1].count()
+    if count > cap:
+        return cap, True
+    return count, False
@@ -0,0 +1,344 @@
+# jobs/ranking.py
+"""
+BM25 relevance ranking for job search.
+
+Term statistics are precomputed and updated incrementally when a job is
+saved (see jobs/signals.py):
+
+- SearchTerm: document frequency per term
+- JobTermPosting: BM25F impact of a term in one job (field-weighted,
+  length-normalized and saturated term frequency)
+- JobTermStats: per-field token count per job
+- SearchCorpusStats: number of indexed jobs and total field lengths
+
+A query only reads the postings of its own terms, so its cost depends on how
+common those terms are, not on the size of the jobs table. Posting weights
+use the average field lengths at the time the job was indexed; averages move
+slowly, and rebuild_index() brings every weight up to date.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Job, JobSearchDocument, SearchTerm, JobTermPosting, JobTermStats, SearchCorpusStats
+
+# BM25F parameters: a title match counts three times a description match
+FIELDS = ('title', 'description', 'requirements')
+FIELD_WEIGHTS = {'title': 3.0, 'description': 1.0, 'requirements': 1.5}
+FIELD_B = {'title': 0.5, 'description': 0.75, 'requirements': 0.75}
+K1 = 1.2
+
+# A brand-new posting scores up to 30% higher; the boost halves every 30 days
+RECENCY_WEIGHT = 0.3
+RECENCY_HALF_LIFE_DAYS = 30
+
+# Relevance ordering covers the best RANK_LIMIT matches
+RANK_LIMIT = 1000
+
+# Candidates whose posting dates are loaded per query when applying the boost
+RECENCY_BATCH = 500
+
+# The last query term also matches up to this many longer terms ("dev" -> "developer")
+PREFIX_EXPANSIONS = 20
+
+MAX_TERM_LENGTH = 100
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that
+the their this to we will with you your
+""".split())
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def analyze(text):
+    """
+    Split text into lowercase index terms, dropping stop words.
+    """
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall((text or '').lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def _field_counts(title, description, requirements):
+    return {
+        'title': Counter(analyze(title)),
+        'description': Counter(analyze(description)),
+        'requirements': Counter(analyze(requirements)),
+    }
+
+
+def _averages(corpus, fallback):
+    """
+    Average token count per field, or the job's own lengths for an empty corpus.
+    """
+    averages = {}
+    for field in FIELDS:
+        if corpus.document_count:
+            average = getattr(corpus, f'{field}_length_total') / corpus.document_count
+        else:
+            average = fallback[field]
+        averages[field] = average or 1
+    return averages
+
+
+def _weights(counts, lengths, averages):
+    """
+    BM25F impact of every term in one job: the pseudo term frequency
+    combined across fields, then saturated with K1. A query's score is
+    the sum of idf * impact over its terms.
+    """
+    frequencies = defaultdict(float)
+    for field in FIELDS:
+        b = FIELD_B[field]
+        norm = FIELD_WEIGHTS[field] / (1 - b + b * lengths[field] / averages[field])
+        for term, tf in counts[field].items():
+            frequencies[term] += tf * norm
+    return {
+        term: tf * (K1 + 1) / (K1 + tf)
+        for term, tf in frequencies.items()
+    }
+
+
+def _term_ids(terms):
+    """
+    Return {term: id}, creating any SearchTerm rows that don't exist yet.
+    """
+    terms = set(terms)
+    if not terms:
+        return {}
+    SearchTerm.objects.bulk_create(
+        [SearchTerm(term=term) for term in terms],
+        ignore_conflicts=True,
+    )
+    return dict(SearchTerm.objects.filter(term__in=terms).values_list('term', 'id'))
+
+
+def _update_corpus(documents=0, **length_deltas):
+    updates = {'document_count': F('document_count') + documents}
+    for field in FIELDS:
+        updates[f'{field}_length_total'] = (
+            F(f'{field}_length_total') + length_deltas.get(field, 0)
+        )
+    SearchCorpusStats.load()
+    SearchCorpusStats.objects.filter(pk=1).update(**updates)
+
+
+@transaction.atomic
+def index_job(job):
+    """
+    Bring one job's postings and the term statistics up to date.
+    Inactive jobs are removed from the index.
+    """
+    if not job.is_active:
+        remove_job(job)
+        return
+
+    counts = _field_counts(job.title, job.description, job.requirements)
+    lengths = {field: sum(counts[field].values()) for field in FIELDS}
+    weights = _weights(counts, lengths, _averages(SearchCorpusStats.load(), lengths))
+
+    existing = {
+        posting.term.term: posting
+        for posting in JobTermPosting.objects.filter(job_id=job.pk).select_related('term')
+    }
+    added = weights.keys() - existing.keys()
+    removed = existing.keys() - weights.keys()
+
+    # Postings
+    term_ids = _term_ids(added)
+    JobTermPosting.objects.bulk_create([
+        JobTermPosting(job_id=job.pk, term_id=term_ids[term], weight=weights[term])
+        for term in added
+    ])
+    JobTermPosting.objects.filter(pk__in=[existing[term].pk for term in removed]).delete()
+
+    changed = []
+    for term, posting in existing.items():
+        if term in weights and posting.weight != weights[term]:
+            posting.weight = weights[term]
+            changed.append(posting)
+    JobTermPosting.objects.bulk_update(changed, ['weight'], batch_size=500)
+
+    # Document frequencies
+    SearchTerm.objects.filter(pk__in=term_ids.values()).update(
+        document_count=F('document_count') + 1
+    )
+    SearchTerm.objects.filter(pk__in=[existing[term].term_id for term in removed]).update(
+        document_count=F('document_count') - 1
+    )
+
+    # Field lengths
+    previous = JobTermStats.objects.filter(job_id=job.pk).first()
+    old_lengths = {
+        field: getattr(previous, f'{field}_length') if previous else 0
+        for field in FIELDS
+    }
+    JobTermStats.objects.update_or_create(
+        job_id=job.pk,
+        defaults={f'{field}_length': lengths[field] for field in FIELDS},
+    )
+    _update_corpus(
+        documents=0 if previous else 1,
+        **{field: lengths[field] - old_lengths[field] for field in FIELDS}
+    )
+
+
+@transaction.atomic
+def remove_job(job):
+    """
+    Drop a job from the index (deactivated or about to be deleted).
+    """
+    stats = JobTermStats.objects.filter(job_id=job.pk).first()
+    if stats is None:
+        return
+
+    term_ids = list(JobTermPosting.objects.filter(job_id=job.pk).values_list('term_id', flat=True))
+    SearchTerm.objects.filter(pk__in=term_ids).update(document_count=F('document_count') - 1)
+    JobTermPosting.objects.filter(job_id=job.pk).delete()
+    stats.delete()
+    _update_corpus(
+        documents=-1,
+        **{field: -getattr(stats, f'{field}_length') for field in FIELDS}
+    )
+
+
+@transaction.atomic
+def rebuild_index(batch_size=2000):
+    """
+    Recompute all term statistics and posting weights from the active
+    jobs in bulk. Returns the number of indexed jobs.
+    """
+    JobTermPosting.objects.all().delete()
+    JobTermStats.objects.all().delete()
+    SearchTerm.objects.all().delete()
+
+    rows = Job.objects.filter(is_active=True).values_list(
+        'id', 'title', 'description', 'requirements'
+    ).order_by('id')
+
+    # First pass: field lengths, which every posting weight depends on
+    stats = []
+    for job_id, title, description, requirements in rows.iterator(chunk_size=batch_size):
+        stats.append(JobTermStats(
+            job_id=job_id,
+            title_length=len(analyze(title)),
+            description_length=len(analyze(description)),
+            requirements_length=len(analyze(requirements)),
+        ))
+    JobTermStats.objects.bulk_create(stats, batch_size=batch_size)
+
+    corpus, _ = SearchCorpusStats.objects.update_or_create(pk=1, defaults={
+        'document_count': len(stats),
+        **{
+            f'{field}_length_total': sum(getattr(row, f'{field}_length') for row in stats)
+            for field in FIELDS
+        },
+    })
+    averages = _averages(corpus, {field: 1 for field in FIELDS})
+    del stats
+
+    # Second pass: postings
+    term_ids = {}
+    postings = []
+    for job_id, title, description, requirements in rows.iterator(chunk_size=batch_size):
+        counts = _field_counts(title, description, requirements)
+        lengths = {field: sum(counts[field].values()) for field in FIELDS}
+        weights = _weights(counts, lengths, averages)
+        missing = weights.keys() - term_ids.keys()
+        if missing:
+            term_ids.update(_term_ids(missing))
+        postings.extend(
+            JobTermPosting(job_id=job_id, term_id=term_ids[term], weight=weight)
+            for term, weight in weights.items()
+        )
+        if len(postings) >= batch_size * 10:
+            JobTermPosting.objects.bulk_create(postings, batch_size=batch_size)
+            postings = []
+    JobTermPosting.objects.bulk_create(postings, batch_size=batch_size)
+
+    # Document frequencies in one statement
+    posting_counts = JobTermPosting.objects.filter(term=OuterRef('pk')).values('term').annotate(
+        total=Count('pk')
+    ).values('total')
+    SearchTerm.objects.update(document_count=Coalesce(Subquery(posting_counts), 0))
+
+    return corpus.document_count
+
+
+def _query_terms(query):
+    """
+    Map the query's terms to {term id: idf}. The last term is also
+    expanded to indexed terms it is a prefix of.
+    """
+    terms = analyze(query)
+    if not terms:
+        return {}
+
+    last = terms[-1]
+    rows = list(SearchTerm.objects.filter(
+        term__in=set(terms), document_count__gt=0
+    ).values_list('id', 'document_count'))
+    rows += SearchTerm.objects.filter(
+        term__gt=last, term__lt=last + '\U0010ffff', document_count__gt=0
+    ).order_by('-document_count').values_list('id', 'document_count')[:PREFIX_EXPANSIONS]
+
+    total = SearchCorpusStats.load().document_count
+    return {
+        term_id: math.log(1 + (total - df + 0.5) / (df + 0.5))
+        for term_id, df in rows
+    }
+
+
+def _recency_boost(created_at, now):
+    age_days = max((now - created_at).total_seconds(), 0) / 86400
+    return 1 + RECENCY_WEIGHT * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def rank(query, limit=RANK_LIMIT):
+    """
+    Score indexed jobs containing at least one query term.
+    Returns up to limit [(job_id, score), ...] pairs, best first.
+    """
+    idf = _query_terms(query)
+    if not idf:
+        return []
+
+    # BM25 text score, read from the postings table alone
+    scores = defaultdict(float)
+    postings = JobTermPosting.objects.filter(term_id__in=idf.keys()).values_list(
+        'job_id', 'term_id', 'weight'
+    )
+    for job_id, term_id, weight in postings.iterator(chunk_size=5000):
+        scores[job_id] += idf[term_id] * weight
+
+    # Recency boost. The boost is at most 1 + RECENCY_WEIGHT, so once a
+    # candidate's best possible score can't reach the current top `limit`
+    # neither can anything after it, and we stop loading posting dates.
+    candidates = sorted(scores.items(), key=lambda item: -item[1])
+    max_boost = 1 + RECENCY_WEIGHT
+    now = timezone.now()
+    boosted = []
+    for start in range(0, len(candidates), RECENCY_BATCH):
+        chunk = candidates[start:start + RECENCY_BATCH]
+        if len(boosted) >= limit:
+            cutoff = heapq.nlargest(limit, (score for _, score in boosted))[-1]
+            if chunk[0][1] * max_boost < cutoff:
+                break
+        created = dict(JobSearchDocument.objects.filter(
+            pk__in=[job_id for job_id, _ in chunk]
+        ).values_list('job_id', 'created_at'))
+        for job_id, score in chunk:
+            if job_id in created:
+                boosted.append((job_id, score * _recency_boost(created[job_id], now)))
+
+    boosted.sort(key=lambda item: (-item[1], -item[0]))
+    return boosted[:limit]
@@ -0,0 +1,324 @@
+# jobs/recommendations.py
+"""
+Precomputed top-K job recommendations for job seekers.
+
+Every active job becomes a unit TF-IDF vector of its title and
+requirements (idf over the active jobs), and every job seeker a unit
+vector of their profile skills blended with the jobs they applied to.
+A seeker's recommendations are the K jobs with the highest cosine
+similarity, scaled by how well the job's seniority (read from its title
+and type) suits the seeker's years of experience. Jobs the seeker
+already applied to are left out.
+
+refresh() runs in batches (see the refresh_recommendations command):
+seekers are scored in chunks by a process pool, each worker holding the
+job matrix as an inverted index (jobs/sparse.py), and the results are
+written to the JobRecommendation table, K narrow rows per seeker.
+
+An incremental run only does the work that changed since the previous
+run:
+
+- seekers whose profile or applications changed (RecommendationStatus),
+  who are new, or whose list contains a job edited since then are
+  recomputed against every active job;
+- everyone else keeps their list, merged with the scores of the jobs
+  posted or edited since then.
+
+Idf weights drift slowly as jobs come and go; a periodic --full run
+brings every score up to date.
+"""
+import heapq
+import math
+import multiprocessing
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from users.models import JobSeekerProfile
+from . import sparse
+from .matching import term_frequencies
+from .models import Job, Application, JobRecommendation, RecommendationStatus, RecommendationRun
+
+# Recommendations kept per job seeker
+TOP_K = 20
+
+# Seekers scored per task handed to a worker
+CHUNK_SIZE = 500
+
+# Weight of the application history next to the profile skills
+HISTORY_WEIGHT = 0.5
+
+# Weaker matches (e.g. sharing only a generic word like "developer") aren't recommended
+MIN_SCORE = 0.05
+
+SENIOR_TERMS = frozenset('senior sr lead principal staff head director architect'.split())
+JUNIOR_TERMS = frozenset('junior jr intern internship graduate entry trainee apprentice'.split())
+
+# (seeker level, job level) -> score multiplier
+LEVEL_FIT = {
+    ('junior', 'junior'): 1.0, ('junior', 'mid'): 0.9, ('junior', 'senior'): 0.6,
+    ('mid', 'junior'): 0.85, ('mid', 'mid'): 1.0, ('mid', 'senior'): 0.85,
+    ('senior', 'junior'): 0.6, ('senior', 'mid'): 0.9, ('senior', 'senior'): 1.0,
+}
+
+
+def job_level(title, job_type):
+    terms = set(term_frequencies(title))
+    if job_type == 'internship' or terms & JUNIOR_TERMS:
+        return 'junior'
+    if terms & SENIOR_TERMS:
+        return 'senior'
+    return 'mid'
+
+
+def experience_level(years):
+    if years < 2:
+        return 'junior'
+    if years < 5:
+        return 'mid'
+    return 'senior'
+
+
+class JobMatrix:
+    """
+    Unit TF-IDF vectors of a set of jobs, one column per job.
+    """
+    def __init__(self, rows, idf):
+        self.job_ids = []
+        self.vectors = []
+        self.levels = []
+        for job_id, title, requirements, job_type in rows:
+            self.job_ids.append(job_id)
+            self.vectors.append(weigh(term_frequencies(f'{title} {requirements}'), idf))
+            self.levels.append(job_level(title, job_type))
+        self.columns = {job_id: column for column, job_id in enumerate(self.job_ids)}
+        self.index = sparse.inverted_index(self.vectors)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+
+def weigh(frequencies, idf):
+    """
+    Unit TF-IDF vector; terms no active job uses are dropped.
+    """
+    return sparse.normalize({
+        term: tf * idf[term] for term, tf in frequencies.items() if term in idf
+    })
+
+
+def load_jobs():
+    """
+    (JobMatrix of every active job, idf over the active jobs).
+    """
+    rows = list(Job.objects.filter(is_active=True).values_list(
+        'id', 'title', 'requirements', 'job_type'
+    ).order_by('id'))
+    document_frequencies = Counter()
+    for _, title, requirements, _ in rows:
+        document_frequencies.update(term_frequencies(f'{title} {requirements}').keys())
+    total = len(rows)
+    idf = {
+        term: math.log((1 + total) / (1 + df)) + 1
+        for term, df in document_frequencies.items()
+    }
+    return JobMatrix(rows, idf), idf
+
+
+def _seeker_queries(seeker_ids, jobs, idf, history_jobs):
+    """
+    One (seeker id, vector, excluded columns, level factors) query per
+    seeker for sparse.score_chunk(); columns refer to jobs. The vectors of
+    applied-to jobs are taken from history_jobs.
+    """
+    profiles = {
+        user_id: (skills, years)
+        for user_id, skills, years in JobSeekerProfile.objects.filter(
+            user_id__in=seeker_ids
+        ).values_list('user_id', 'skills', 'experience_years')
+    }
+    applied = defaultdict(list)
+    for applicant_id, job_id in Application.objects.filter(
+        applicant_id__in=seeker_ids
+    ).values_list('applicant_id', 'job_id'):
+        applied[applicant_id].append(job_id)
+
+    queries = []
+    for seeker_id in seeker_ids:
+        skills, years = profiles.get(seeker_id, ('', 0))
+        columns = [jobs.columns[job_id] for job_id in applied[seeker_id] if job_id in jobs.columns]
+        vector = weigh(term_frequencies(skills), idf)
+        history = {}
+        for job_id in applied[seeker_id]:
+            if job_id in history_jobs.columns:
+                history = sparse.add(history, history_jobs.vectors[history_jobs.columns[job_id]])
+        vector = sparse.normalize(sparse.add(vector, sparse.normalize(history), HISTORY_WEIGHT))
+        level = experience_level(years or 0)
+        factors = {job_level: LEVEL_FIT[level, job_level] for job_level in ('junior', 'mid', 'senior')}
+        queries.append((seeker_id, vector, frozenset(columns), factors))
+    return queries
+
+
+def _chunks(seeker_ids, size):
+    for start in range(0, len(seeker_ids), size):
+        yield seeker_ids[start:start + size]
+
+
+def _score(seeker_ids, jobs, idf, top_k, workers, chunk_size, history_jobs=None):
+    """
+    Yield (seeker ids, [(seeker id, [(job id, score), ...]), ...]) per
+    chunk of seekers, scored against jobs by a pool of workers.
+    """
+    if history_jobs is None:
+        history_jobs = jobs
+    if not seeker_ids or not jobs:
+        for chunk in _chunks(seeker_ids, chunk_size):
+            yield chunk, [(seeker_id, []) for seeker_id in chunk]
+        return
+
+    def results(pairs):
+        return [
+            (seeker_id, [(jobs.job_ids[column], score) for column, score in best if score >= MIN_SCORE])
+            for seeker_id, best in pairs
+        ]
+
+    if workers <= 1:
+        sparse.init_worker(jobs.index, jobs.levels)
+        for chunk in _chunks(seeker_ids, chunk_size):
+            yield chunk, results(sparse.score_chunk(_seeker_queries(chunk, jobs, idf, history_jobs), top_k))
+        return
+
+    # Workers are started as they are needed, between the queries below, so
+    # they are spawned rather than forked: a forked worker would inherit
+    # whichever database connection was open at that moment
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=sparse.init_worker, initargs=(jobs.index, jobs.levels),
+    ) as pool:
+        # Keep a few chunks in flight so seekers aren't all loaded up front
+        pending = []
+        for chunk in _chunks(seeker_ids, chunk_size):
+            queries = _seeker_queries(chunk, jobs, idf, history_jobs)
+            pending.append((chunk, pool.submit(sparse.score_chunk, queries, top_k)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.pop(0)
+                yield chunk, results(future.result())
+        for chunk, future in pending:
+            yield chunk, results(future.result())
+
+
+@transaction.atomic
+def _write(seeker_ids, results, computed_at):
+    JobRecommendation.objects.filter(seeker_id__in=seeker_ids).delete()
+    JobRecommendation.objects.bulk_create([
+        JobRecommendation(seeker_id=seeker_id, job_id=job_id, rank=rank, score=score)
+        for seeker_id, best in results
+        for rank, (job_id, score) in enumerate(best, start=1)
+    ])
+    RecommendationStatus.objects.bulk_create(
+        [RecommendationStatus(seeker_id=seeker_id, computed_at=computed_at) for seeker_id in seeker_ids],
+        update_conflicts=True,
+        unique_fields=['seeker'],
+        update_fields=['computed_at'],
+    )
+
+
+def _merge(chunk, scored, top_k):
+    """
+    Merge new scores for changed jobs into the stored lists of a chunk of
+    seekers. Returns the (seeker id, best) pairs whose list changed.
+    """
+    stored = defaultdict(list)
+    for seeker_id, job_id, score in JobRecommendation.objects.filter(
+        seeker_id__in=chunk
+    ).order_by('seeker_id', 'rank').values_list('seeker_id', 'job_id', 'score'):
+        stored[seeker_id].append((job_id, score))
+
+    changed = []
+    for seeker_id, candidates in scored:
+        if not candidates:
+            continue
+        current = stored[seeker_id]
+        best = heapq.nlargest(top_k, current + candidates, key=lambda item: item[1])
+        if best != current:
+            changed.append((seeker_id, best))
+    return changed
+
+
+def refresh(full=False, top_k=TOP_K, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    Bring recommendations up to date, incrementally unless full is set or
+    there is no earlier finished run. Returns the RecommendationRun.
+    """
+    previous = RecommendationRun.objects.filter(finished_at__isnull=False).order_by('-started_at').first()
+    run = RecommendationRun.objects.create(started_at=timezone.now(), full=full or previous is None)
+    jobs, idf = load_jobs()
+
+    seekers = JobSeekerProfile.objects.order_by('user_id').values_list('user_id', flat=True)
+    if run.full:
+        recompute = list(seekers)
+        merge = []
+        changed_jobs = None
+    else:
+        edited = Job.objects.filter(updated_at__gte=previous.started_at).values('id')
+        stale = set(RecommendationStatus.objects.filter(
+            Q(computed_at__isnull=True) | Q(changed_at__gt=F('computed_at'))
+        ).values_list('seeker_id', flat=True))
+        stale.update(seekers.filter(user__recommendation_status__isnull=True))
+        stale.update(JobRecommendation.objects.filter(job__in=edited).values_list('seeker_id', flat=True))
+        recompute = sorted(stale)
+        changed_jobs = list(Job.objects.filter(is_active=True, updated_at__gte=previous.started_at).values_list(
+            'id', 'title', 'requirements', 'job_type'
+        ))
+        merge = [seeker_id for seeker_id in seekers if seeker_id not in stale] if changed_jobs else []
+
+    for chunk, results in _score(recompute, jobs, idf, top_k, workers, chunk_size):
+        _write(chunk, results, run.started_at)
+        run.seekers_recomputed += len(chunk)
+
+    if merge:
+        # Score only the new and edited jobs, then fold them into the stored lists
+        changed_matrix = JobMatrix(changed_jobs, idf)
+        for chunk, scored in _score(merge, changed_matrix, idf, top_k, workers, chunk_size, jobs):
+            changed = _merge(chunk, scored, top_k)
+            if changed:
+                _write([seeker_id for seeker_id, _ in changed], changed, run.started_at)
+            run.seekers_merged += len(chunk)
+
+    run.finished_at = timezone.now()
+    run.save()
+    return run
+
+
+def seeker_changed(seeker_id):
+    """
+    Flag a seeker for recomputation (profile edited or new application).
+    """
+    now = timezone.now()
+    if not RecommendationStatus.objects.filter(seeker_id=seeker_id).update(changed_at=now):
+        RecommendationStatus.objects.bulk_create(
+            [RecommendationStatus(seeker_id=seeker_id, changed_at=now)], ignore_conflicts=True
+        )
+
+
+def job_removed(job):
+    """
+    Flag the seekers a job is recommended to before it is deleted, so
+    their lists are refilled on the next run.
+    """
+    RecommendationStatus.objects.filter(
+        seeker__job_recommendations__job=job
+    ).update(changed_at=timezone.now())
+
+
+def for_seeker(seeker, limit=5):
+    """
+    A seeker's best recommendations still open, with their search
+    documents for display.
+    """
+    return list(JobRecommendation.objects.filter(
+        seeker=seeker, job__is_active=True
+    ).select_related('job__search_document').order_by('rank')[:limit])
@@ -0,0 +1,203 @@
+# jobs/results.py
+"""
+Cached results of public job list searches.
+
+Most listing traffic repeats a few dozen searches ("python", "remote",
+no keywords plus a job type). For each normalized search (see
+facets.normalize_search) the ordered ids of its first RESULT_DEPTH
+matches are cached, with its capped count and how it was ordered. A page
+within that depth then reads only its own documents, by primary key;
+deeper pages are paginated from the database as before. Cursors are the
+same either way.
+
+Entries are keyed by the search documents' generation number, which
+every change to a document bumps in the same transaction (see
+jobs/documents.py), so a result is never served once a job it could list
+changed. The number is read from the database, so this holds in every
+worker process, whether or not they share a cache.
+"""
+from bisect import bisect_left
+
+from django.core.cache import cache
+
+from . import ranking, trigrams
+from .facets import FACET_PARAMETERS, cache_key, normalize_search
+from .models import JobSearchDocument
+from .pagination import (
+    KeysetPage, decode_cursor, decode_position, encode_cursor, estimate_count,
+    paginate_keyset, paginate_ranked,
+)
+
+# Matches cached per search; the pages beyond them come from the database
+RESULT_DEPTH = 500
+
+# Unused results are dropped after this long
+RESULT_CACHE_TIMEOUT = 60 * 10
+
+# How the matches are ordered
+RECENT = 'recent'
+RELEVANCE = 'relevance'
+FUZZY = 'fuzzy'
+
+# Sort key of the most recent first order, as used by its cursors
+RECENT_FIELDS = ('created_at', 'job_id')
+
+
+def search(form, queryset, count_cap, generation):
+    """
+    Result of a JobSearchForm over queryset (the active jobs), from the
+    cache when possible: a dict with the ordered ids of the first matches,
+    their positions in the ranking (relevance and fuzzy orders), whether
+    the ids are all the matches, the count (capped at count_cap) and the
+    order used. generation is documents.generation(), read before the
+    search.
+    """
+    form = form if form.is_bound and form.is_valid() else None
+    normalized = normalize_search(form.cleaned_data if form else {}, FACET_PARAMETERS)
+    if form and form.sorts_by_relevance():
+        normalized['sort'] = RELEVANCE
+    key = cache_key(f'jobs:results:{generation}:{count_cap}', normalized)
+
+    result = cache.get(key)
+    if result is None:
+        result = compute(form, queryset, count_cap)
+        cache.set(key, result, RESULT_CACHE_TIMEOUT)
+    return result
+
+
+def compute(form, queryset, count_cap):
+    jobs = form.filter_queryset(queryset) if form else queryset
+    total, capped = estimate_count(jobs, count_cap)
+
+    if form and not total and form.has_text_filters():
+        # No exact matches: fall back to typo-tolerant trigram matching
+        order = FUZZY
+    elif form and form.sorts_by_relevance():
+        order = RELEVANCE
+    else:
+        order = RECENT
+
+    positions = []
+    ranked_ids = []
+    if order == RECENT:
+        ids = list(jobs.order_by(*[f'-{name}' for name in RECENT_FIELDS]).values_list(
+            'job_id', flat=True
+        )[:RESULT_DEPTH + 1])
+    else:
+        ranked_ids, candidates = _ranking(form, queryset, order)
+        positions, ids, found = _ranked_matches(candidates, ranked_ids, RESULT_DEPTH + 1)
+        if order == RELEVANCE and found < total:
+            # The ranking stops at RANK_LIMIT jobs and PREFIX_EXPANSIONS terms,
+            # so it can hold fewer jobs than the filters match; only ranked
+            # jobs can be paged to, so those are the ones counted
+            total, capped = found, False
+
+    return {
+        'order': order,
+        'ids': ids[:RESULT_DEPTH],
+        'positions': positions[:RESULT_DEPTH],
+        'complete': len(ids) <= RESULT_DEPTH,
+        'total': total,
+        'capped': capped,
+        'fuzzy': order == FUZZY and bool(ranked_ids),
+    }
+
+
+def paginate(result, form, queryset, cursor, per_page):
+    """
+    KeysetPage of a search result, read from the cached ids while they
+    reach far enough and from the database past them.
+    """
+    if result['order'] == RECENT:
+        page = _recent_page(result, queryset, cursor, per_page)
+    else:
+        page = _ranked_page(result, queryset, cursor, per_page)
+    if page is not None:
+        return page
+
+    form = form if form.is_bound and form.is_valid() else None
+    if result['order'] == RECENT:
+        jobs = form.filter_queryset(queryset) if form else queryset
+        return paginate_keyset(jobs, cursor, per_page, fields=RECENT_FIELDS)
+    ranked_ids, candidates = _ranking(form, queryset, result['order'])
+    return paginate_ranked(candidates, ranked_ids, cursor, per_page)
+
+
+def _ranking(form, queryset, order):
+    """
+    (ranked job ids, queryset they must also be in) of a relevance or
+    fuzzy search.
+    """
+    if order == FUZZY:
+        ranked_ids = trigrams.fuzzy_rank(
+            search=form.cleaned_data.get('search'),
+            location=form.cleaned_data.get('location'),
+        )
+        return ranked_ids, form.filter_queryset(queryset, skip=('search', 'location'))
+    ranked_ids = [job_id for job_id, score in ranking.rank(form.cleaned_data['search'])]
+    return ranked_ids, form.filter_queryset(queryset)
+
+
+def _ranked_matches(queryset, ranked_ids, limit, chunk_size=500):
+    """
+    (positions, ids, count) of the ranked ids that are in queryset: the
+    positions and ids of the first limit, and how many there are in all.
+    """
+    positions = []
+    ids = []
+    count = 0
+    for start in range(0, len(ranked_ids), chunk_size):
+        chunk = ranked_ids[start:start + chunk_size]
+        found = set(queryset.filter(pk__in=chunk).values_list('pk', flat=True))
+        count += len(found)
+        for offset, pk in enumerate(chunk):
+            if pk in found and len(ids) < limit:
+                positions.append(start + offset)
+                ids.append(pk)
+    return positions, ids, count
+
+
+def _page(result, queryset, start, per_page):
+    """
+    (documents, has next) of the cached ids from start on, or None if the
+    page goes past them.
+    """
+    ids = result['ids'][start:start + per_page + 1]
+    if len(ids) <= per_page and not result['complete']:
+        return None
+    found = queryset.in_bulk(ids[:per_page])
+    return [found[pk] for pk in ids[:per_page] if pk in found], len(ids) > per_page
+
+
+def _recent_page(result, queryset, cursor, per_page):
+    values = decode_cursor(cursor, JobSearchDocument, RECENT_FIELDS)
+    start = 0
+    if values is not None:
+        try:
+            start = result['ids'].index(values[-1]) + 1
+        except ValueError:
+            # Not among the cached ids (deeper, or no longer listed)
+            return None
+
+    page = _page(result, queryset, start, per_page)
+    if page is None:
+        return None
+    rows, has_next = page
+    next_cursor = None
+    if has_next and rows:
+        next_cursor = encode_cursor([getattr(rows[-1], name) for name in RECENT_FIELDS])
+    return KeysetPage(rows, next_cursor, is_first=values is None)
+
+
+def _ranked_page(result, queryset, cursor, per_page):
+    position = decode_position(cursor)
+    start = bisect_left(result['positions'], position)
+
+    page = _page(result, queryset, start, per_page)
+    if page is None:
+        return None
+    rows, has_next = page
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor([result['positions'][start + per_page]])
+    return KeysetPage(rows, next_cursor, is_first=position == 0)
@@ -0,0 +1,282 @@
+# jobs/resume_text.py
+"""
+Plain text extraction from uploaded resumes (PDF, DOCX and TXT).
+
+extract() takes the file's name and bytes and returns its text with the
+whitespace collapsed, or raises ExtractionError when the file can't be
+read. PDFs are read with pypdf when it is installed; otherwise a small
+built-in reader collects the text drawn by the page content streams,
+which covers PDFs with simple (single-byte) fonts.
+
+This module imports nothing from Django, so the process pool workers of
+jobs/resumes.py can load it without setting Django up.
+"""
+import io
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+# Extracted text is cut to this many characters
+MAX_TEXT_LENGTH = 100_000
+
+# DOCX parts larger than this once uncompressed are refused
+MAX_DOCX_XML_SIZE = 20 * 1024 * 1024
+
+# PDF content streams larger than this once uncompressed are refused
+MAX_PDF_STREAM_SIZE = 20 * 1024 * 1024
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def extract(name, data):
+    """
+    Text of a resume file; the type is taken from the file extension.
+    """
+    extension = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    if extension == 'pdf':
+        text = pdf_text(data)
+    elif extension == 'docx':
+        text = docx_text(data)
+    elif extension == 'txt':
+        text = plain_text(data)
+    else:
+        raise ExtractionError(f'Unsupported file type ".{extension}".')
+    return clean(text)[:MAX_TEXT_LENGTH]
+
+
+def extract_or_error(name, data):
+    """
+    (text, '') for a readable resume and ('', reason) otherwise; what the
+    worker processes run.
+    """
+    try:
+        return extract(name, data), ''
+    except ExtractionError as exc:
+        return '', str(exc)
+
+
+def clean(text):
+    lines = (WHITESPACE_RE.sub(' ', line).strip() for line in text.replace('\x00', '').split('\n'))
+    return BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def plain_text(data):
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1252', errors='replace')
+
+
+def docx_text(data):
+    """
+    Paragraph text of word/document.xml, one paragraph per line.
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            info = archive.getinfo('word/document.xml')
+            if info.file_size > MAX_DOCX_XML_SIZE:
+                raise ExtractionError('Document is too large.')
+            with archive.open(info) as document:
+                parts = []
+                for _, element in ElementTree.iterparse(document):
+                    tag = element.tag
+                    if tag == f'{WORD_NAMESPACE}t':
+                        parts.append(element.text or '')
+                    elif tag == f'{WORD_NAMESPACE}tab':
+                        parts.append('\t')
+                    elif tag in (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr', f'{WORD_NAMESPACE}p'):
+                        parts.append('\n')
+                    if tag == f'{WORD_NAMESPACE}p':
+                        # Paragraphs are done with once read; keep memory flat
+                        element.clear()
+                return ''.join(parts)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ExtractionError(f'Not a readable DOCX file ({exc}).')
+
+
+def pdf_text(data):
+    if not data.startswith(b'%PDF'):
+        raise ExtractionError('Not a PDF file.')
+    if pypdf is not None:
+        try:
+            reader = pypdf.PdfReader(io.BytesIO(data))
+            return '\n'.join(page.extract_text() or '' for page in reader.pages)
+        except Exception as exc:
+            # pypdf raises assorted exception types on damaged files
+            raise ExtractionError(f'Not a readable PDF file ({exc}).')
+    return builtin_pdf_text(data)
+
+
+# Built-in PDF reader
+
+STREAM_RE = re.compile(rb'<<(.*?)>>\s*stream\r?\n', re.S)
+PDF_TOKEN_RE = re.compile(
+    rb'\((?:\\.|[^\\()])*\)'      # literal string (nested parens handled below)
+    rb'|<[0-9A-Fa-f\s]*>'         # hex string
+    rb'|\[|\]'                    # array delimiters
+    rb'|-?\d*\.?\d+'              # number
+    rb'|[A-Za-z\'"*]+'            # operator
+    rb'|/[^\s/<>\[\]()]*',        # name
+    re.S,
+)
+LITERAL_ESCAPES = {
+    ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f',
+    ord('('): b'(', ord(')'): b')', ord('\\'): b'\\',
+}
+
+# Streams with these dictionary entries hold fonts, images or metadata, not page text
+NON_TEXT_STREAM_KEYS = (
+    b'/Length1', b'/Length2', b'/Length3', b'/Type1C', b'/CIDFontType0C', b'/OpenType',
+    b'/Image', b'/XRef', b'/ObjStm', b'/Metadata',
+)
+
+# A TJ adjustment beyond this (thousandths of an em) reads as a word gap
+TJ_SPACE_THRESHOLD = 200
+
+
+def builtin_pdf_text(data):
+    """
+    Text shown by the Tj, TJ, ' and " operators of every content stream.
+    """
+    parts = []
+    for match in STREAM_RE.finditer(data):
+        dictionary = match.group(1)
+        if any(key in dictionary for key in NON_TEXT_STREAM_KEYS):
+            continue
+        end = data.find(b'endstream', match.end())
+        if end < 0:
+            break
+        stream = data[match.end():end]
+        if b'/FlateDecode' in dictionary:
+            decompressor = zlib.decompressobj()
+            try:
+                stream = decompressor.decompress(stream, MAX_PDF_STREAM_SIZE)
+            except zlib.error:
+                continue
+            if decompressor.unconsumed_tail:
+                raise ExtractionError('Document is too large.')
+        elif b'/Filter' in dictionary:
+            # Other filters are used for images and fonts, not page text
+            continue
+        if b'BT' in stream:
+            parts.append(_content_text(stream))
+    text = ''.join(parts)
+    if not text.strip():
+        raise ExtractionError('No text found in PDF (install pypdf to read more PDFs).')
+    return text
+
+
+def _content_text(stream):
+    parts = []
+    operands = []
+    for token in _pdf_tokens(stream):
+        if isinstance(token, tuple):
+            operands.append(token)
+            continue
+        if token in (b'Tj', b"'", b'"'):
+            if token != b'Tj':
+                parts.append('\n')
+            parts.extend(_decode(value) for kind, value in operands[-1:] if kind == 'string')
+        elif token == b'TJ':
+            for kind, value in operands:
+                if kind == 'string':
+                    parts.append(_decode(value))
+                elif kind == 'number' and value < -TJ_SPACE_THRESHOLD:
+                    parts.append(' ')
+        elif token in (b'T*', b'Td', b'TD', b'ET'):
+            parts.append('\n')
+        elif token == b'Tm':
+            parts.append(' ')
+        operands = []
+    return ''.join(parts)
+
+
+def _pdf_tokens(stream):
+    """
+    Operands as (kind, value) tuples and operators as bytes. Array
+    brackets are dropped so a TJ array's items become its operands.
+    """
+    position = 0
+    length = len(stream)
+    while position < length:
+        if stream[position:position + 1] == b'(':
+            value, position = _literal_string(stream, position)
+            yield ('string', value)
+            continue
+        match = PDF_TOKEN_RE.search(stream, position)
+        if match is None:
+            return
+        if match.start() > position and stream[match.start():match.start() + 1] == b'(':
+            position = match.start()
+            continue
+        token = match.group()
+        position = match.end()
+        if token.startswith(b'<'):
+            hex_digits = re.sub(rb'\s', b'', token[1:-1])
+            yield ('string', bytes.fromhex((hex_digits + b'0' * (len(hex_digits) % 2)).decode()))
+        elif token[:1] in b'-.0123456789':
+            yield ('number', float(token))
+        elif token.startswith(b'/'):
+            yield ('name', token)
+        elif token not in (b'[', b']'):
+            yield token
+
+
+def _literal_string(stream, position):
+    """
+    (bytes, position after the string) of the literal string at position.
+    """
+    value = bytearray()
+    depth = 0
+    index = position
+    length = len(stream)
+    while index < length:
+        byte = stream[index]
+        if byte == 0x5C:  # backslash
+            index += 1
+            if index >= length:
+                break
+            escaped = stream[index]
+            if escaped in LITERAL_ESCAPES:
+                value += LITERAL_ESCAPES[escaped]
+            elif 0x30 <= escaped <= 0x37:
+                digits = stream[index:index + 3]
+                octal = re.match(rb'[0-7]{1,3}', digits).group()
+                value.append(int(octal, 8) & 0xFF)
+                index += len(octal) - 1
+            elif escaped in (0x0A, 0x0D):
+                pass  # line continuation
+            else:
+                value.append(escaped)
+        elif byte == 0x28:  # (
+            if depth:
+                value.append(byte)
+            depth += 1
+        elif byte == 0x29:  # )
+            depth -= 1
+            if not depth:
+                return bytes(value), index + 1
+            value.append(byte)
+        else:
+            value.append(byte)
+        index += 1
+    return bytes(value), length
+
+
+def _decode(value):
+    if value.startswith(b'\xfe\xff'):
+        return value[2:].decode('utf-16-be', errors='replace')
+    return value.decode('latin-1')
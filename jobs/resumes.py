@@ -0,0 +1,227 @@
+# jobs/resumes.py
+"""
+Background extraction of resume text for employer-side candidate search.
+
+Saving a job seeker profile with a new resume file only queues it: its
+ResumeText row goes back to pending (see jobs/signals.py), so the upload
+request never reads the file. The process_resumes command drains the
+queue: it claims pending rows a few at a time, reads the files from
+storage and hands them to a pool of worker processes (jobs/resume_text.py
+does the parsing), then stores and indexes the text (jobs/search.py).
+
+The queue lives in the database, so a worker that stops picks up where it
+left off: rows claimed by a worker that died are claimed again once
+CLAIM_TIMEOUT has passed, and a result is only stored if the profile
+still has the file that was read.
+"""
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from users.storage import resume_storage
+
+from . import resume_text, search
+from .models import ResumeText
+
+# Claimed rows not finished within this time are claimed again
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+# Attempts before a resume that keeps failing to load is given up on
+MAX_ATTEMPTS = 3
+
+# Larger files are not read
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+def enqueue(profile):
+    """
+    Queue a profile's resume for extraction if the file changed, or drop
+    the stored text when the resume was removed.
+    """
+    name = profile.resume.name or ''
+    stored = ResumeText.objects.filter(seeker_id=profile.user_id).values_list('resume', flat=True).first()
+    if stored == name or (stored is None and not name):
+        return
+    if not name:
+        remove(profile.user_id)
+        return
+    ResumeText.objects.update_or_create(seeker_id=profile.user_id, defaults={
+        'resume': name,
+        'status': ResumeText.PENDING,
+        'text': '',
+        'error': '',
+        'attempts': 0,
+        'queued_at': timezone.now(),
+        'claimed_at': None,
+    })
+
+
+def remove(seeker_id):
+    # The search index entry goes with the row (see jobs/signals.py)
+    ResumeText.objects.filter(seeker_id=seeker_id).delete()
+
+
+def requeue_failed():
+    """
+    Queue every resume that failed again, e.g. after installing pypdf.
+    Returns the number queued.
+    """
+    return ResumeText.objects.filter(status=ResumeText.FAILED).update(
+        status=ResumeText.PENDING, error='', attempts=0, queued_at=timezone.now(),
+    )
+
+
+def claim(limit):
+    """
+    Mark up to limit queued resumes as processing, oldest first.
+    Returns [(seeker id, resume name), ...].
+    """
+    now = timezone.now()
+    queued = ResumeText.objects.filter(
+        Q(status=ResumeText.PENDING) |
+        Q(status=ResumeText.PROCESSING, claimed_at__lt=now - CLAIM_TIMEOUT)
+    ).order_by('queued_at')
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            # Several workers can drain the queue side by side
+            queued = queued.select_for_update(skip_locked=True)
+        rows = list(queued.values_list('seeker_id', 'resume')[:limit])
+        ResumeText.objects.filter(seeker_id__in=[seeker_id for seeker_id, _ in rows]).update(
+            status=ResumeText.PROCESSING, claimed_at=now, attempts=F('attempts') + 1,
+        )
+    return rows
+
+
+def read(name):
+    """
+    The bytes of a stored resume, or raise ExtractionError.
+    """
+    try:
+        if resume_storage.size(name) > MAX_FILE_SIZE:
+            raise resume_text.ExtractionError('File is too large.')
+        with resume_storage.open(name, 'rb') as resume:
+            return resume.read()
+    except FileNotFoundError:
+        raise resume_text.ExtractionError('File is missing.')
+
+
+def finish(seeker_id, name, text='', error='', retry=False):
+    """
+    Store the outcome of one claimed resume. Returns the new status, or
+    None if the profile's resume changed in the meantime (the new file is
+    already queued).
+    """
+    row = ResumeText.objects.filter(seeker_id=seeker_id, resume=name, status=ResumeText.PROCESSING)
+    if retry:
+        status = ResumeText.PENDING if row.filter(attempts__lt=MAX_ATTEMPTS).exists() else ResumeText.FAILED
+    else:
+        status = ResumeText.FAILED if error else ResumeText.DONE
+    with transaction.atomic():
+        updated = row.update(
+            status=status, text=text, error=error[:200],
+            claimed_at=None, extracted_at=timezone.now() if status == ResumeText.DONE else None,
+        )
+        if not updated:
+            return None
+        search.index_resume(seeker_id, text)
+    return status
+
+
+def process(workers=1, batch_size=None, poll_interval=None, stdout=None):
+    """
+    Extract queued resumes until the queue is empty, or forever, checking
+    for new uploads every poll_interval seconds, when that is given. At
+    most batch_size resumes (two per worker by default) are claimed at
+    once. Returns {status: number of resumes}.
+    """
+    batch_size = batch_size or max(workers, 1) * 2
+    counts = {status: 0 for status, _ in ResumeText.STATUS_CHOICES}
+    while True:
+        try:
+            if workers <= 1:
+                _process_inline(batch_size, poll_interval, counts, stdout)
+            else:
+                _process_in_pool(workers, batch_size, poll_interval, counts, stdout)
+            return counts
+        except BrokenProcessPool:
+            # A worker died on some file; its claims are retried by the next pool
+            if stdout:
+                stdout.write('A worker process died; restarting the pool.')
+
+
+def _record(counts, stdout, name, status):
+    if status is None:
+        return
+    counts[status] += 1
+    if stdout:
+        stdout.write(f'  {name}: {status}')
+
+
+def _load(seeker_id, name, counts, stdout):
+    """
+    The file's bytes, or None after recording why it couldn't be read.
+    """
+    try:
+        return read(name)
+    except resume_text.ExtractionError as exc:
+        _record(counts, stdout, name, finish(seeker_id, name, error=str(exc)))
+    except OSError as exc:
+        # Storage trouble is usually temporary
+        _record(counts, stdout, name, finish(seeker_id, name, error=str(exc), retry=True))
+    return None
+
+
+def _idle(poll_interval):
+    if poll_interval is None:
+        return False
+    time.sleep(poll_interval)
+    return True
+
+
+def _process_inline(batch_size, poll_interval, counts, stdout):
+    while True:
+        claimed = claim(batch_size)
+        if not claimed:
+            if _idle(poll_interval):
+                continue
+            return
+        for seeker_id, name in claimed:
+            data = _load(seeker_id, name, counts, stdout)
+            if data is not None:
+                text, error = resume_text.extract_or_error(name, data)
+                _record(counts, stdout, name, finish(seeker_id, name, text, error))
+
+
+def _process_in_pool(workers, batch_size, poll_interval, counts, stdout):
+    # Workers are started by submit(), between claims, so they are spawned
+    # rather than forked and don't inherit the open database connection
+    pending = {}
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            while True:
+                # Top up the pool without holding more claims than it can work on
+                if len(pending) < batch_size:
+                    for seeker_id, name in claim(batch_size - len(pending)):
+                        data = _load(seeker_id, name, counts, stdout)
+                        if data is not None:
+                            pending[pool.submit(resume_text.extract_or_error, name, data)] = (seeker_id, name)
+                if not pending:
+                    if _idle(poll_interval):
+                        continue
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    seeker_id, name = pending.pop(future)
+                    text, error = future.result()
+                    _record(counts, stdout, name, finish(seeker_id, name, text, error))
+    except BrokenProcessPool:
+        for seeker_id, name in pending.values():
+            _record(counts, stdout, name, finish(
+                seeker_id, name, error='Extraction crashed.', retry=True
+            ))
+        raise
@@ -0,0 +1,44 @@
+# jobs/review.py
+"""
+Bulk status changes for an employer reviewing a job's applicants.
+
+A selection of applications is moved to a new status with one UPDATE
+instead of a save() per application. Model signals don't fire for that
+UPDATE, so the job's application counters and the employer's
+EmployerStats row are adjusted here, from a per-status count of the
+selection taken just before it.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from . import counters, employer_stats
+from .models import Job, Application
+
+
+@transaction.atomic
+def bulk_update_status(job, status, application_ids=None, current_status=None):
+    """
+    Move applications of job to status: those in application_ids, or all
+    of them (only those currently in current_status, if given).
+    Returns the number of applications changed.
+    """
+    # Serialize bulk changes to the same job so their counts don't interleave
+    list(Job.objects.select_for_update().filter(pk=job.pk).values_list('pk'))
+
+    selection = Application.objects.filter(job_id=job.pk).exclude(status=status)
+    if application_ids is not None:
+        selection = selection.filter(pk__in=application_ids)
+    if current_status:
+        selection = selection.filter(status=current_status)
+
+    moved = dict(selection.order_by().values_list('status').annotate(total=Count('pk')))
+    updated = selection.update(status=status)
+
+    if updated == sum(moved.values()):
+        counters.statuses_changed(job.pk, moved, status)
+        employer_stats.statuses_changed(job.pk, moved, status)
+    else:
+        # Applications were added or changed in between: recount instead
+        counters.recount_job(job.pk)
+        employer_stats.recount(job.employer_id)
+    return updated
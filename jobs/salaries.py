@@ -0,0 +1,179 @@
+# jobs/salaries.py
+"""
+Salary range filtering and the precomputed salary histogram.
+
+Each active job with a salary counts towards one SalaryHistogramBucket row
+for its job type, picked by the midpoint of its salary range. The rows are
+adjusted by +1/-1 when a job is saved or deleted (see jobs/signals.py), so
+drawing the histogram reads a few dozen small rows instead of grouping the
+whole jobs table.
+"""
+from bisect import bisect_right
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import Job, SalaryHistogramBucket
+
+# Lower bound of each histogram bucket; the last bucket is open-ended
+SALARY_BUCKETS = (
+    0, 10_000, 20_000, 30_000, 40_000, 50_000, 60_000, 80_000, 100_000,
+    120_000, 150_000, 200_000, 250_000, 300_000, 400_000, 500_000,
+    750_000, 1_000_000, 1_500_000, 2_000_000, 3_000_000, 5_000_000,
+)
+
+# Job fields that decide which bucket a job is counted in
+KEY_FIELDS = ('is_active', 'job_type', 'salary_min', 'salary_max')
+
+
+def representative_salary(salary_min, salary_max):
+    """
+    The salary a job is plotted at: the midpoint of its range, or
+    whichever end is given.
+    """
+    if salary_min is not None and salary_max is not None:
+        return (salary_min + salary_max) / 2
+    if salary_min is not None:
+        return salary_min
+    return salary_max
+
+
+def bucket_for(salary):
+    return max(bisect_right(SALARY_BUCKETS, salary) - 1, 0)
+
+
+def _key(is_active, job_type, salary_min, salary_max):
+    salary = representative_salary(salary_min, salary_max)
+    if not is_active or salary is None:
+        return None
+    return job_type, bucket_for(salary)
+
+
+def _current_key(job):
+    return _key(*(getattr(job, name) for name in KEY_FIELDS))
+
+
+def _stored_key(job):
+    """
+    Bucket of the job as it was loaded from the database, or None for a
+    job that wasn't (a new job). Fields that weren't loaded are assumed
+    unchanged.
+    """
+    loaded = getattr(job, '_loaded_values', None)
+    if loaded is None:
+        return None
+    return _key(*(loaded.get(name, getattr(job, name)) for name in KEY_FIELDS))
+
+
+def _adjust(key, delta):
+    job_type, bucket = key
+    rows = SalaryHistogramBucket.objects.filter(job_type=job_type, bucket=bucket)
+    if not rows.update(job_count=F('job_count') + delta):
+        SalaryHistogramBucket.objects.bulk_create(
+            [SalaryHistogramBucket(job_type=job_type, bucket=bucket)],
+            ignore_conflicts=True,
+        )
+        rows.update(job_count=F('job_count') + delta)
+
+
+def index_job(job, created=False):
+    """
+    Move a saved job's count to its current bucket.
+    """
+    index_jobs([job], created)
+
+
+@transaction.atomic
+def index_jobs(jobs, created=False):
+    """
+    Move the counts of many saved jobs at once, one UPDATE per bucket
+    that changed (bulk imports).
+    """
+    deltas = Counter()
+    for job in jobs:
+        old = None if created else _stored_key(job)
+        new = _current_key(job)
+        if old != new:
+            if old is not None:
+                deltas[old] -= 1
+            if new is not None:
+                deltas[new] += 1
+    for key, delta in deltas.items():
+        if delta:
+            _adjust(key, delta)
+
+
+def remove_job(job):
+    """
+    Drop a deleted job's count.
+    """
+    key = _stored_key(job) if hasattr(job, '_loaded_values') else _current_key(job)
+    if key is not None:
+        _adjust(key, -1)
+
+
+@transaction.atomic
+def rebuild_index():
+    """
+    Recount the histogram from the jobs table, e.g. after bulk writes
+    that skip model signals.
+    """
+    counts = Counter()
+    rows = Job.objects.filter(is_active=True).filter(
+        Q(salary_min__isnull=False) | Q(salary_max__isnull=False)
+    ).values_list('job_type', 'salary_min', 'salary_max')
+    for job_type, salary_min, salary_max in rows.iterator(chunk_size=5000):
+        counts[_key(True, job_type, salary_min, salary_max)] += 1
+
+    SalaryHistogramBucket.objects.all().delete()
+    SalaryHistogramBucket.objects.bulk_create([
+        SalaryHistogramBucket(job_type=job_type, bucket=bucket, job_count=count)
+        for (job_type, bucket), count in counts.items()
+    ])
+
+
+def histogram(job_type=None):
+    """
+    Salary distribution of active jobs, for one job type or all of them.
+    Returns [{'low', 'high', 'count', 'height'}, ...] from the lowest to
+    the highest non-empty bucket; height is a percentage of the tallest bar.
+    """
+    rows = SalaryHistogramBucket.objects.filter(job_count__gt=0)
+    if job_type:
+        rows = rows.filter(job_type=job_type)
+
+    counts = Counter()
+    for bucket, count in rows.values_list('bucket', 'job_count'):
+        counts[bucket] += count
+    if not counts:
+        return []
+
+    tallest = max(counts.values())
+    bars = []
+    for bucket in range(min(counts), max(counts) + 1):
+        bars.append({
+            'low': SALARY_BUCKETS[bucket],
+            'high': SALARY_BUCKETS[bucket + 1] if bucket + 1 < len(SALARY_BUCKETS) else None,
+            'count': counts[bucket],
+            'height': round(100 * counts[bucket] / tallest),
+        })
+    return bars
+
+
+def filter_salary(queryset, minimum=None, maximum=None):
+    """
+    Filter a Job queryset to jobs whose salary range overlaps
+    [minimum, maximum]. Jobs without a salary are left out.
+    """
+    if minimum is not None:
+        queryset = queryset.filter(
+            Q(salary_max__gte=minimum) |
+            Q(salary_max__isnull=True, salary_min__gte=minimum)
+        )
+    if maximum is not None:
+        queryset = queryset.filter(
+            Q(salary_min__lte=maximum) |
+            Q(salary_min__isnull=True, salary_max__lte=maximum)
+        )
+    return queryset
@@ -0,0 +1,218 @@
+# jobs/search.py
+"""
+Full-text search backend for job listings.
+
+SQLite keeps an FTS5 virtual table (jobs_fts) whose rowid is the job id.
+MySQL uses FULLTEXT indexes on the jobs table itself, so the engine keeps
+them in sync. Any other database falls back to icontains filtering.
+
+Extracted resume text (see jobs/resumes.py) is indexed the same way, in
+resumes_fts keyed by the job seeker's user id.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Job
+
+FTS_TABLE = 'jobs_fts'
+RESUME_FTS_TABLE = 'resumes_fts'
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default)
+MYSQL_MIN_TOKEN_LENGTH = 3
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize_query(text):
+    """
+    Split a search string into lowercase tokens the same way the
+    FTS5 unicode61 tokenizer does (letters and digits only).
+    """
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def _fts5_phrase(tokens):
+    # Phrase query with the last token as a prefix, so "python dev" matches
+    # "Python Developer" just like the old icontains search did.
+    return '"%s"*' % ' '.join(tokens)
+
+
+def _mysql_phrase(tokens):
+    # Boolean mode has no prefix matching inside a phrase: the leading
+    # tokens stay a phrase and the last one is a required prefix term, so
+    # "python dev" matches "Python Developer" here too
+    if len(tokens) == 1:
+        return '+%s*' % tokens[0]
+    return '+"%s" +%s*' % (' '.join(tokens[:-1]), tokens[-1])
+
+
+def _fts5_all_terms(tokens):
+    # Every token anywhere in the text, the last one as a prefix
+    return ' '.join('"%s"' % token for token in tokens[:-1]) + ' "%s"*' % tokens[-1]
+
+
+def _mysql_all_terms(tokens):
+    return ' '.join('+%s' % token for token in tokens[:-1]) + ' +%s*' % tokens[-1]
+
+
+def _use_fallback(tokens):
+    if not tokens:
+        return True
+    if connection.vendor == 'sqlite':
+        return False
+    if connection.vendor == 'mysql':
+        return any(len(token) < MYSQL_MIN_TOKEN_LENGTH for token in tokens)
+    return True
+
+
+def search_jobs(queryset, query):
+    """
+    Filter a Job (or job-keyed) queryset to rows whose title or
+    description matches the query.
+    """
+    tokens = tokenize_query(query)
+    if _use_fallback(tokens):
+        return queryset.filter(pk__in=Job.objects.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query)
+        ).values('pk'))
+
+    if connection.vendor == 'sqlite':
+        match = '{title description} : %s' % _fts5_phrase(tokens)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match],
+        ))
+
+    return queryset.filter(pk__in=RawSQL(
+        'SELECT id FROM jobs WHERE MATCH (title, description) AGAINST (%s IN BOOLEAN MODE)',
+        [_mysql_phrase(tokens)],
+    ))
+
+
+def filter_location(queryset, location):
+    """
+    Filter a Job (or job-keyed) queryset by location text.
+    """
+    tokens = tokenize_query(location)
+    if _use_fallback(tokens):
+        return queryset.filter(location__icontains=location)
+
+    if connection.vendor == 'sqlite':
+        match = 'location : %s' % _fts5_phrase(tokens)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match],
+        ))
+
+    return queryset.filter(pk__in=RawSQL(
+        'SELECT id FROM jobs WHERE MATCH (location) AGAINST (%s IN BOOLEAN MODE)',
+        [_mysql_phrase(tokens)],
+    ))
+
+
+def index_job(job):
+    """
+    Add, refresh or drop a job's row in the SQLite FTS table.
+    Only active jobs are indexed since only they can be listed.
+    MySQL maintains its FULLTEXT indexes itself.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job.pk])
+        if job.is_active:
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, location) '
+                'VALUES (%s, %s, %s, %s)',
+                [job.pk, job.title, job.description, job.location],
+            )
+
+
+def index_jobs(jobs):
+    """
+    index_job() for many jobs with two statements (bulk imports).
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[job.pk] for job in jobs])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, location) '
+            'VALUES (%s, %s, %s, %s)',
+            [[job.pk, job.title, job.description, job.location] for job in jobs if job.is_active],
+        )
+
+
+def remove_job(job_id):
+    """
+    Drop a deleted job from the SQLite FTS table.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+
+def rebuild_index():
+    """
+    Repopulate the SQLite FTS table from the jobs table.
+    Useful after raw SQL or bulk operations that skip model signals.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, location) '
+            'SELECT id, title, description, location FROM jobs WHERE is_active'
+        )
+
+
+def search_resumes(queryset, query, field='applicant'):
+    """
+    Filter a queryset to rows whose job seeker (the user in field) has an
+    extracted resume containing every word of the query.
+    """
+    tokens = tokenize_query(query)
+    if not tokens:
+        return queryset
+    if _use_fallback(tokens):
+        for token in tokens:
+            queryset = queryset.filter(**{f'{field}__resume_text__text__icontains': token})
+        return queryset
+
+    if connection.vendor == 'sqlite':
+        return queryset.filter(**{f'{field}__in': RawSQL(
+            f'SELECT rowid FROM {RESUME_FTS_TABLE} WHERE {RESUME_FTS_TABLE} MATCH %s',
+            [_fts5_all_terms(tokens)],
+        )})
+
+    return queryset.filter(**{f'{field}__in': RawSQL(
+        'SELECT seeker_id FROM resume_texts WHERE MATCH (text) AGAINST (%s IN BOOLEAN MODE)',
+        [_mysql_all_terms(tokens)],
+    )})
+
+
+def index_resume(seeker_id, text):
+    """
+    Add or refresh a job seeker's resume text in the SQLite FTS table.
+    """
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {RESUME_FTS_TABLE} WHERE rowid = %s', [seeker_id])
+        if text:
+            cursor.execute(f'INSERT INTO {RESUME_FTS_TABLE} (rowid, text) VALUES (%s, %s)', [seeker_id, text])
+
+
+def remove_resume(seeker_id):
+    index_resume(seeker_id, '')
@@ -0,0 +1,118 @@
+# jobs/signals.py
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from users.models import EmployerProfile, JobSeekerProfile, User
+from .models import Job, Application, ResumeText
+from . import geo, search, ranking, trigrams, salaries, documents, counters, employer_stats, matching, recommendations, resumes
+from .autocomplete import autocomplete_index
+
+
+@receiver(pre_save, sender=Job)
+def geocode_job_location(sender, instance, **kwargs):
+    geo.locate_job(instance)
+
+
+@receiver(post_save, sender=Job)
+def update_job_search_index(sender, instance, **kwargs):
+    """
+    Keep the full-text index, BM25 term statistics and trigram index
+    in sync whenever a job is created or edited.
+    """
+    documents.index_job(instance)
+    search.index_job(instance)
+    ranking.index_job(instance)
+    trigrams.index_job(instance)
+    autocomplete_index.update_job(instance)
+    salaries.index_job(instance, created=kwargs.get('created', False))
+    employer_stats.job_saved(instance, created=kwargs.get('created', False))
+    instance.remember_saved_values()
+
+
+@receiver(pre_delete, sender=Job)
+def remove_job_term_statistics(sender, instance, **kwargs):
+    # Runs before the cascade removes the postings and applications we need to decrement
+    ranking.remove_job(instance)
+    trigrams.remove_job(instance)
+    employer_stats.job_deleted(instance)
+    recommendations.job_removed(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    # The cascade already removed the job's search document, if it had one
+    if getattr(instance, '_loaded_values', {}).get('is_active', instance.is_active):
+        documents.changed()
+    search.remove_job(instance.pk)
+    autocomplete_index.remove_job(instance.pk)
+    salaries.remove_job(instance)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    if created:
+        counters.application_created(instance)
+        employer_stats.application_created(instance)
+    elif 'status' in loaded:
+        counters.status_changed(instance.job_id, loaded['status'], instance.status)
+        employer_stats.status_changed(instance.job_id, loaded['status'], instance.status)
+    loaded['status'] = instance.status
+    instance._loaded_values = loaded
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, origin=None, **kwargs):
+    # Deleting a job, or an employer with their jobs, takes the applications
+    # and every counter they are in with it. A deleted job seeker's
+    # applications still leave other employers' counters.
+    if isinstance(origin, Job) or (isinstance(origin, User) and origin.user_type == 'employer'):
+        return
+    status = getattr(instance, '_loaded_values', {}).get('status', instance.status)
+    counters.application_deleted(instance.job_id, status)
+    employer_stats.application_deleted(instance.job_id, status)
+
+
+@receiver(post_save, sender=EmployerProfile)
+def update_company_name(sender, instance, **kwargs):
+    documents.update_company(instance.user_id, instance.company_name)
+    autocomplete_index.update_company(instance)
+
+
+@receiver(post_delete, sender=EmployerProfile)
+def remove_company_name(sender, instance, **kwargs):
+    documents.update_company(instance.user_id, '')
+    autocomplete_index.remove_company(instance.pk)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+@receiver(post_delete, sender=JobSeekerProfile)
+def invalidate_skills_vector(sender, instance, **kwargs):
+    matching.invalidate_profile(instance.user_id)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+def recommend_again_after_profile_change(sender, instance, **kwargs):
+    recommendations.seeker_changed(instance.user_id)
+
+
+@receiver(post_save, sender=Application)
+def recommend_again_after_application(sender, instance, created, **kwargs):
+    # The new application joins the seeker's history and leaves their recommendations
+    if created:
+        recommendations.seeker_changed(instance.applicant_id)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+def queue_resume_extraction(sender, instance, **kwargs):
+    # Only queues the file; the process_resumes worker reads it
+    resumes.enqueue(instance)
+
+
+@receiver(post_delete, sender=JobSeekerProfile)
+def remove_resume_text(sender, instance, **kwargs):
+    resumes.remove(instance.user_id)
+
+
+@receiver(post_delete, sender=ResumeText)
+def remove_resume_from_search_index(sender, instance, **kwargs):
+    search.remove_resume(instance.seeker_id)
@@ -0,0 +1,98 @@
+# jobs/sparse.py
+"""
+Sparse vector math for the batch job recommender (jobs/recommendations.py).
+
+Vectors are dicts {term: weight}. A matrix of column vectors is stored as
+an inverted index {term: [(column, weight), ...]}, so multiplying it by a
+sparse vector only touches the entries that share a term with it.
+
+This module imports nothing from Django, so process pool workers can
+load it without setting Django up.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+
+def normalize(vector):
+    """
+    Scale a vector to unit length (an empty vector stays empty).
+    """
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    if not norm:
+        return {}
+    return {term: value / norm for term, value in vector.items()}
+
+
+def add(vector, other, weight=1.0):
+    """
+    vector + weight * other, as a new vector.
+    """
+    total = dict(vector)
+    for term, value in other.items():
+        total[term] = total.get(term, 0.0) + weight * value
+    return total
+
+
+def inverted_index(columns):
+    """
+    Matrix with one column per vector in columns.
+    """
+    index = defaultdict(list)
+    for column, vector in enumerate(columns):
+        for term, value in vector.items():
+            index[term].append((column, value))
+    return dict(index)
+
+
+def product(vector, index):
+    """
+    The vector times every column of the matrix: {column: dot product}
+    for the columns sharing at least one term with it.
+    """
+    dots = defaultdict(float)
+    for term, value in vector.items():
+        for column, weight in index.get(term, ()):
+            dots[column] += value * weight
+    return dots
+
+
+def top_k(dots, k, exclude=(), groups=None, group_factors=None):
+    """
+    The k best (column, score) pairs of a product(), best first. Columns
+    in exclude are skipped; when groups (column -> group) and
+    group_factors (group -> multiplier) are given, scores are scaled by
+    the factor of their column's group.
+    """
+    if groups is not None and group_factors:
+        scored = (
+            (column, dot * group_factors.get(groups[column], 1.0))
+            for column, dot in dots.items() if column not in exclude
+        )
+    else:
+        scored = ((column, dot) for column, dot in dots.items() if column not in exclude)
+    return heapq.nlargest(k, scored, key=lambda item: item[1])
+
+
+# Process pool plumbing: each worker receives the job matrix once, then
+# scores chunks of seekers against it.
+
+_worker_matrix = {}
+
+
+def init_worker(index, groups):
+    _worker_matrix['index'] = index
+    _worker_matrix['groups'] = groups
+
+
+def score_chunk(queries, k):
+    """
+    Top k columns of the worker's matrix for each (key, vector, exclude,
+    group_factors) query. Returns [(key, [(column, score), ...]), ...].
+    """
+    index = _worker_matrix['index']
+    groups = _worker_matrix['groups']
+    return [
+        (key, top_k(product(vector, index), k, exclude, groups, group_factors))
+        for key, vector, exclude, group_factors in queries
+    ]
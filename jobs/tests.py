@@ -1,3 +1,1009 @@
-from django.test import TestCase
+# jobs/tests.py
+"""
+Tests of the jobs app. JobViewQueryBudgetTests requests every view in
+jobs/views.py with a realistic amount of data, so a view running more
+queries than its @query_budget fails here (see config/test_settings.py);
+the other cases check the derived tables and caches behind those views.
+"""
+import base64
+import csv
+import io
+import json
+import math
+import os
+import re
+import tempfile
+import zlib
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from users.models import EmployerProfile, JobSeekerProfile, User
+
+from . import (
+    cards, counters, documents, employer_stats, geo, ranking, recommendations, resume_text, resumes, review, salaries, trigrams,
+)
+from .models import (
+    Application, EmployerStats, Job, JobRecommendation, JobSearchDocument, JobTermPosting, JobTrigram,
+    JobTrigramFrequency, ResumeText, SalaryHistogramBucket,
+)
+from .pagination import decode_cursor, decode_position, encode_cursor
+
+# Enough rows that a per-row query would go over any budget
+JOB_COUNT = 30
+SEEKER_COUNT = 15
+
+
+def make_employer(username, company_name='Acme Corp'):
+    employer = User.objects.create_user(username, password='password', user_type='employer')
+    EmployerProfile.objects.create(user=employer, company_name=company_name)
+    return employer
+
+
+def make_seeker(username, skills='python, django'):
+    seeker = User.objects.create_user(username, password='password', user_type='job_seeker')
+    JobSeekerProfile.objects.create(user=seeker, skills=skills)
+    return seeker
+
+
+def make_job(employer, title='Python Developer', **fields):
+    defaults = {
+        'description': 'Build and run the backend services behind our products.',
+        'requirements': 'python django',
+        'location': 'Remote',
+        'job_type': 'full_time',
+    }
+    defaults.update(fields)
+    return Job.objects.create(employer=employer, title=title, **defaults)
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class JobViewQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            'acme', password='password', user_type='employer', first_name='Ada', email='ada@acme.test'
+        )
+        EmployerProfile.objects.create(user=cls.employer, company_name='Acme Corp')
+        other = User.objects.create_user('globex', password='password', user_type='employer')
+        EmployerProfile.objects.create(user=other, company_name='Globex')
+
+        cls.jobs = [
+            Job.objects.create(
+                employer=cls.employer if index % 3 else other,
+                title=f'{"Senior " if index % 2 else ""}Python Developer {index}',
+                description='Build and run the backend services behind our products.',
+                requirements='python django postgresql',
+                location='Remote' if index % 4 else 'San Francisco, CA',
+                job_type='full_time' if index % 5 else 'contract',
+                salary_min=80000 + index * 1000,
+                salary_max=120000 + index * 1000,
+            )
+            for index in range(JOB_COUNT)
+        ]
+        cls.job = cls.jobs[1]
+
+        cls.seekers = []
+        for index in range(SEEKER_COUNT):
+            seeker = User.objects.create_user(
+                f'seeker{index}', password='password', user_type='job_seeker',
+                first_name='Sam', last_name=f'Seeker {index}', email=f'seeker{index}@example.test',
+            )
+            JobSeekerProfile.objects.create(
+                user=seeker, skills='python, django, sql', experience_years=index % 8, education='BSc'
+            )
+            cls.seekers.append(seeker)
+            for job in cls.jobs[1:4]:
+                Application.objects.create(
+                    job=job, applicant=seeker, cover_letter='=SUM(A1) I would love to join.'
+                )
+        cls.seeker = cls.seekers[0]
+        # Not applied anywhere yet
+        cls.new_seeker = User.objects.create_user('newcomer', password='password', user_type='job_seeker')
+        JobSeekerProfile.objects.create(user=cls.new_seeker, skills='python')
+
+    def setUp(self):
+        # Cached counts and results must not carry over from another test's data
+        for alias in ('default', 'job_cards'):
+            caches[alias].clear()
+
+    def test_job_list(self):
+        response = self.client.get(reverse('jobs:job_list'))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(reverse('jobs:job_list'), {
+            'search': 'python developer', 'location': 'remote', 'job_type': 'full_time',
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def test_job_list_shows_changes(self):
+        params = {'search': 'python', 'job_type': 'contract'}
+        response = self.client.get(reverse('jobs:job_list'), params)
+        total = response.context['total_jobs']
+
+        # Cached results are keyed by the generation in the database, which
+        # every worker process reads, not by anything kept in this one
+        Job.objects.create(
+            employer=self.employer, title='Python Contractor', description='Short project.',
+            requirements='python', location='Remote', job_type='contract',
+        )
+        response = self.client.get(reverse('jobs:job_list'), params)
+        self.assertEqual(response.context['total_jobs'], total + 1)
+
+    def test_job_list_next_page(self):
+        response = self.client.get(reverse('jobs:job_list'))
+        cursor = response.context['page'].next_cursor
+        self.assertTrue(cursor)
+        response = self.client.get(reverse('jobs:job_list'), {'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
+
+    def test_autocomplete(self):
+        response = self.client.get(reverse('jobs:autocomplete'), {'field': 'search', 'q': 'pyth'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_job_detail(self):
+        response = self.client.get(reverse('jobs:job_detail', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_login(self.seeker)
+        response = self.client.get(reverse('jobs:job_detail', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_apply(self):
+        self.client.force_login(self.new_seeker)
+        url = reverse('jobs:apply', args=[self.job.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {'cover_letter': 'I have shipped Django services for years.'})
+        self.assertRedirects(response, reverse('jobs:my_applications'), fetch_redirect_response=False)
+        self.assertTrue(Application.objects.filter(job=self.job, applicant=self.new_seeker).exists())
+
+    def test_my_applications(self):
+        self.client.force_login(self.seeker)
+        response = self.client.get(reverse('jobs:my_applications'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['applications']), 3)
+
+    def test_post_job(self):
+        self.client.force_login(self.employer)
+        url = reverse('jobs:post_job')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {
+            'title': 'Data Engineer',
+            'description': 'Own our data pipelines.',
+            'requirements': 'python sql airflow',
+            'location': 'Berlin',
+            'job_type': 'full_time',
+            'salary_min': 70000,
+            'salary_max': 90000,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Job.objects.filter(title='Data Engineer', employer=self.employer).exists())
+
+    def test_my_jobs(self):
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse('jobs:my_jobs'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_edit_job(self):
+        self.client.force_login(self.employer)
+        url = reverse('jobs:edit_job', args=[self.job.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {
+            'title': 'Staff Python Developer',
+            'description': self.job.description,
+            'requirements': self.job.requirements,
+            'location': self.job.location,
+            'job_type': self.job.job_type,
+            'salary_min': 150000,
+            'salary_max': 180000,
+        })
+        self.assertRedirects(response, reverse('jobs:my_jobs'), fetch_redirect_response=False)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, 'Staff Python Developer')
+
+    def test_delete_job(self):
+        self.client.force_login(self.employer)
+        url = reverse('jobs:delete_job', args=[self.job.pk])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url)
+        self.assertRedirects(response, reverse('jobs:my_jobs'), fetch_redirect_response=False)
+        self.assertFalse(Job.objects.filter(pk=self.job.pk).exists())
+
+    def test_job_applications(self):
+        self.client.force_login(self.employer)
+        url = reverse('jobs:job_applications', args=[self.job.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['applications']), SEEKER_COUNT)
+
+        for params in ({'sort': 'match'}, {'status': 'pending'}, {'q': 'python'}):
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+
+    def test_cover_letter(self):
+        self.client.force_login(self.employer)
+        application = Application.objects.filter(job=self.job).first()
+        response = self.client.get(
+            reverse('jobs:application_cover_letter', args=[self.job.pk, application.pk])
+        )
+        self.assertContains(response, 'I would love to join.')
+
+    def test_bulk_status(self):
+        self.client.force_login(self.employer)
+        applications = list(Application.objects.filter(job=self.job).values_list('pk', flat=True))
+        url = reverse('jobs:bulk_application_status', args=[self.job.pk])
+
+        self.client.post(url, {'status': 'reviewed', 'applications': applications[:5]})
+        self.client.post(url, {'status': 'interview', 'select_all': 'on', 'current_status': 'pending'})
+        statuses = Application.objects.filter(job=self.job).values_list('status', flat=True)
+        self.assertEqual(sorted(set(statuses)), ['interview', 'reviewed'])
+
+    def test_exports(self):
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse('jobs:export_job_applications', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 200)
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(rows), SEEKER_COUNT + 1)
+        # Cover letters starting like a formula are quoted for spreadsheets
+        self.assertTrue(rows[1].endswith(",'=SUM(A1) I would love to join."))
+
+        response = self.client.get(reverse('jobs:export_employer_applications'), {'format': 'jsonl'})
+        self.assertEqual(response.status_code, 200)
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(rows), 2 * SEEKER_COUNT)
+        self.assertEqual(json.loads(rows[0])['cover_letter'], '=SUM(A1) I would love to join.')
+
+
+class JobDetailConditionalTests(TestCase):
+    def setUp(self):
+        self.employer = make_employer('acme')
+        self.job = make_job(self.employer)
+        self.seeker = make_seeker('sam')
+        self.url = reverse('jobs:job_detail', args=[self.job.pk])
+
+    def etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_not_modified(self):
+        etag = self.etag()
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_etag_changes(self):
+        anonymous = self.etag()
+
+        self.job.title = 'Senior Python Developer'
+        self.job.save()
+        edited = self.etag()
+        self.assertNotEqual(edited, anonymous)
+        response = self.client.get(self.url, headers={'If-None-Match': anonymous})
+        self.assertContains(response, 'Senior Python Developer')
+
+        self.client.force_login(self.seeker)
+        seeker = self.etag()
+        self.assertNotEqual(seeker, edited)
+
+        Application.objects.create(job=self.job, applicant=self.seeker)
+        self.assertNotEqual(self.etag(), seeker)
+
+
+class SearchGenerationTests(TestCase):
+    def setUp(self):
+        self.employer = make_employer('acme')
+        self.job = Job.objects.get(pk=make_job(self.employer).pk)
+
+    def assertBumps(self, bumps, change):
+        before = documents.generation()
+        change()
+        self.assertEqual(documents.generation() != before, bumps)
+
+    def test_edits(self):
+        self.assertBumps(False, self.job.save)
+        self.assertBumps(False, lambda: Application.objects.create(job=self.job, applicant=make_seeker('sam')))
+        self.job.requirements = 'python django celery'
+        self.assertBumps(True, self.job.save)
+        self.job.salary_min = 90000
+        self.assertBumps(True, self.job.save)
+        self.assertBumps(False, self.job.save)
+
+    def test_inactive_jobs(self):
+        self.job.is_active = False
+        self.assertBumps(True, self.job.save)
+        self.job.title = 'Python Developer (filled)'
+        self.assertBumps(False, self.job.save)
+        self.assertBumps(False, lambda: make_job(self.employer, is_active=False))
+        self.assertBumps(False, Job.objects.get(pk=self.job.pk).delete)
+
+        job = Job.objects.get(pk=make_job(self.employer).pk)
+        self.assertBumps(True, Job.objects.get(pk=job.pk).delete)
+
+    def test_reactivated(self):
+        self.job.is_active = False
+        self.job.save()
+        self.job.is_active = True
+        self.assertBumps(True, self.job.save)
+        self.assertTrue(JobSearchDocument.objects.filter(job=self.job).exists())
+
+
+class JobCardTests(TestCase):
+    def setUp(self):
+        cards.card_cache().clear()
+        employer = make_employer('acme')
+        self.jobs = [make_job(employer, f'Python Developer {index}') for index in range(3)]
+
+    def documents(self):
+        return list(JobSearchDocument.objects.order_by('job_id'))
+
+    def test_cached_cards_match_rendered_ones(self):
+        rendered = cards.render_cards(self.documents(), cache=False)
+        self.assertEqual(cards.render_cards(self.documents()), rendered)
+        # Every card now comes from the one get_many()
+        with mock.patch.object(cards, 'render_card') as render_card:
+            self.assertEqual(cards.render_cards(self.documents()), rendered)
+        render_card.assert_not_called()
+
+    def test_edited_job_gets_a_new_card(self):
+        response = self.client.get(reverse('jobs:job_list'))
+        self.assertContains(response, 'Python Developer 1')
+
+        self.jobs[1].title = 'Django Developer 1'
+        self.jobs[1].save()
+        response = self.client.get(reverse('jobs:job_list'))
+        self.assertContains(response, 'Django Developer 1')
+        self.assertNotContains(response, 'Python Developer 1')
+        self.assertContains(response, 'Python Developer 2')
+
+
+class EmployerStatsTests(TestCase):
+    def setUp(self):
+        self.employer = make_employer('acme')
+        self.jobs = [make_job(self.employer, f'Python Developer {index}') for index in range(2)]
+        self.seekers = [make_seeker(f'seeker{index}') for index in range(3)]
+        for seeker in self.seekers:
+            for job in self.jobs:
+                Application.objects.create(job=job, applicant=seeker)
+
+    def test_deleting_an_employer_with_applications(self):
+        self.assertEqual(employer_stats.for_employer(self.employer).applications_received, 6)
+
+        self.employer.delete()
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(EmployerStats.objects.exists())
+
+    def test_deleting_an_employer_without_a_stats_row(self):
+        EmployerStats.objects.all().delete()
+        self.employer.delete()
+        self.assertFalse(EmployerStats.objects.exists())
+
+    def test_deleting_a_job_seeker(self):
+        employer_stats.for_employer(self.employer)
+        self.seekers[0].delete()
+
+        stats = EmployerStats.objects.get(employer=self.employer)
+        self.assertEqual(stats.applications_received, 4)
+        self.assertEqual(stats.pending_applications, 4)
+        self.assertEqual(Job.objects.get(pk=self.jobs[0].pk).application_count, 2)
+
+
+class ApplicationCounterTests(TestCase):
+    def setUp(self):
+        employer = make_employer('acme')
+        self.jobs = [make_job(employer, f'Python Developer {index}') for index in range(2)]
+        self.seekers = [make_seeker(f'seeker{index}') for index in range(3)]
+        self.applications = [
+            Application.objects.create(job=job, applicant=seeker)
+            for seeker in self.seekers for job in self.jobs
+        ]
+
+    def assertCounters(self, job, application_count, **status_counts):
+        job = Job.objects.get(pk=job.pk)
+        expected = {field: 0 for field in counters.STATUS_FIELDS}
+        expected.update({counters.status_field(status): count for status, count in status_counts.items()})
+        expected['application_count'] = application_count
+        self.assertEqual({field: getattr(job, field) for field in Job.COUNTER_FIELDS}, expected)
+
+    def test_created(self):
+        self.assertCounters(self.jobs[0], 3, pending=3)
+
+    def test_status_changes(self):
+        application = Application.objects.get(pk=self.applications[0].pk)
+        application.status = 'reviewed'
+        application.save()
+        # Saving again without a change moves nothing
+        application.save()
+        self.assertCounters(self.jobs[0], 3, pending=2, reviewed=1)
+
+        review.bulk_update_status(self.jobs[0], 'interview', current_status='pending')
+        self.assertCounters(self.jobs[0], 3, reviewed=1, interview=2)
+        self.assertCounters(self.jobs[1], 3, pending=3)
+
+    def test_deleted(self):
+        application = Application.objects.get(pk=self.applications[0].pk)
+        application.status = 'rejected'
+        application.save()
+        application.delete()
+        self.assertCounters(self.jobs[0], 2, pending=2)
+
+        self.seekers[1].delete()
+        self.assertCounters(self.jobs[0], 1, pending=1)
+        self.assertCounters(self.jobs[1], 2, pending=2)
+
+        self.jobs[0].delete()
+        self.assertCounters(self.jobs[1], 2, pending=2)
+        self.assertEqual(counters.reconcile(), 0)
+
+    def test_reconcile(self):
+        self.assertEqual(counters.reconcile(), 0)
+        Job.objects.filter(pk=self.jobs[0].pk).update(application_count=10, pending_count=0)
+        # Moved without signals, as a raw UPDATE would
+        Application.objects.filter(job=self.jobs[1]).update(status='accepted')
+
+        self.assertEqual(counters.reconcile(batch_size=1), 2)
+        self.assertCounters(self.jobs[0], 3, pending=3)
+        self.assertCounters(self.jobs[1], 3, accepted=3)
+        self.assertEqual(counters.reconcile(), 0)
+
+
+class ImportJobsTests(TestCase):
+    columns = ['external_id', 'title', 'description', 'requirements', 'location', 'job_type',
+               'salary_min', 'salary_max', 'is_active']
+
+    def setUp(self):
+        self.employer = make_employer('acme')
+        directory = tempfile.TemporaryDirectory(prefix='import-jobs-test-')
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'feed.csv')
+
+    def import_feed(self, rows):
+        with open(self.path, 'w', newline='') as feed:
+            writer = csv.writer(feed)
+            writer.writerow(self.columns)
+            writer.writerows(rows)
+        call_command('import_jobs', self.path, employer='acme', stdout=io.StringIO(), stderr=io.StringIO())
+
+    def row(self, index, title='Python Developer', salary=100000, active='yes'):
+        return [f'ext-{index}', f'{title} {index}', 'Build our backend.', 'python django',
+                'Remote', 'full_time', salary, salary + 20000, active]
+
+    def test_import_twice(self):
+        self.import_feed([self.row(index) for index in range(20)])
+        jobs = {job.external_id: job for job in Job.objects.all()}
+        self.assertEqual(len(jobs), 20)
+        self.assertEqual(JobSearchDocument.objects.count(), 20)
+        bucket = salaries.bucket_for(110000)
+        self.assertEqual(SalaryHistogramBucket.objects.get(job_type='full_time', bucket=bucket).job_count, 20)
+
+        rows = [self.row(index) for index in range(2, 20)]
+        rows[0] = self.row(2, title='Rust Engineer', salary=300000)
+        rows[1] = self.row(3, active='no')
+        rows.append(self.row(20))
+        with CaptureQueriesContext(connection) as queries:
+            self.import_feed(rows)
+        # The updated jobs' rows, created_at included, are read once, not once per job
+        job_reads = [query for query in queries if query['sql'].startswith('SELECT') and ' FROM "jobs"' in query['sql']]
+        self.assertLess(len(job_reads), 5)
+
+        self.assertEqual(Job.objects.count(), 21)
+        edited = Job.objects.get(external_id='ext-2')
+        self.assertEqual((edited.title, edited.salary_min), ('Rust Engineer 2', 300000))
+        self.assertEqual(edited.created_at, jobs['ext-2'].created_at)
+        self.assertGreater(edited.updated_at, jobs['ext-2'].updated_at)
+
+        document = JobSearchDocument.objects.get(job=edited)
+        self.assertEqual((document.title, document.created_at), ('Rust Engineer 2', edited.created_at))
+        self.assertFalse(JobSearchDocument.objects.filter(job__external_id='ext-3').exists())
+        self.assertEqual(JobSearchDocument.objects.count(), 20)
+
+        titles = set(JobTrigram.objects.filter(job=edited, field='title').values_list('trigram', flat=True))
+        self.assertIn('rus', titles)
+        self.assertNotIn('pyt', titles)
+        terms = set(JobTermPosting.objects.filter(job=edited).values_list('term__term', flat=True))
+        self.assertIn('rust', terms)
+        self.assertFalse(JobTermPosting.objects.filter(job__external_id='ext-3').exists())
+
+        buckets = dict(SalaryHistogramBucket.objects.values_list('bucket', 'job_count'))
+        self.assertEqual((buckets[bucket], buckets[salaries.bucket_for(310000)]), (19, 1))
+        stats = EmployerStats.objects.get(employer=self.employer)
+        self.assertEqual((stats.active_jobs, stats.inactive_jobs), (20, 1))
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        employer = make_employer('acme')
+        for index in range(12):
+            make_job(
+                employer, f'{"Python" if index % 2 else "Java"} Developer {index}',
+                location=('Remote', 'Berlin', ' Berlin ')[index % 3],
+                job_type=('full_time', 'contract', 'part_time', 'full_time')[index % 4],
+            )
+        make_job(employer, 'Python Developer Retired', is_active=False)
+
+    def job_list(self, **params):
+        response = self.client.get(reverse('jobs:job_list'), params)
+        self.assertEqual(response.status_code, 200)
+        facets = response.context['facets']
+        job_types = {facet['value']: facet['count'] for facet in facets['job_types']}
+        locations = {facet['value']: facet['count'] for facet in facets['locations']}
+        return response.context['total_jobs'], job_types, locations
+
+    def test_counts_match_filtered_totals(self):
+        total, job_types, locations = self.job_list(search='python')
+        self.assertEqual(total, 6)
+        self.assertEqual(sum(job_types.values()), total)
+        # " Berlin " and "Berlin" are one location
+        self.assertEqual(locations, {'Remote': 2, 'Berlin': 4})
+
+        for job_type, count in job_types.items():
+            self.assertEqual(self.job_list(search='python', job_type=job_type)[0], count, job_type)
+
+        # Job type counts ignore the selected job type, location counts don't
+        total, selected_job_types, locations = self.job_list(search='python', job_type='contract')
+        self.assertEqual(selected_job_types, job_types)
+        self.assertEqual(sum(locations.values()), total)
+
+    def test_counts_follow_changes(self):
+        _, job_types, _ = self.job_list(search='java')
+        Job.objects.get(title='Java Developer 0').delete()
+        self.assertEqual(self.job_list(search='java')[1]['full_time'], job_types['full_time'] - 1)
+
+
+class TrigramSearchTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        employer = make_employer('acme')
+        self.python = make_job(employer, 'Python Developer', location='Bangalore, India')
+        self.java = make_job(employer, 'Java Developer', location='Bangalore, India')
+        self.designer = make_job(employer, 'Graphic Designer', location='Pune, India')
+        make_job(employer, 'Python Developer (closed)', location='Bangalore, India', is_active=False)
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams.trigrams('Pune'), {'  p', ' pu', 'pun', 'une', 'ne '})
+        self.assertEqual(trigrams.trigrams('  '), set())
+
+    def test_misspellings(self):
+        self.assertEqual(list(trigrams.similar_jobs('location', 'Banglore')), [self.java.pk, self.python.pk])
+        self.assertEqual(list(trigrams.similar_jobs('title', 'pyhton develper')), [self.python.pk])
+        self.assertEqual(trigrams.similar_jobs('title', 'plumber'), {})
+        # Title and location both have to match
+        self.assertEqual(trigrams.fuzzy_rank(search='develper', location='Puna'), [])
+        self.assertEqual(trigrams.fuzzy_rank(search='javva', location='Banglore'), [self.java.pk])
+
+    def test_edited_job_reindexed(self):
+        self.designer.title = 'Pythonista'
+        self.designer.save()
+        self.assertIn(self.designer.pk, trigrams.similar_jobs('title', 'pythn'))
+        self.designer.is_active = False
+        self.designer.save()
+        self.assertNotIn(self.designer.pk, trigrams.similar_jobs('title', 'pythn'))
+
+    def frequencies(self):
+        return {
+            (row.field, row.trigram): row.job_count
+            for row in JobTrigramFrequency.objects.filter(job_count__gt=0)
+        }
+
+    def test_frequencies(self):
+        expected = {
+            (row['field'], row['trigram']): row['total']
+            for row in JobTrigram.objects.values('field', 'trigram').annotate(total=Count('pk'))
+        }
+        self.assertEqual(self.frequencies()[('location', 'ban')], 2)
+        self.assertEqual(self.frequencies(), expected)
+
+        self.python.location = 'Pune, India'
+        self.python.save()
+        self.java.delete()
+        self.assertEqual(self.frequencies()[('location', 'pun')], 2)
+        self.assertNotIn(('location', 'ban'), self.frequencies())
+        after_edits = self.frequencies()
+        trigrams.rebuild_index()
+        self.assertEqual(self.frequencies(), after_edits)
+
+    def test_common_trigrams_skipped(self):
+        # Only the postings of the rarest trigrams are read to find candidates
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(list(trigrams.similar_jobs('location', 'Bangalore India')), [self.java.pk, self.python.pk])
+        probes = re.search(r'U0\."trigram" IN \(([^)]*)\)', queries[-1]['sql']).group(1)
+        # "India" is in every job's location, "Bangalore" in two
+        self.assertIn("'ban'", probes)
+        self.assertNotIn("'ind'", probes)
+
+    def test_job_list_falls_back_to_fuzzy_matches(self):
+        response = self.client.get(reverse('jobs:job_list'), {'search': 'pyton', 'location': 'banglore'})
+        self.assertTrue(response.context['fuzzy'])
+        self.assertEqual([job.pk for job in response.context['jobs']], [self.python.pk])
+
+
+def haversine_km(latitude, longitude, other_latitude, other_longitude):
+    latitude, longitude, other_latitude, other_longitude = map(
+        math.radians, (latitude, longitude, other_latitude, other_longitude)
+    )
+    half_chord = (
+        math.sin((other_latitude - latitude) / 2) ** 2
+        + math.cos(latitude) * math.cos(other_latitude) * math.sin((other_longitude - longitude) / 2) ** 2
+    )
+    return 2 * geo.EARTH_RADIUS_KM * math.asin(min(math.sqrt(half_chord), 1))
+
+
+class RadiusSearchTests(TestCase):
+    def setUp(self):
+        self.employer = make_employer('acme')
+
+    def place_jobs(self, points):
+        """
+        One job at each (latitude, longitude), bypassing the gazetteer.
+        """
+        jobs = {}
+        for latitude, longitude in points:
+            job = make_job(self.employer, location='Nowhere')
+            Job.objects.filter(pk=job.pk).update(
+                latitude=latitude, longitude=longitude, geo_cell=geo.grid_cell(latitude, longitude),
+            )
+            jobs[job.pk] = (latitude, longitude)
+        return jobs
+
+    def assertRadius(self, latitude, longitude, radius_km, points):
+        jobs = self.place_jobs(points)
+        place = geo.Place('Centre', '', '', latitude, longitude)
+        found = set(geo.within_radius(Job.objects.all(), place, radius_km).values_list('pk', flat=True))
+        expected = {
+            pk for pk, point in jobs.items() if haversine_km(latitude, longitude, *point) <= radius_km
+        }
+        self.assertTrue(expected)
+        self.assertEqual(found, expected)
+
+    def ring(self, latitude, longitude, distances_km, bearings=16):
+        """
+        Points at each distance from a centre, spread over the compass.
+        """
+        points = []
+        for distance in distances_km:
+            for index in range(bearings):
+                bearing = 2 * math.pi * index / bearings
+                points.append((
+                    latitude + math.degrees(distance * math.cos(bearing) / geo.EARTH_RADIUS_KM),
+                    longitude + math.degrees(
+                        distance * math.sin(bearing) / (geo.EARTH_RADIUS_KM * math.cos(math.radians(latitude)))
+                    ),
+                ))
+        return points
+
+    def test_centre_on_a_cell_corner(self):
+        # 12.0, 77.0 is where four grid cells meet; the ring straddles them
+        self.assertRadius(12.0, 77.0, 10, self.ring(12.0, 77.0, (1, 9.9, 10.1, 30)))
+
+    def test_circle_reaching_past_the_neighbouring_cells(self):
+        self.assertRadius(12.24, 77.24, 50, self.ring(12.24, 77.24, (24, 26, 49.5, 50.5)))
+
+    def test_antimeridian(self):
+        points = self.ring(0.1, 179.98, (5, 20))
+        points = [(latitude, (longitude + 180) % 360 - 180) for latitude, longitude in points]
+        self.assertRadius(0.1, 179.98, 10, points)
+
+    def test_near_the_pole(self):
+        points = [(89.9, longitude) for longitude in range(-180, 180, 30)] + [(89.5, 0), (89.0, 120)]
+        self.assertRadius(89.95, 0, 25, points)
+
+    def test_job_list_radius(self):
+        make_job(self.employer, location='Mumbai')
+        make_job(self.employer, location='Delhi')
+        response = self.client.get(reverse('jobs:job_list'), {'location': 'Bombay', 'radius': 25})
+        self.assertEqual([job.location for job in response.context['jobs']], ['Mumbai'])
+
+
+class SalaryHistogramTests(TestCase):
+    def setUp(self):
+        self.employer = make_employer('acme')
+
+    def counts(self, job_type=None):
+        return {bar['low']: bar['count'] for bar in salaries.histogram(job_type)}
+
+    def test_bucket_edges(self):
+        self.assertEqual(salaries.bucket_for(0), 0)
+        self.assertEqual(salaries.bucket_for(9999.99), 0)
+        self.assertEqual(salaries.bucket_for(10000), 1)
+        self.assertEqual(salaries.bucket_for(79999), 6)
+        self.assertEqual(salaries.bucket_for(80000), 7)
+        self.assertEqual(salaries.bucket_for(10 ** 9), len(salaries.SALARY_BUCKETS) - 1)
+        self.assertEqual(salaries.representative_salary(60000, 100000), 80000)
+        self.assertEqual(salaries.representative_salary(None, 50000), 50000)
+        self.assertIsNone(salaries.representative_salary(None, None))
+
+    def test_histogram(self):
+        make_job(self.employer, salary_min=60000, salary_max=100000)      # midpoint on the 80k edge
+        make_job(self.employer, salary_min=60000, salary_max=99999.98)    # just below it
+        make_job(self.employer, salary_max=120000, job_type='contract')
+        make_job(self.employer)                                           # no salary
+        make_job(self.employer, salary_min=500000, is_active=False)
+
+        # Empty buckets between the lowest and highest are drawn too
+        self.assertEqual(self.counts(), {60000: 1, 80000: 1, 100000: 0, 120000: 1})
+        self.assertEqual(self.counts('contract'), {120000: 1})
+        bars = salaries.histogram()
+        self.assertEqual((bars[0]['high'], bars[-1]['high']), (80000, 150000))
+        self.assertEqual([bar['height'] for bar in bars], [100, 100, 0, 100])
+
+    def test_counts_follow_changes(self):
+        job = make_job(self.employer, salary_min=70000, salary_max=90000)
+        other = make_job(self.employer, salary_min=85000)
+
+        job = Job.objects.get(pk=job.pk)
+        job.salary_max = 130000
+        job.save()
+        self.assertEqual(self.counts(), {80000: 1, 100000: 1})
+
+        job.job_type = 'contract'
+        job.save()
+        self.assertEqual(self.counts('full_time'), {80000: 1})
+        self.assertEqual(self.counts('contract'), {100000: 1})
+
+        job.is_active = False
+        job.save()
+        Job.objects.get(pk=other.pk).delete()
+        self.assertEqual(self.counts(), {})
+
+        job.is_active = True
+        job.save()
+        incremental = self.counts()
+        salaries.rebuild_index()
+        self.assertEqual(self.counts(), incremental)
+
+    def test_filter_salary(self):
+        jobs = {
+            'range': make_job(self.employer, salary_min=50000, salary_max=70000),
+            'minimum only': make_job(self.employer, salary_min=90000),
+            'maximum only': make_job(self.employer, salary_max=40000),
+            'none': make_job(self.employer),
+        }
+
+        def matching(minimum=None, maximum=None):
+            found = set(salaries.filter_salary(Job.objects.all(), minimum, maximum).values_list('pk', flat=True))
+            return {name for name, job in jobs.items() if job.pk in found}
+
+        # Ranges touching the bounds overlap them
+        self.assertEqual(matching(minimum=70000), {'range', 'minimum only'})
+        self.assertEqual(matching(minimum=70000.01), {'minimum only'})
+        self.assertEqual(matching(maximum=50000), {'range', 'maximum only'})
+        self.assertEqual(matching(40000, 40000), {'maximum only'})
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        employer = make_employer('acme')
+        self.django = make_job(employer, 'Django Developer', requirements='python django postgresql')
+        self.python = make_job(employer, 'Python Developer', requirements='python scripting')
+        self.senior = make_job(employer, 'Senior Django Developer', requirements='python django postgresql')
+        self.java = make_job(employer, 'Java Developer', requirements='java spring')
+        self.designer = make_job(employer, 'Graphic Designer', requirements='photoshop illustrator')
+        self.seeker = make_seeker('sam', skills='python, django, postgresql')
+
+    def recommended(self, seeker=None):
+        rows = JobRecommendation.objects.filter(seeker=seeker or self.seeker).order_by('rank')
+        return [(row.rank, row.job_id, row.score) for row in rows]
+
+    def test_ordering(self):
+        recommendations.refresh()
+        ranks, job_ids, scores = zip(*self.recommended())
+        self.assertEqual(ranks, tuple(range(1, len(ranks) + 1)))
+        self.assertEqual(list(scores), sorted(scores, reverse=True))
+        # A junior is better suited to the same job without "Senior" in its title
+        self.assertEqual(job_ids[:3], (self.django.pk, self.senior.pk, self.python.pk))
+        self.assertNotIn(self.designer.pk, job_ids)
+        junior_scores = dict(zip(job_ids, scores))
+
+        profile = self.seeker.jobseekerprofile
+        profile.experience_years = 8
+        profile.save()
+        recommendations.refresh()
+        senior_scores = {job_id: score for _, job_id, score in self.recommended()}
+        self.assertGreater(
+            senior_scores[self.senior.pk] / senior_scores[self.django.pk],
+            junior_scores[self.senior.pk] / junior_scores[self.django.pk],
+        )
+
+    def test_applied_jobs_left_out(self):
+        Application.objects.create(job=self.django, applicant=self.seeker)
+        recommendations.refresh()
+        job_ids = [job_id for _, job_id, _ in self.recommended()]
+        self.assertNotIn(self.django.pk, job_ids)
+        self.assertEqual(job_ids[0], self.senior.pk)
+
+    def test_incremental_run_merges_new_jobs(self):
+        recommendations.refresh()
+        before = self.recommended()
+        job = make_job(self.django.employer, 'Django Engineer', requirements='python django postgresql')
+
+        run = recommendations.refresh()
+        self.assertFalse(run.full)
+        self.assertEqual((run.seekers_recomputed, run.seekers_merged), (0, 1))
+        self.assertIn(job.pk, [job_id for _, job_id, _ in self.recommended()])
+        self.assertEqual(len(self.recommended()), len(before) + 1)
+
+    def test_workers(self):
+        for index in range(5):
+            make_seeker(f'seeker{index}', skills=('java', 'photoshop', 'python')[index % 3])
+        recommendations.refresh(full=True, chunk_size=2)
+        expected = list(JobRecommendation.objects.order_by('seeker', 'rank').values_list('seeker', 'job', 'rank'))
+
+        JobRecommendation.objects.all().delete()
+        recommendations.refresh(full=True, workers=2, chunk_size=2)
+        found = list(JobRecommendation.objects.order_by('seeker', 'rank').values_list('seeker', 'job', 'rank'))
+        self.assertEqual(found, expected)
+
+
+class RelevanceSearchTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        employer = make_employer('acme')
+        for index in range(5):
+            make_job(employer, f'IT Support Technician {index}', description='Keep it running.')
+        for index in range(3):
+            make_job(employer, f'Backend Developer {index}', requirements='python')
+            make_job(employer, f'DevOps Engineer {index}', requirements='kubernetes')
+
+    def search(self, **params):
+        response = self.client.get(reverse('jobs:job_list'), {'sort': 'relevance', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.context['total_jobs'], list(response.context['jobs'])
+
+    def test_stop_words_only(self):
+        # Nothing to rank by: listed most recent first, every match shown
+        total, jobs = self.search(search='it')
+        self.assertEqual(total, 5)
+        self.assertEqual(len(jobs), 5)
+
+    def test_truncated_prefix_expansion(self):
+        # "dev" matches developer and devops jobs, but only one expansion is ranked
+        with mock.patch.object(ranking, 'PREFIX_EXPANSIONS', 1):
+            total, jobs = self.search(search='dev')
+        self.assertEqual(len(jobs), total)
+        self.assertEqual(total, 3)
+
+    def test_ranked(self):
+        total, jobs = self.search(search='backend developer')
+        self.assertEqual(total, 3)
+        self.assertEqual([job.title for job in jobs][:1], ['Backend Developer 2'])
+
+
+def tampered_cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+class CursorTests(TestCase):
+    fields = ('created_at', 'job_id')
+
+    def test_round_trip(self):
+        cursor = encode_cursor(['2024-05-01 10:00:00+00:00', 42])
+        created_at, job_id = decode_cursor(cursor, JobSearchDocument, self.fields)
+        self.assertEqual((created_at.year, job_id), (2024, 42))
+        self.assertEqual(decode_position(encode_cursor([40])), 40)
+
+    def test_tampered(self):
+        for raw in ('[Infinity]', '[NaN]', '["2020-01-01T00:00:00", Infinity]', '[1e400]',
+                    '["2020-01-01T00:00:00", 1e400]', '{"a": 1}', 'not json'):
+            cursor = tampered_cursor(raw)
+            self.assertIsNone(decode_cursor(cursor, JobSearchDocument, self.fields), raw)
+            self.assertEqual(decode_position(cursor), 0, raw)
+
+    def test_job_list_with_tampered_cursor(self):
+        for sort in ('', 'relevance'):
+            response = self.client.get(reverse('jobs:job_list'), {
+                'search': 'python', 'sort': sort, 'cursor': tampered_cursor('[Infinity]'),
+            })
+            self.assertEqual(response.status_code, 200)
+
+
+def make_pdf(content, compress=False):
+    """
+    A one page PDF whose page draws the given content stream.
+    """
+    filter_entry = b''
+    if compress:
+        content = zlib.compress(content)
+        filter_entry = b' /Filter /FlateDecode'
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R'
+        b' /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d%s >>\nstream\n%s\nendstream' % (len(content), filter_entry, content),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    data = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(data)
+    data += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    data += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    data += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(data)
+
+
+RESUME_CONTENT = (
+    b'BT /F1 12 Tf 72 720 Td (Sam Seeker) Tj T*'
+    b' [(Python) -250 (and) -250 (Django)] TJ T*'
+    b' (Skills: \\(web\\) APIs) Tj T*'
+    b' <53514C> Tj ET'
+)
+
+
+class BuiltinPdfTextTests(SimpleTestCase):
+    def test_literal_string(self):
+        stream = b'(a (nested) string\\051 \\(x\\)\\n) Tj'
+        self.assertEqual(resume_text._literal_string(stream, 0), (b'a (nested) string) (x)\n', len(stream) - 3))
+        # An unterminated string runs to the end of the stream
+        self.assertEqual(resume_text._literal_string(b'(open', 0), (b'open', 5))
+
+    def test_tokens(self):
+        tokens = list(resume_text._pdf_tokens(b'/F1 12 Tf [(A) -300 <4243>] TJ (C\\)) Tj'))
+        self.assertEqual(tokens, [
+            ('name', b'/F1'), ('number', 12.0), b'Tf',
+            ('string', b'A'), ('number', -300.0), ('string', b'BC'), b'TJ',
+            ('string', b'C)'), b'Tj',
+        ])
+
+    def test_extract(self):
+        expected = 'Sam Seeker\nPython and Django\nSkills: (web) APIs\nSQL'
+        for compress in (False, True):
+            data = make_pdf(RESUME_CONTENT, compress=compress)
+            self.assertEqual(resume_text.clean(resume_text.builtin_pdf_text(data)), expected)
+
+    def test_no_text(self):
+        with self.assertRaises(resume_text.ExtractionError):
+            resume_text.builtin_pdf_text(make_pdf(b'0 0 m 100 100 l S'))
+
+    def test_decompression_bomb(self):
+        content = b'BT (x) Tj ET' + b' ' * 2000
+        with mock.patch.object(resume_text, 'MAX_PDF_STREAM_SIZE', 1000):
+            with self.assertRaisesMessage(resume_text.ExtractionError, 'too large'):
+                resume_text.builtin_pdf_text(make_pdf(content, compress=True))
+            # The same stream stored uncompressed is only as large as the upload
+            self.assertEqual(resume_text.builtin_pdf_text(make_pdf(content)).strip(), 'x')
+
+
+class ResumeProcessingTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory(prefix='resume-processing-test-')
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def upload(self, username, name, content):
+        seeker = make_seeker(username)
+        profile = seeker.jobseekerprofile
+        profile.resume = SimpleUploadedFile(name, content)
+        profile.save()
+        return seeker
+
+    def test_process(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                seekers = [
+                    self.upload(f'text{workers}', 'cv.txt', b'Python developer, %d years.' % workers),
+                    self.upload(f'pdf{workers}', 'cv.pdf', make_pdf(RESUME_CONTENT, compress=True)),
+                    self.upload(f'bad{workers}', 'cv.pdf', b'%PDF-1.4 nothing here'),
+                ]
+                counts = resumes.process(workers=workers, batch_size=2)
+                self.assertEqual((counts['done'], counts['failed']), (2, 1))
+                texts = dict(ResumeText.objects.filter(seeker__in=seekers).values_list('seeker', 'text'))
+                self.assertEqual(texts[seekers[0].pk], 'Python developer, %d years.' % workers)
+                self.assertIn('Python and Django', texts[seekers[1].pk])
+                self.assertEqual(texts[seekers[2].pk], '')
@@ -0,0 +1,194 @@
+# jobs/trigrams.py
+"""
+Trigram index over job titles and locations for typo-tolerant search.
+
+Each active job stores the set of character trigrams of its title and
+location (JobTrigram rows), and JobTrigramFrequency counts the jobs
+having each trigram. A fuzzy query only has to look at the postings of
+its rarest trigrams to find every job that could match, counts how many
+of the query's trigrams those jobs share, and keeps the best
+MAX_CANDIDATES, so common trigrams ("  s", "er ") never mean scanning
+most of the index.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Job, JobTrigram, JobTrigramFrequency
+
+# Share of the query's trigrams a job must contain to count as a match
+MIN_SIMILARITY = 0.5
+
+# Most candidates a single fuzzy lookup returns
+MAX_CANDIDATES = 200
+
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def trigrams(text):
+    """
+    Character trigrams of each word, padded like PostgreSQL's pg_trgm:
+    "pune" -> {"  p", " pu", "pun", "une", "ne "}.
+    """
+    grams = set()
+    for word in WORD_RE.findall((text or '').lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _keys(title, location):
+    return {
+        (field, gram)
+        for field, text in (('title', title), ('location', location))
+        for gram in trigrams(text)
+    }
+
+
+def _rows(job_id, keys):
+    return [JobTrigram(job_id=job_id, field=field, trigram=gram) for field, gram in keys]
+
+
+def _count(deltas):
+    """
+    Apply {(field, trigram): change in job count} to the frequencies, one
+    UPDATE per field and distinct change.
+    """
+    JobTrigramFrequency.objects.bulk_create(
+        [JobTrigramFrequency(field=field, trigram=gram) for (field, gram), delta in deltas.items() if delta > 0],
+        ignore_conflicts=True,
+    )
+    grouped = defaultdict(list)
+    for (field, gram), delta in deltas.items():
+        if delta:
+            grouped[field, delta].append(gram)
+    for (field, delta), grams in grouped.items():
+        JobTrigramFrequency.objects.filter(field=field, trigram__in=grams).update(
+            job_count=F('job_count') + delta
+        )
+
+
+@transaction.atomic
+def index_job(job):
+    """
+    Replace a job's trigrams. Inactive jobs are dropped from the index.
+    """
+    old = set(JobTrigram.objects.filter(job_id=job.pk).values_list('field', 'trigram'))
+    new = _keys(job.title, job.location) if job.is_active else set()
+    if old == new:
+        return
+    JobTrigram.objects.filter(job_id=job.pk).delete()
+    JobTrigram.objects.bulk_create(_rows(job.pk, new))
+    _count({**dict.fromkeys(old - new, -1), **dict.fromkeys(new - old, 1)})
+
+
+@transaction.atomic
+def index_jobs(jobs, batch_size=2000):
+    """
+    index_job() for many jobs at once (bulk imports).
+    """
+    stored = JobTrigram.objects.filter(job_id__in=[job.pk for job in jobs])
+    deltas = Counter()
+    for field, gram in stored.values_list('field', 'trigram').iterator(chunk_size=batch_size):
+        deltas[field, gram] -= 1
+    stored.delete()
+    rows = []
+    for job in jobs:
+        if job.is_active:
+            keys = _keys(job.title, job.location)
+            deltas.update(keys)
+            rows.extend(_rows(job.pk, keys))
+    JobTrigram.objects.bulk_create(rows, batch_size=batch_size)
+    _count(deltas)
+
+
+@transaction.atomic
+def remove_job(job):
+    """
+    Drop a job about to be deleted from the frequencies; its rows go with
+    it.
+    """
+    keys = JobTrigram.objects.filter(job_id=job.pk).values_list('field', 'trigram')
+    _count(dict.fromkeys(keys, -1))
+
+
+@transaction.atomic
+def rebuild_index(batch_size=2000):
+    """
+    Recompute the trigram index and frequencies for all active jobs in bulk.
+    """
+    JobTrigram.objects.all().delete()
+    JobTrigramFrequency.objects.all().delete()
+    frequencies = Counter()
+    rows = []
+    jobs = Job.objects.filter(is_active=True).values_list('id', 'title', 'location').order_by('id')
+    for job_id, title, location in jobs.iterator(chunk_size=batch_size):
+        keys = _keys(title, location)
+        frequencies.update(keys)
+        rows.extend(_rows(job_id, keys))
+        if len(rows) >= batch_size * 10:
+            JobTrigram.objects.bulk_create(rows, batch_size=batch_size)
+            rows = []
+    JobTrigram.objects.bulk_create(rows, batch_size=batch_size)
+    JobTrigramFrequency.objects.bulk_create([
+        JobTrigramFrequency(field=field, trigram=gram, job_count=count)
+        for (field, gram), count in frequencies.items()
+    ], batch_size=batch_size)
+
+
+def similar_jobs(field, text, limit=MAX_CANDIDATES):
+    """
+    Return {job_id: similarity} for jobs whose field contains most of the
+    trigrams of text. Similarity is the share of the query's trigrams found
+    (like pg_trgm's word_similarity), so "Banglore" matches
+    "Bangalore, India".
+    """
+    grams = trigrams(text)
+    if not grams:
+        return {}
+
+    required = math.ceil(len(grams) * MIN_SIMILARITY)
+    frequencies = dict(JobTrigramFrequency.objects.filter(
+        field=field, trigram__in=grams, job_count__gt=0,
+    ).values_list('trigram', 'job_count'))
+    if len(frequencies) < required:
+        return {}
+    # A job missing all of the len(grams) - required + 1 rarest trigrams
+    # shares fewer than required, so only their postings need scanning
+    probes = sorted(grams, key=lambda gram: (frequencies.get(gram, 0), gram))[:len(grams) - required + 1]
+    candidates = JobTrigram.objects.filter(field=field, trigram__in=probes).values('job_id')
+
+    rows = JobTrigram.objects.filter(
+        field=field, trigram__in=grams, job_id__in=candidates,
+    ).values('job_id').annotate(
+        shared=Count('pk')
+    ).filter(
+        shared__gte=required
+    ).order_by('-shared', '-job_id')[:limit]
+
+    return {row['job_id']: row['shared'] / len(grams) for row in rows}
+
+
+def fuzzy_rank(search=None, location=None):
+    """
+    Rank jobs by title similarity to search and/or location similarity
+    to location. When both are given a job has to match both.
+    Returns job ids, best first.
+    """
+    matches = []
+    if search:
+        matches.append(similar_jobs('title', search))
+    if location:
+        matches.append(similar_jobs('location', location))
+    if not matches:
+        return []
+
+    job_ids = set(matches[0]).intersection(*matches[1:])
+    scores = {
+        job_id: sum(match[job_id] for match in matches) / len(matches)
+        for job_id in job_ids
+    }
+    return sorted(scores, key=lambda job_id: (-scores[job_id], -job_id))
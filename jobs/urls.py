@@ -7,6 +7,7 @@ app_name = 'jobs'
 urlpatterns = [
     # Job browsing (for job seekers)
     path('', views.job_list_view, name='job_list'),
+    path('autocomplete/', views.autocomplete_view, name='autocomplete'),
     path('<int:pk>/', views.job_detail_view, name='job_detail'),
     path('<int:pk>/apply/', views.apply_to_job, name='apply'),
     path('my-applications/', views.my_applications_view, name='my_applications'),
@@ -14,7 +15,11 @@ urlpatterns = [
     # Job posting (for employers)
     path('post/', views.post_job_view, name='post_job'),
     path('my-jobs/', views.my_jobs_view, name='my_jobs'),
+    path('my-jobs/applications/export/', views.export_employer_applications_view, name='export_employer_applications'),
     path('<int:pk>/edit/', views.edit_job_view, name='edit_job'),
     path('<int:pk>/delete/', views.delete_job_view, name='delete_job'),
     path('<int:pk>/applications/', views.job_applications_view, name='job_applications'),
+    path('<int:pk>/applications/export/', views.export_job_applications_view, name='export_job_applications'),
+    path('<int:pk>/applications/status/', views.bulk_application_status_view, name='bulk_application_status'),
+    path('<int:pk>/applications/<int:application_pk>/cover-letter/', views.application_cover_letter_view, name='application_cover_letter'),
 ]
\ No newline at end of file
@@ -1,80 +1,179 @@
 # jobs/views.py
+import hashlib
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.utils.http import urlencode
 from django.contrib import messages
+from django.contrib.messages import get_messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
-from .models import Job, Application
-from .forms import JobSearchForm, JobApplicationForm, JobPostForm
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Length
+from django.http import Http404, JsonResponse
+from django.utils.timesince import timesince
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
+from config.query_budget import query_budget
+from .models import Job, JobSearchDocument, Application
+from .forms import JobSearchForm, JobApplicationForm, JobPostForm, ApplicationStatusForm
+from .pagination import paginate_keyset, paginate_ranked
+from . import salaries, counters, review, exports, matching, documents, results, search
+from .cards import render_cards
+from .facets import get_facets
+from .autocomplete import autocomplete_index
+
+# Jobs shown per page on the public listing
+JOBS_PER_PAGE = 20
+
+# Result counts above this are shown as "1000+" instead of counted exactly
+JOB_COUNT_CAP = 1000
 
+# Applications shown per page when an employer reviews a job
+APPLICATIONS_PER_PAGE = 25
 
+
+@query_budget(16)  # one of them reads the search documents generation
 def job_list_view(request):
     """
     Display list of all active jobs with search and filter functionality.
     Available to all users (authenticated or not).
+    Reads only the denormalized JobSearchDocument table.
     """
-    # Get all active jobs
-    jobs = Job.objects.filter(is_active=True)
+    # One search document per active job
+    active_jobs = JobSearchDocument.objects.all()
     
     # Initialize search form
     form = JobSearchForm(request.GET or None)
     
-    # Apply filters if form is valid
-    if form.is_valid():
-        search_query = form.cleaned_data.get('search')
-        location = form.cleaned_data.get('location')
-        job_type = form.cleaned_data.get('job_type')
-        
-        # Search by title or description
-        if search_query:
-            jobs = jobs.filter(
-                Q(title__icontains=search_query) | 
-                Q(description__icontains=search_query)
-            )
-        
-        # Filter by location
-        if location:
-            jobs = jobs.filter(location__icontains=location)
-        
-        # Filter by job type
-        if job_type:
-            jobs = jobs.filter(job_type=job_type)
-    
-    # Order by most recent first
-    jobs = jobs.order_by('-created_at')
+    # Ordered matches and count of the search, cached until a job changes;
+    # pages are most recent first (cursor = last job shown) or best match
+    # first (cursor = position in the ranking)
+    generation = documents.generation()
+    result = results.search(form, active_jobs, JOB_COUNT_CAP, generation)
+    page = results.paginate(result, form, active_jobs, request.GET.get('cursor'), JOBS_PER_PAGE)
+    
+    # Salary distribution for the selected job type, read from the precomputed histogram
+    job_type = form.cleaned_data.get('job_type') if form.is_valid() else None
     
     context = {
-        'jobs': jobs,
+        'jobs': page.object_list,
+        # Card HTML, cached per job version
+        'cards': render_cards(page.object_list),
+        'page': page,
         'form': form,
-        'total_jobs': jobs.count(),
+        'facets': get_facets(form, active_jobs, generation),
+        'salary_histogram': salaries.histogram(job_type),
+        'total_jobs': result['total'],
+        'total_is_capped': result['capped'],
+        'fuzzy': result['fuzzy'],
     }
     
     return render(request, 'jobs/job_list.html', context)
 
 
+@require_GET
+@cache_control(public=True, max_age=60)
+@query_budget(3)
+def autocomplete_view(request):
+    """
+    JSON typeahead suggestions for the job search form.
+    Served from the in-memory autocomplete index, never the database.
+    """
+    field = request.GET.get('field', 'search')
+    prefix = request.GET.get('q', '')[:100]
+    
+    suggestions = []
+    if field in ('search', 'location'):
+        suggestions = autocomplete_index.suggest(field, prefix)
+    
+    return JsonResponse({'suggestions': suggestions})
+
+
+# Part of every job detail ETag; bump it when jobs/job_detail.html or base.html changes
+JOB_DETAIL_VERSION = 1
+
+
+def job_detail_validators(request, pk):
+    """
+    What the job detail page depends on, read with one narrow query (no
+    description or requirements) and kept on the request for the view:
+    the job's and its company's last changes, whether the visitor
+    applied, and who the visitor is. None if the job isn't listed.
+    """
+    if hasattr(request, '_job_detail_validators'):
+        return request._job_detail_validators
+    
+    user = request.user
+    seeker_id = user.pk if user.is_authenticated and user.user_type == 'job_seeker' else None
+    row = Job.objects.filter(pk=pk, is_active=True).annotate(
+        applied_at=Subquery(Application.objects.filter(
+            job=OuterRef('pk'), applicant_id=seeker_id,
+        ).values('applied_at')[:1]),
+    ).values('updated_at', 'created_at', 'employer__employerprofile__updated_at', 'applied_at').first()
+    
+    validators = None
+    if row is not None:
+        changes = [row['updated_at'], row['employer__employerprofile__updated_at'], row['applied_at']]
+        visitor = f'{user.pk}:{user.username}:{user.user_type}' if user.is_authenticated else 'anonymous'
+        parts = [
+            JOB_DETAIL_VERSION, pk, *changes, visitor,
+            # "Posted 3 days ago" changes with time alone
+            timesince(row['created_at']),
+        ]
+        validators = {
+            'has_applied': row['applied_at'] is not None,
+            'last_modified': max(change for change in changes if change is not None),
+            'etag': hashlib.md5('|'.join(map(str, parts)).encode(), usedforsecurity=False).hexdigest(),
+        }
+    request._job_detail_validators = validators
+    return validators
+
+
+def _job_detail_etag(request, pk):
+    validators = job_detail_validators(request, pk)
+    # Flashed messages are shown once, so the page must be rendered for them
+    if validators is None or get_messages(request):
+        return None
+    return validators['etag']
+
+
+def _job_detail_last_modified(request, pk):
+    validators = job_detail_validators(request, pk)
+    if validators is None or get_messages(request):
+        return None
+    return validators['last_modified']
+
+
+@cache_control(private=True, no_cache=True)
+@query_budget(4)
+@condition(etag_func=_job_detail_etag, last_modified_func=_job_detail_last_modified)
 def job_detail_view(request, pk):
     """
     Display detailed information about a specific job.
     Shows apply button for job seekers.
+    Repeat visits get a 304 Not Modified from the validators alone.
     """
-    job = get_object_or_404(Job, pk=pk, is_active=True)
+    validators = job_detail_validators(request, pk)
+    if validators is None:
+        raise Http404('No job found matching the query.')
     
-    # Check if user has already applied (if authenticated and job seeker)
-    has_applied = False
-    if request.user.is_authenticated and request.user.user_type == 'job_seeker':
-        has_applied = Application.objects.filter(
-            job=job,
-            applicant=request.user
-        ).exists()
+    job = get_object_or_404(
+        Job.objects.select_related('employer__employerprofile'),
+        pk=pk,
+        is_active=True,
+    )
     
     context = {
         'job': job,
-        'has_applied': has_applied,
+        # Whether the job seeker already applied, read with the validators
+        'has_applied': validators['has_applied'],
     }
     
     return render(request, 'jobs/job_detail.html', context)
 
 
 @login_required
+@query_budget(8)
 def apply_to_job(request, pk):
     """
     Job application view - job seekers apply to a job with cover letter.
@@ -86,7 +185,11 @@ def apply_to_job(request, pk):
         return redirect('jobs:job_detail', pk=pk)
     
     # Get the job
-    job = get_object_or_404(Job, pk=pk, is_active=True)
+    job = get_object_or_404(
+        Job.objects.select_related('employer__employerprofile'),
+        pk=pk,
+        is_active=True,
+    )
     
     # Check if already applied
     existing_application = Application.objects.filter(
@@ -116,6 +219,7 @@ def apply_to_job(request, pk):
 
 
 @login_required
+@query_budget(3)
 def my_applications_view(request):
     """
     Display all applications submitted by the logged-in job seeker.
@@ -129,7 +233,7 @@ def my_applications_view(request):
     # Get all applications by this user
     applications = Application.objects.filter(
         applicant=request.user
-    ).select_related('job', 'job__employer').order_by('-applied_at')
+    ).select_related('job', 'job__employer__employerprofile').order_by('-applied_at')
     
     context = {
         'applications': applications,
@@ -139,6 +243,7 @@ def my_applications_view(request):
 
 
 @login_required
+@query_budget(45)
 def post_job_view(request):
     """
     Job posting view - employers create new job listings.
@@ -166,6 +271,7 @@ def post_job_view(request):
 
 
 @login_required
+@query_budget(3)
 def my_jobs_view(request):
     """
     Display all jobs posted by the logged-in employer.
@@ -176,13 +282,9 @@ def my_jobs_view(request):
         messages.error(request, 'Only employers can view posted jobs.')
         return redirect('users:dashboard')
     
-    # Get all jobs posted by this employer
+    # Get all jobs posted by this employer (application counts are stored on each job)
     jobs = Job.objects.filter(employer=request.user).order_by('-created_at')
     
-    # Get application counts for each job
-    for job in jobs:
-        job.application_count = Application.objects.filter(job=job).count()
-    
     context = {
         'jobs': jobs,
     }
@@ -191,6 +293,7 @@ def my_jobs_view(request):
 
 
 @login_required
+@query_budget(45)
 def edit_job_view(request, pk):
     """
     Edit an existing job posting.
@@ -205,7 +308,7 @@ def edit_job_view(request, pk):
         return redirect('jobs:job_detail', pk=pk)
     
     # Check if user owns this job
-    if job.employer != request.user:
+    if job.employer_id != request.user.pk:
         messages.error(request, 'You can only edit your own job postings.')
         return redirect('jobs:job_detail', pk=pk)
     
@@ -228,6 +331,7 @@ def edit_job_view(request, pk):
 
 
 @login_required
+@query_budget(45)
 def delete_job_view(request, pk):
     """
     Delete a job posting.
@@ -242,7 +346,7 @@ def delete_job_view(request, pk):
         return redirect('jobs:job_detail', pk=pk)
     
     # Check if user owns this job
-    if job.employer != request.user:
+    if job.employer_id != request.user.pk:
         messages.error(request, 'You can only delete your own job postings.')
         return redirect('jobs:job_detail', pk=pk)
     
@@ -260,6 +364,7 @@ def delete_job_view(request, pk):
 
 
 @login_required
+@query_budget(10)
 def job_applications_view(request, pk):
     """
     View all applications for a specific job.
@@ -274,18 +379,172 @@ def job_applications_view(request, pk):
         return redirect('jobs:job_detail', pk=pk)
     
     # Check if user owns this job
-    if job.employer != request.user:
+    if job.employer_id != request.user.pk:
         messages.error(request, 'You can only view applications for your own job postings.')
         return redirect('jobs:job_detail', pk=pk)
     
-    # Get all applications for this job
-    applications = Application.objects.filter(job=job).select_related(
+    # Optional status filter; unknown values show every application
+    status = request.GET.get('status')
+    if status not in dict(Application.STATUS_CHOICES):
+        status = None
+    
+    applications = Application.objects.filter(job=job)
+    if status:
+        applications = applications.filter(status=status)
+    
+    # Optional search of the applicants' resume text (see jobs/resumes.py)
+    query = request.GET.get('q', '').strip()
+    if query:
+        applications = search.search_resumes(applications, query)
+    
+    # Cover letters stay in the database until expanded (see application_cover_letter_view)
+    applications = applications.select_related(
         'applicant', 'applicant__jobseekerprofile'
-    ).order_by('-applied_at')
+    ).defer('cover_letter').annotate(cover_letter_length=Length('cover_letter'))
+    
+    sort = 'match' if request.GET.get('sort') == 'match' else 'recent'
+    cursor = request.GET.get('cursor')
+    if sort == 'match':
+        # Best skills match first, every applicant scored in one pass (cursor = position)
+        ranked = matching.rank_applications(job, applications)
+        page = paginate_ranked(applications, [application_id for application_id, _ in ranked], cursor, APPLICATIONS_PER_PAGE)
+        scores = dict(ranked)
+    else:
+        # Most recent first, one page at a time (cursor = last application shown)
+        page = paginate_keyset(applications, cursor, APPLICATIONS_PER_PAGE, fields=('applied_at', 'id'))
+        scores = matching.score_applicants(
+            job, [(application.pk, application.applicant_id) for application in page]
+        )
+    for application in page:
+        application.match_percent = round(100 * scores.get(application.pk, 0))
+    
+    # Per-status totals come from the job's stored counters
+    status_filters = [
+        {'value': value, 'label': label, 'count': getattr(job, counters.status_field(value))}
+        for value, label in Application.STATUS_CHOICES
+    ]
+    
+    # Size of the current filter, for the bulk "move all" option (not offered for resume searches)
+    filtered_count = getattr(job, counters.status_field(status)) if status else job.application_count
+    if query:
+        filtered_count = None
     
     context = {
         'job': job,
-        'applications': applications,
+        'applications': page.object_list,
+        'page': page,
+        'status': status,
+        'query': query,
+        'sort': sort,
+        'status_filters': status_filters,
+        'filtered_count': filtered_count,
+        'status_form': ApplicationStatusForm(initial={'current_status': status}),
     }
     
-    return render(request, 'jobs/job_applications.html', context)
\ No newline at end of file
+    return render(request, 'jobs/job_applications.html', context)
+
+
+@login_required
+@query_budget(2)
+def application_cover_letter_view(request, pk, application_pk):
+    """
+    HTML fragment with one application's cover letter, loaded when the
+    employer expands it on the applications page.
+    """
+    application = get_object_or_404(
+        Application.objects.only('id', 'job_id', 'cover_letter'),
+        pk=application_pk, job_id=pk, job__employer_id=request.user.pk,
+    )
+    return render(request, 'jobs/_cover_letter.html', {'application': application})
+
+
+@login_required
+@require_POST
+@query_budget(8)
+def bulk_application_status_view(request, pk):
+    """
+    Change the status of many applications for a job with one UPDATE.
+    Only accessible to the employer who posted the job.
+    """
+    job = get_object_or_404(Job.objects.only('id', 'employer_id'), pk=pk)
+    
+    # Check if user owns this job
+    if job.employer_id != request.user.pk:
+        messages.error(request, 'You can only update applications for your own job postings.')
+        return redirect('jobs:job_detail', pk=pk)
+    
+    form = ApplicationStatusForm(request.POST)
+    if form.is_valid():
+        status = form.cleaned_data['status']
+        updated = review.bulk_update_status(
+            job, status,
+            application_ids=form.selected_ids(),
+            current_status=form.cleaned_data['current_status'],
+        )
+        label = dict(Application.STATUS_CHOICES)[status]
+        messages.success(request, f'{updated} application{"" if updated == 1 else "s"} moved to {label}.')
+    else:
+        messages.error(request, ' '.join(form.non_field_errors()) or 'Invalid status change.')
+    
+    # Back to the same status filter
+    url = reverse('jobs:job_applications', args=[pk])
+    if form.is_valid() and form.cleaned_data['current_status']:
+        url += '?' + urlencode({'status': form.cleaned_data['current_status']})
+    return redirect(url)
+
+
+def _export_options(request):
+    """
+    Export format and optional status filter from the query string.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.FORMATS:
+        export_format = 'csv'
+    status = request.GET.get('status')
+    if status not in dict(Application.STATUS_CHOICES):
+        status = None
+    return export_format, status
+
+
+@login_required
+@require_GET
+@query_budget(2)
+def export_job_applications_view(request, pk):
+    """
+    Download a job's applications with applicant profiles as CSV or JSONL.
+    Only accessible to the employer who posted the job.
+    The rows are queried while the response streams, outside the budget.
+    """
+    job = get_object_or_404(Job.objects.only('id', 'employer_id'), pk=pk)
+    
+    # Check if user owns this job
+    if job.employer_id != request.user.pk:
+        messages.error(request, 'You can only export applications for your own job postings.')
+        return redirect('jobs:job_detail', pk=pk)
+    
+    export_format, status = _export_options(request)
+    applications = Application.objects.filter(job=job)
+    if status:
+        applications = applications.filter(status=status)
+    
+    return exports.export_response(applications, export_format, f'job-{job.pk}-applications')
+
+
+@login_required
+@require_GET
+@query_budget(1)
+def export_employer_applications_view(request):
+    """
+    Download the applications to all of the employer's jobs as CSV or JSONL.
+    Only accessible to employers.
+    """
+    if request.user.user_type != 'employer':
+        messages.error(request, 'Only employers can export applications.')
+        return redirect('users:dashboard')
+    
+    export_format, status = _export_options(request)
+    applications = Application.objects.filter(job__employer=request.user)
+    if status:
+        applications = applications.filter(status=status)
+    
+    return exports.export_response(applications, export_format, 'applications')
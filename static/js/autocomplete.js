@@ -0,0 +1,60 @@
+// static/js/autocomplete.js
+// Typeahead for inputs with a data-autocomplete attribute. Suggestions are
+// fetched from the endpoint in data-autocomplete-url and shown in the
+// input's <datalist>.
+(function () {
+    var DELAY_MS = 150;
+
+    document.querySelectorAll('input[data-autocomplete]').forEach(function (input) {
+        var list = input.list;
+        var url = input.form && input.form.dataset.autocompleteUrl;
+        if (!list || !url) {
+            return;
+        }
+
+        var timer = null;
+        var controller = null;
+        var cache = {};
+
+        function render(suggestions) {
+            list.replaceChildren();
+            suggestions.forEach(function (suggestion) {
+                var option = document.createElement('option');
+                option.value = suggestion.value;
+                if (suggestion.type === 'company') {
+                    option.label = 'Company';
+                }
+                list.appendChild(option);
+            });
+        }
+
+        function lookup(prefix) {
+            if (cache[prefix]) {
+                render(cache[prefix]);
+                return;
+            }
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            var query = new URLSearchParams({field: input.dataset.autocomplete, q: prefix});
+            fetch(url + '?' + query, {signal: controller.signal})
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    cache[prefix] = data.suggestions;
+                    render(data.suggestions);
+                })
+                .catch(function () {});
+        }
+
+        input.addEventListener('input', function () {
+            var prefix = input.value.trim();
+            clearTimeout(timer);
+            if (!prefix) {
+                render([]);
+                return;
+            }
+            timer = setTimeout(function () { lookup(prefix); }, DELAY_MS);
+        });
+    });
+})();
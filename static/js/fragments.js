@@ -0,0 +1,35 @@
+// static/js/fragments.js
+// Lazy <details> sections: the first time a <details data-fragment-url>
+// is opened, the HTML fragment at that URL replaces the contents of its
+// [data-fragment-target] element. Without JavaScript the target keeps a
+// plain link to the fragment.
+(function () {
+    document.querySelectorAll('details[data-fragment-url]').forEach(function (details) {
+        var target = details.querySelector('[data-fragment-target]');
+        if (!target) {
+            return;
+        }
+
+        var loaded = false;
+        details.addEventListener('toggle', function () {
+            if (!details.open || loaded) {
+                return;
+            }
+            loaded = true;
+            fetch(details.dataset.fragmentUrl, {credentials: 'same-origin'})
+                .then(function (response) {
+                    if (!response.ok) {
+                        throw new Error(response.status);
+                    }
+                    return response.text();
+                })
+                .then(function (html) {
+                    target.innerHTML = html;
+                })
+                .catch(function () {
+                    // Keep the fallback link and try again next time
+                    loaded = false;
+                });
+        });
+    });
+})();
@@ -0,0 +1,153 @@
+# users/downloads.py
+"""
+Resume file responses for the permission-checked download view.
+
+Responses carry an ETag (the content hash for content-addressed files,
+see users/storage.py) and Last-Modified, so a browser that already has
+the file gets a 304 without a byte being read. Single byte ranges are
+answered with 206 Partial Content, which lets PDF viewers fetch the
+pages they display first.
+
+Files are served one of two ways:
+
+- By the web server (settings.RESUME_SENDFILE): Django checks access
+  and answers conditional requests, then hands the file over with
+  X-Accel-Redirect (nginx) or X-Sendfile (Apache, lighttpd), so the
+  application worker is free before the first byte is sent.
+- By Django: the open file is given to FileResponse, which WSGI servers
+  with wsgi.file_wrapper (e.g. gunicorn) send with sendfile(2) straight
+  from the page cache to the socket.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CONTENT_ADDRESS_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# Clients must revalidate, and shared caches must not keep a copy
+CACHE_CONTROL = 'private, no-cache'
+
+
+class FileRange:
+    """
+    At most length bytes of an open file from its current position. It
+    keeps fileno() so a server's sendfile(2) support (which stops at the
+    Content-Length) still applies to the slice.
+    """
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def etag_for(name, stat):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if CONTENT_ADDRESS_RE.match(stem):
+        return f'"{stem}"'
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def byte_range(header, size):
+    """
+    (first, last) byte of a single-range Range header, None to send the
+    whole file (no header, several ranges or a syntax error), or False if
+    the range lies outside the file.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # The last N bytes; an empty file has none to send
+        suffix = int(last)
+        if not suffix or not size:
+            return False
+        return max(size - suffix, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first > last:
+        return False if first >= size else None
+    return first, last
+
+
+def serve(request, storage, name, filename):
+    """
+    Response sending the stored file name inline as filename.
+    """
+    try:
+        path = storage.path(name)
+        stat = os.stat(path)
+    except (FileNotFoundError, ValueError):
+        raise Http404('Resume file not found.')
+
+    etag = etag_for(name, stat)
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        if getattr(settings, 'RESUME_SENDFILE', None):
+            response = _offload(path, name, content_type)
+        else:
+            response = _file_response(request, path, stat.st_size, etag, content_type)
+        response['Content-Disposition'] = f"inline; filename*=UTF-8''{quote(filename)}"
+        response['Last-Modified'] = http_date(stat.st_mtime)
+    response['ETag'] = etag
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def _offload(path, name, content_type):
+    response = HttpResponse(content_type=content_type)
+    if settings.RESUME_SENDFILE == 'nginx':
+        # nginx answers Range requests for internal redirects itself
+        url = getattr(settings, 'RESUME_SENDFILE_URL', '/protected-media/')
+        response['X-Accel-Redirect'] = url + quote(name)
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def _file_response(request, path, size, etag, content_type):
+    # A Range only applies if the client's copy (If-Range) is still current
+    requested = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if request.method != 'GET' or (if_range and if_range != etag):
+        requested = None
+    span = byte_range(requested, size)
+
+    if span is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    file = open(path, 'rb')
+    if span is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        first, last = span
+        file.seek(first)
+        response = FileResponse(FileRange(file, last - first + 1), content_type=content_type, status=206)
+        response['Content-Range'] = f'bytes {first}-{last}/{size}'
+        response['Content-Length'] = last - first + 1
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -162,7 +162,7 @@ class JobSeekerProfileEditForm(forms.ModelForm):
         model = JobSeekerProfile
         fields = ['resume', 'skills', 'experience_years', 'education']
         widgets = {
-            'resume': forms.FileInput(attrs={'class': 'form-control'}),
+            'resume': forms.FileInput(attrs={'class': 'form-control', 'accept': '.pdf,.docx,.txt'}),
             'skills': forms.Textarea(attrs={
                 'class': 'form-control',
                 'placeholder': 'e.g., Python, Django, JavaScript, React...',
@@ -0,0 +1,33 @@
+# users/management/commands/clean_resume_files.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from users import storage
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete resume files no job seeker profile has used for the grace '
+        'period: replaced or removed uploads, and files left over from '
+        'before content-addressed storage. Run it from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float,
+            default=storage.ORPHAN_GRACE_PERIOD.total_seconds() / 3600,
+            help='Keep unused files this many hours before deleting them.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted.')
+
+    def handle(self, *args, **options):
+        deleted, freed = storage.clean(
+            grace_period=timedelta(hours=options['grace_hours']),
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} unused resume files ({freed / (1024 * 1024):.1f} MiB).'
+        ))
@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:15
+
+import users.storage
+from django.db import migrations, models
+
+
+def count_resume_references(apps, schema_editor):
+    from django.db.models import Count
+
+    JobSeekerProfile = apps.get_model("users", "JobSeekerProfile")
+    ResumeFile = apps.get_model("users", "ResumeFile")
+    ResumeFile.objects.bulk_create(
+        [
+            ResumeFile(name=row["resume"], references=row["references"])
+            for row in JobSeekerProfile.objects.exclude(resume="")
+            .order_by()
+            .values("resume")
+            .annotate(references=Count("pk"))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="jobseekerprofile",
+            name="resume",
+            field=models.FileField(
+                blank=True, storage=users.storage.ResumeStorage(), upload_to="resumes/"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ResumeFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("sha256", models.CharField(blank=True, max_length=64)),
+                ("size", models.PositiveBigIntegerField(default=0)),
+                ("references", models.PositiveIntegerField(default=0)),
+                ("released_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "resume_files",
+                "indexes": [
+                    models.Index(
+                        fields=["references", "released_at"],
+                        name="resume_files_unused_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(count_resume_references, migrations.RunPython.noop),
+    ]
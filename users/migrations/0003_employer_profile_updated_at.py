@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_resume_files"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employerprofile",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
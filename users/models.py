@@ -1,6 +1,7 @@
 # users/models.py
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from .storage import resume_storage
 
 class User(AbstractUser):
     USER_TYPES = (
@@ -16,19 +17,47 @@ class User(AbstractUser):
 
 class JobSeekerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    resume = models.FileField(upload_to='resumes/', blank=True)
+    resume = models.FileField(upload_to='resumes/', storage=resume_storage, blank=True)
     skills = models.TextField(blank=True)
     experience_years = models.IntegerField(default=0)
     education = models.CharField(max_length=200, blank=True)
     
     class Meta:
         db_table = 'job_seeker_profiles'
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored values so a save can release the resume file it replaces
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
 class EmployerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     company_name = models.CharField(max_length=200)
     company_description = models.TextField(blank=True)
     website = models.URLField(blank=True)
+    # Lets cached job pages tell when the company details they show changed
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'employer_profiles'
+
+class ResumeFile(models.Model):
+    """
+    A file in the content-addressed resume storage (users/storage.py) and
+    the number of profiles using it. Unused files are deleted by the
+    clean_resume_files command once released_at is old enough.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    sha256 = models.CharField(max_length=64, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+    references = models.PositiveIntegerField(default=0)
+    released_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'resume_files'
+        indexes = [
+            # Finds files to clean up
+            models.Index(fields=['references', 'released_at'], name='resume_files_unused_idx'),
+        ]
@@ -0,0 +1,36 @@
+# users/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import JobSeekerProfile
+from . import storage
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+def count_resume_references(sender, instance, created, **kwargs):
+    """
+    Keep the reference counts of resume files in step with the profiles
+    using them, so replaced resumes can be cleaned up.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    new_name = instance.resume.name or ''
+    if created:
+        old_name = ''
+    elif 'resume' in loaded:
+        old_name = loaded['resume'] or ''
+    else:
+        # Not loaded from the database, so the replaced file is unknown;
+        # clean_resume_files still keeps every file a profile points at
+        old_name = new_name
+    if old_name != new_name:
+        if new_name:
+            storage.retain(new_name)
+        if old_name:
+            storage.release(old_name)
+    loaded['resume'] = new_name
+    instance._loaded_values = loaded
+
+
+@receiver(post_delete, sender=JobSeekerProfile)
+def release_resume(sender, instance, **kwargs):
+    if instance.resume.name:
+        storage.release(instance.resume.name)
@@ -0,0 +1,227 @@
+# users/storage.py
+"""
+Content-addressed storage for uploaded resumes.
+
+An upload is copied to a temporary file in chunks while its SHA-256 is
+computed, then moved to <upload_to>/<first two hex digits>/<hash>.<ext>.
+Uploading a file that is already stored keeps the existing copy, so each
+distinct resume is on disk once however often it is uploaded. Large
+uploads never sit in memory: Django spools them to a temporary file and
+they are read back FILE_CHUNK_SIZE bytes at a time.
+
+Every stored file has a ResumeFile row counting the profiles that use it
+(see users/signals.py). Files nobody has used for ORPHAN_GRACE_PERIOD are
+deleted by the clean_resume_files command.
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+from datetime import datetime, timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Unused files are kept this long, so an upload that is about to be
+# referenced (or a profile save that failed halfway) doesn't lose its file
+ORPHAN_GRACE_PERIOD = timedelta(days=1)
+
+# Prefix of the temporary files uploads are written to before being named
+TEMPORARY_PREFIX = '.upload-'
+
+
+@deconstructible
+class ResumeStorage(FileSystemStorage):
+    """
+    FileSystemStorage that names files by the hash of their content.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name depends on the content, see _save()
+        return name
+
+    def _save(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        os.makedirs(self.path(directory), exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.path(directory), prefix=TEMPORARY_PREFIX)
+        try:
+            with os.fdopen(descriptor, 'wb') as temporary:
+                for chunk in content.chunks(FILE_CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    temporary.write(chunk)
+
+            sha256 = digest.hexdigest()
+            name = posixpath.join(directory, sha256[:2], sha256 + extension)
+            path = self.path(name)
+            # The row stays locked until the file is in place, so clean()
+            # can't delete the copy this upload is about to reuse
+            with transaction.atomic(savepoint=False):
+                stored(name, sha256, size)
+                if os.path.exists(path):
+                    # Already stored; the copy on disk is identical
+                    os.remove(temporary_path)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(temporary_path, self.file_permissions_mode)
+                    os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return name
+
+
+resume_storage = ResumeStorage()
+
+
+def stored(name, sha256, size):
+    """
+    Record a file being written to storage, locking its row until the
+    transaction ends. Its grace period starts over, so a duplicate upload
+    keeps an unused copy from being cleaned up under it.
+    """
+    from .models import ResumeFile
+
+    ResumeFile.objects.bulk_create(
+        [ResumeFile(name=name, sha256=sha256, size=size, released_at=timezone.now())],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['released_at'],
+    )
+
+
+def retain(name):
+    """
+    Count one more profile using the file.
+    """
+    from .models import ResumeFile
+
+    if not ResumeFile.objects.filter(name=name).update(references=F('references') + 1):
+        # A file stored before its row existed (e.g. an older upload)
+        ResumeFile.objects.bulk_create([ResumeFile(name=name)], ignore_conflicts=True)
+        ResumeFile.objects.filter(name=name).update(references=F('references') + 1)
+
+
+def release(name):
+    """
+    Count one profile fewer using the file.
+    """
+    from .models import ResumeFile
+
+    ResumeFile.objects.filter(name=name, references__gt=0).update(
+        references=F('references') - 1, released_at=timezone.now(),
+    )
+
+
+def clean(directory='resumes', grace_period=ORPHAN_GRACE_PERIOD, batch_size=500, dry_run=False):
+    """
+    Delete files no profile has used for grace_period: files in directory
+    that have no row and no profile pointing at them (uploads from before
+    content addressing, leftover temporary files) and unreferenced
+    ResumeFile rows. Returns (files deleted, bytes freed).
+    """
+    from .models import JobSeekerProfile, ResumeFile
+
+    cutoff = timezone.now() - grace_period
+    deleted = 0
+    freed = 0
+
+    # Files on disk nothing knows about get a row, so they are deleted
+    # below under the same lock as every other file
+    root = resume_storage.path(directory)
+    for batch in _old_files(root, cutoff.timestamp(), batch_size):
+        names = {
+            posixpath.join(directory, *os.path.relpath(path, root).split(os.sep)): modified
+            for path, modified in batch
+        }
+        known = set(ResumeFile.objects.filter(name__in=list(names)).values_list('name', flat=True))
+        known.update(JobSeekerProfile.objects.filter(resume__in=list(names)).values_list('resume', flat=True))
+        unknown = [name for name in names if name not in known]
+        if dry_run:
+            for name in unknown:
+                freed += _delete(name, dry_run)
+                deleted += 1
+        else:
+            ResumeFile.objects.bulk_create([
+                ResumeFile(name=name, released_at=datetime.fromtimestamp(names[name], cutoff.tzinfo))
+                for name in unknown
+            ], ignore_conflicts=True)
+
+    # Unreferenced rows, a batch at a time in primary key order. The files
+    # go in the transaction that deletes their rows: an upload of the same
+    # content waits for the row lock, then finds no file and writes its own.
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(ResumeFile.objects.select_for_update().filter(
+                pk__gt=last_pk, references=0, released_at__lt=cutoff,
+            ).order_by('pk').values_list('pk', 'name')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            # Never delete a file a profile points at, whatever its count says
+            in_use = set(JobSeekerProfile.objects.filter(
+                resume__in=[name for _, name in batch]
+            ).values_list('resume', flat=True))
+            unused = [(pk, name) for pk, name in batch if name not in in_use]
+            if not dry_run:
+                # Recheck the counts under the lock: rows used or stored
+                # again since they were read stay, with their files
+                ResumeFile.objects.filter(
+                    pk__in=[pk for pk, _ in unused], references=0, released_at__lt=cutoff,
+                ).delete()
+                kept = set(ResumeFile.objects.filter(
+                    pk__in=[pk for pk, _ in unused]
+                ).values_list('pk', flat=True))
+                unused = [(pk, name) for pk, name in unused if pk not in kept]
+            for _, name in unused:
+                freed += _delete(name, dry_run)
+                deleted += 1
+    return deleted, freed
+
+
+def _delete(name, dry_run):
+    """
+    Remove a stored file; returns its size (0 if it was already gone).
+    """
+    try:
+        size = resume_storage.size(name)
+    except FileNotFoundError:
+        return 0
+    if not dry_run:
+        resume_storage.delete(name)
+    return size
+
+
+def _old_files(root, cutoff, batch_size):
+    """
+    Yield lists of up to batch_size (path, modification timestamp) pairs
+    for the files under root last modified before cutoff (a timestamp).
+    """
+    batch = []
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            try:
+                modified = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if modified >= cutoff:
+                continue
+            batch.append((path, modified))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
@@ -1,3 +1,257 @@
-from django.test import TestCase
+# users/tests.py
+"""
+Requests every view in users/views.py with a realistic amount of data, so
+a view running more queries than its @query_budget fails here (see
+config/test_settings.py), and checks the Range header parsing of resume
+downloads and the content-addressed resume storage.
+"""
+import os
+import shutil
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Application, Job
+
+from . import storage
+from .downloads import byte_range
+from .models import EmployerProfile, JobSeekerProfile, ResumeFile, User
+
+JOB_COUNT = 20
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class UserViewQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            'acme', password='password', user_type='employer', first_name='Ada', email='ada@acme.test'
+        )
+        EmployerProfile.objects.create(user=cls.employer, company_name='Acme Corp', website='https://acme.test')
+        cls.seeker = User.objects.create_user(
+            'sam', password='password', user_type='job_seeker',
+            first_name='Sam', last_name='Seeker', email='sam@example.test',
+        )
+        JobSeekerProfile.objects.create(
+            user=cls.seeker, skills='python, django, sql', experience_years=4, education='BSc'
+        )
+        jobs = [
+            Job.objects.create(
+                employer=cls.employer,
+                title=f'Python Developer {index}',
+                description='Build and run the backend services behind our products.',
+                requirements='python django',
+                location='Remote',
+                job_type='full_time',
+            )
+            for index in range(JOB_COUNT)
+        ]
+        for job in jobs[:5]:
+            Application.objects.create(job=job, applicant=cls.seeker, cover_letter='Hello!')
+
+    def setUp(self):
+        for alias in ('default', 'job_cards'):
+            caches[alias].clear()
+
+    def test_home(self):
+        self.assertEqual(self.client.get(reverse('home')).status_code, 200)
+
+    def test_register_job_seeker(self):
+        url = reverse('users:register_job_seeker')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {
+            'username': 'newseeker',
+            'email': 'new@example.test',
+            'first_name': 'New',
+            'last_name': 'Seeker',
+            'password1': 'a-long-Passphrase-42',
+            'password2': 'a-long-Passphrase-42',
+        })
+        self.assertRedirects(response, reverse('users:login'), fetch_redirect_response=False)
+
+    def test_register_employer(self):
+        url = reverse('users:register_employer')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {
+            'username': 'globex',
+            'email': 'hr@globex.test',
+            'first_name': 'Hank',
+            'last_name': 'Scorpio',
+            'company_name': 'Globex',
+            'password1': 'a-long-Passphrase-42',
+            'password2': 'a-long-Passphrase-42',
+        })
+        self.assertRedirects(response, reverse('users:login'), fetch_redirect_response=False)
+
+    def test_login_logout(self):
+        url = reverse('users:login')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {'username': 'sam', 'password': 'password'})
+        self.assertRedirects(response, reverse('users:dashboard'), fetch_redirect_response=False)
+
+        response = self.client.get(reverse('users:logout'))
+        self.assertRedirects(response, reverse('home'), fetch_redirect_response=False)
+
+    def test_profile(self):
+        for user in (self.seeker, self.employer):
+            self.client.force_login(user)
+            self.assertEqual(self.client.get(reverse('users:profile')).status_code, 200)
+
+    def test_profile_edit(self):
+        self.client.force_login(self.seeker)
+        url = reverse('users:profile_edit')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        response = self.client.post(url, {
+            'first_name': 'Sam',
+            'last_name': 'Seeker',
+            'email': 'sam@example.test',
+            'skills': 'python, django, sql, aws',
+            'experience_years': 5,
+            'education': 'BSc',
+            'resume': SimpleUploadedFile('resume.txt', b'Python developer with five years of Django.'),
+        })
+        self.assertRedirects(response, reverse('users:profile'), fetch_redirect_response=False)
+
+        self.client.force_login(self.employer)
+        response = self.client.post(url, {
+            'first_name': 'Ada',
+            'last_name': 'Lovelace',
+            'email': 'ada@acme.test',
+            'company_name': 'Acme Corporation',
+            'company_description': 'Rockets and anvils.',
+            'website': 'https://acme.test',
+        })
+        self.assertRedirects(response, reverse('users:profile'), fetch_redirect_response=False)
+
+    def test_resume_download(self):
+        self.client.force_login(self.seeker)
+        response = self.client.post(reverse('users:profile_edit'), {
+            'first_name': 'Sam',
+            'last_name': 'Seeker',
+            'email': 'sam@example.test',
+            'skills': 'python',
+            'experience_years': 4,
+            'resume': SimpleUploadedFile('resume.txt', b'Python developer with five years of Django.'),
+        })
+        self.assertEqual(response.status_code, 302)
+        url = reverse('users:resume_download', args=[self.seeker.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        # An employer the seeker applied to
+        self.client.force_login(self.employer)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'Python developer with five years of Django.')
+
+    def test_dashboard(self):
+        for user in (self.seeker, self.employer):
+            self.client.force_login(user)
+            # The first visit builds the employer's stats row, later ones read it
+            for _ in range(2):
+                self.assertEqual(self.client.get(reverse('users:dashboard')).status_code, 200)
+
+
+class ByteRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(byte_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(byte_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(byte_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(byte_range('bytes=-5000', 1000), (0, 999))
+        self.assertIsNone(byte_range(None, 1000))
+        self.assertIsNone(byte_range('bytes=0-1,5-9', 1000))
+
+    def test_unsatisfiable(self):
+        self.assertIs(byte_range('bytes=1000-', 1000), False)
+        self.assertIs(byte_range('bytes=-0', 1000), False)
+        # An empty file has no bytes to send for any range
+        self.assertIs(byte_range('bytes=-100', 0), False)
+        self.assertIs(byte_range('bytes=0-', 0), False)
+
+
+class ResumeStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='resume-storage-test-')
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def make_profile(self, username, content):
+        user = User.objects.create_user(username, user_type='job_seeker')
+        return JobSeekerProfile.objects.create(user=user, resume=SimpleUploadedFile('cv.txt', content))
+
+    def references(self, name):
+        return ResumeFile.objects.get(name=name).references
+
+    def exists(self, name):
+        return storage.resume_storage.exists(name)
+
+    def test_duplicates_share_a_file(self):
+        first = self.make_profile('first', b'Python developer')
+        second = self.make_profile('second', b'Python developer')
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertRegex(first.resume.name, r'^resumes/[0-9a-f]{2}/[0-9a-f]{64}\.txt$')
+        self.assertEqual(self.references(first.resume.name), 2)
+        self.assertEqual(len(os.listdir(os.path.dirname(first.resume.path))), 1)
+
+    def test_replace_and_delete_release(self):
+        first = self.make_profile('first', b'Python developer')
+        second = self.make_profile('second', b'Python developer')
+        shared = first.resume.name
+
+        first = JobSeekerProfile.objects.get(pk=first.pk)
+        first.resume = SimpleUploadedFile('cv.txt', b'Django developer')
+        first.save()
+        self.assertEqual(self.references(shared), 1)
+        self.assertEqual(self.references(first.resume.name), 1)
+
+        JobSeekerProfile.objects.get(pk=second.pk).delete()
+        self.assertEqual(self.references(shared), 0)
+        self.assertIsNotNone(ResumeFile.objects.get(name=shared).released_at)
+
+    def test_clean(self):
+        used = self.make_profile('used', b'Python developer')
+        replaced = self.make_profile('replaced', b'Django developer')
+        old_name = replaced.resume.name
+        replaced = JobSeekerProfile.objects.get(pk=replaced.pk)
+        replaced.resume = SimpleUploadedFile('cv.txt', b'Senior Django developer')
+        replaced.save()
+        # A file from before content addressing, with no row
+        legacy = storage.resume_storage.save('resumes/legacy.txt', SimpleUploadedFile('x', b'old'))
+        ResumeFile.objects.filter(name=legacy).delete()
+        past = (timezone.now() - timedelta(days=2)).timestamp()
+        os.utime(storage.resume_storage.path(legacy), (past, past))
+
+        # Still within the grace period
+        self.assertEqual(storage.clean(), (1, 3))
+        self.assertTrue(self.exists(old_name))
+
+        self.assertEqual(storage.clean(grace_period=timedelta(0), dry_run=True), (1, 16))
+        self.assertTrue(self.exists(old_name))
+        self.assertEqual(storage.clean(grace_period=timedelta(0)), (1, 16))
+        self.assertFalse(self.exists(old_name))
+        self.assertFalse(self.exists(legacy))
+        self.assertFalse(ResumeFile.objects.filter(name=old_name).exists())
+        for profile in (used, replaced):
+            self.assertTrue(self.exists(profile.resume.name))
+
+    def test_clean_keeps_files_stored_again(self):
+        profile = self.make_profile('seeker', b'Python developer')
+        name = profile.resume.name
+        profile.delete()
+        ResumeFile.objects.filter(name=name).update(released_at=timezone.now() - timedelta(days=2))
+
+        # The same resume uploaded again restarts the grace period
+        self.make_profile('again', b'Python developer').delete()
+        self.assertEqual(storage.clean(), (0, 0))
+        self.assertTrue(self.exists(name))
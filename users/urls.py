@@ -11,5 +11,6 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.profile_view, name='profile'),
     path('profile/edit/', views.profile_edit_view, name='profile_edit'),
+    path('<int:user_id>/resume/', views.resume_download_view, name='resume_download'),
     path('dashboard/', views.dashboard_view, name='dashboard'),
 ]
\ No newline at end of file
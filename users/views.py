@@ -1,9 +1,15 @@
 #/users/views.py
+import os
+
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth import login
+from django.http import Http404
+from django.views.decorators.http import require_safe
+from config.query_budget import query_budget
 from .forms import JobSeekerRegistrationForm, EmployerRegistrationForm
 
+@query_budget(2)
 def home(request):
     """
     Home page view - landing page for the job portal.
@@ -11,6 +17,7 @@ def home(request):
     return render(request, 'home.html')
 
 
+@query_budget(10)
 def register_job_seeker(request):
     """
     Registration view for job seekers.
@@ -31,6 +38,7 @@ def register_job_seeker(request):
     return render(request, 'users/register_job_seeker.html', {'form': form})
 
 
+@query_budget(10)
 def register_employer(request):
     """
     Registration view for employers.
@@ -53,6 +61,7 @@ from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.decorators import login_required
 
+@query_budget(12)
 def login_view(request):
     """
     Login view for all users (job seekers and employers).
@@ -77,6 +86,7 @@ def login_view(request):
     return render(request, 'users/login.html', {'form': form})
 
 
+@query_budget(4)
 def logout_view(request):
     """
     Logout view - logs out user and redirects to home.
@@ -87,6 +97,7 @@ def logout_view(request):
 
 
 @login_required
+@query_budget(2)
 def profile_view(request):
     """
     Display user profile (read-only).
@@ -121,6 +132,41 @@ def profile_view(request):
 
 
 @login_required
+@require_safe
+@query_budget(2)
+def resume_download_view(request, user_id):
+    """
+    Send a job seeker's resume.
+    Only the job seeker and employers they applied to may download it.
+    """
+    from django.shortcuts import get_object_or_404
+    from jobs.models import Application
+    from .downloads import serve
+    from .models import JobSeekerProfile
+    
+    profile = get_object_or_404(
+        JobSeekerProfile.objects.select_related('user').only('resume', 'user__username'),
+        user_id=user_id,
+    )
+    
+    # Check the user may see this resume
+    allowed = request.user.pk == profile.user_id or request.user.is_staff or (
+        request.user.user_type == 'employer' and
+        Application.objects.filter(applicant_id=user_id, job__employer=request.user).exists()
+    )
+    if not allowed:
+        messages.error(request, 'You can only view resumes of applicants to your jobs.')
+        return redirect('users:dashboard')
+    
+    if not profile.resume:
+        raise Http404('No resume uploaded.')
+    
+    extension = os.path.splitext(profile.resume.name)[1]
+    return serve(request, profile.resume.storage, profile.resume.name, f'{profile.user.username}-resume{extension}')
+
+
+@login_required
+@query_budget(13)  # a new resume is recorded, counted and queued
 def profile_edit_view(request):
     """
     Edit user profile.
@@ -176,6 +222,7 @@ def profile_edit_view(request):
 
 
 @login_required
+@query_budget(10)  # the first visit recounts the stats row
 def dashboard_view(request):
     """
     Dashboard view - routes to appropriate dashboard based on user type.
@@ -208,10 +255,15 @@ def dashboard_view(request):
         from jobs.models import Application
         applications_count = Application.objects.filter(applicant=user).count()
         
+        # Top jobs for this seeker, precomputed by the refresh_recommendations command
+        from jobs.recommendations import for_seeker
+        recommended = for_seeker(user)
+        
         context = {
             'profile': profile,
             'applications_count': applications_count,
             'profile_completion': profile_completion,
+            'recommended': recommended,
         }
         
         return render(request, 'users/dashboard_job_seeker.html', context)
@@ -224,22 +276,19 @@ def dashboard_view(request):
             from .models import EmployerProfile
             profile = EmployerProfile.objects.create(user=user, company_name='Not Set')
         
-        # Get posted jobs count
-        from jobs.models import Job, Application
-        jobs_posted = Job.objects.filter(employer=user).count()
-        
-        # Get applications received count
-        applications_received = Application.objects.filter(
-            job__employer=user
-        ).count()
+        # Job and application totals come from the precomputed rollup row
+        from jobs.models import Job
+        from jobs.employer_stats import for_employer
+        stats = for_employer(user)
         
-        # Get recent jobs posted by this employer
+        # Get recent jobs posted by this employer (with their stored application counts)
         recent_jobs = Job.objects.filter(employer=user).order_by('-created_at')[:5]
         
         context = {
             'profile': profile,
-            'jobs_posted': jobs_posted,
-            'applications_received': applications_received,
+            'stats': stats,
+            'jobs_posted': stats.jobs_posted,
+            'applications_received': stats.applications_received,
             'recent_jobs': recent_jobs,
         }
         